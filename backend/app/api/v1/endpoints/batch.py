@@ -1,96 +1,49 @@
 """
 배치 처리 API 엔드포인트
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from typing import List, Tuple
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from pydantic import BaseModel
-import csv
-import io
-from datetime import datetime
 
 from app.core.database import get_db
-from app.core.timezone_utils import parse_datetime_string, ensure_timezone_aware
-from app.models.product import Product
-from app.models.transaction import Transaction
-from app.models.stock_checkpoint import StockCheckpoint
+from app.models.import_job import ImportJob
+from app.services.batch_transaction_service import (
+    BatchTransactionService,
+    DEFAULT_CSV_CHUNK_SIZE,
+    iter_csv_chunks
+)
+from app.services.batch_product_service import BatchProductService
+from app.services.bulk_ingest_service import BulkIngestService
+from app.services.import_job_service import ImportJobService
 from app.api.v1.endpoints.transactions import create_transaction
 from app.schemas.product import ProductCreate
+from app.schemas.batch import (
+    BatchTransaction,
+    BatchRequest,
+    BatchProductRequest,
+    BatchResult,
+    BulkImportResult,
+    ImportJobResponse
+)
 
 router = APIRouter()
 
+# CSV 업로드 응답에 포함할 최대 오류 건수
+MAX_REPORTED_ERRORS = 1000
 
-def is_past_transaction(product_code: str, transaction_date: datetime, db: Session) -> bool:
-    """
-    거래가 체크포인트 이전의 과거 이력인지 판단
 
-    Args:
-        product_code: 제품 코드
-        transaction_date: 거래 날짜
-        db: DB 세션
+def _apply_transactions(db: Session, rows: List[Tuple[int, BatchTransaction]]) -> Tuple[int, int, List[dict]]:
+    """
+    (행 번호, 거래) 목록을 반영하고 커밋
 
     Returns:
-        True: 과거 이력 (체크포인트 이전)
-        False: 현재/미래 이력
+        (성공 건수, 실패 건수, 행별 오류 목록)
     """
-    # 해당 제품의 가장 최근 체크포인트 조회
-    latest_checkpoint = db.query(StockCheckpoint).filter(
-        StockCheckpoint.product_code == product_code,
-        StockCheckpoint.is_active == True
-    ).order_by(StockCheckpoint.checkpoint_date.desc()).first()
-
-    if latest_checkpoint:
-        # 거래 날짜가 체크포인트 날짜 이전이면 과거 이력
-        # timezone-aware 비교를 위해 둘 다 timezone-aware로 변환
-        transaction_dt = ensure_timezone_aware(transaction_date)
-        checkpoint_dt = ensure_timezone_aware(latest_checkpoint.checkpoint_date)
-        return transaction_dt <= checkpoint_dt
-
-    # 체크포인트가 없으면 현재 이력
-    return False
-
-class BatchTransaction(BaseModel):
-    product_code: str
-    product_name: str = None
-    transaction_type: str  # IN, OUT, ADJUST
-    quantity: int
-    date: str
-    reason: str = None
-    memo: str = None
-
-class BatchRequest(BaseModel):
-    transactions: List[BatchTransaction]
-
-class BatchProduct(BaseModel):
-    productCode: str
-    productName: str
-    barcode: str = None
-    category: str = None
-    manufacturer: str = None
-    unit: str = None
-    initialStock: int = 0
-    safetyStock: int = 0
-    purchasePrice: float = 0
-    purchaseCurrency: str = "KRW"
-    salePrice: float = 0
-    saleCurrency: str = "KRW"
-    zoneId: str = None
-    warehouse: str = None  # 창고 이름
-    supplier: str = None
-    supplierEmail: str = None
-    contactEmail: str = None
-    leadTime: int = None
-    moq: int = None
-    memo: str = None
-
-class BatchProductRequest(BaseModel):
-    products: List[BatchProduct]
-
-class BatchResult(BaseModel):
-    success: int
-    failed: int
-    errors: List[dict]
+    return BatchTransactionService.apply(db, rows, created_by="batch_process")
+
 
 @router.post("/process", response_model=BatchResult)
 def process_batch(
@@ -105,92 +58,10 @@ def process_batch(
     - 비활성화 제품도 이력 기록 가능
     - affects_current_stock = False로 저장
     """
-    success_count = 0
-    failed_count = 0
-    errors = []
-
-    for idx, trans in enumerate(request.transactions):
-        try:
-            # 제품 코드로 제품 찾기 (비활성화 제품도 포함)
-            product = db.query(Product).filter(
-                Product.product_code == trans.product_code
-            ).first()
-
-            if not product:
-                errors.append({
-                    "row": idx + 1,
-                    "error": f"제품 코드 {trans.product_code}를 찾을 수 없습니다"
-                })
-                failed_count += 1
-                continue
-
-            # 날짜 처리: ISO 형식 문자열을 datetime 객체로 변환
-            transaction_date = parse_datetime_string(trans.date)
-
-            # 과거 이력인지 판단
-            # 1. 비활성화 제품은 항상 과거 이력으로 처리 (이력 기록 목적)
-            # 2. 체크포인트 이전 거래도 과거 이력
-            is_past = (not product.is_active) or is_past_transaction(product.product_code, transaction_date, db)
-
-            # 재고 계산
-            previous_stock = product.current_stock
-
-            if trans.transaction_type == "IN":
-                new_stock = previous_stock + trans.quantity
-            elif trans.transaction_type == "OUT":
-                # 과거 이력이 아닐 때만 재고 부족 검증
-                if not is_past and trans.quantity > previous_stock:
-                    errors.append({
-                        "row": idx + 1,
-                        "error": f"재고 부족: 현재 {previous_stock}, 요청 {trans.quantity}"
-                    })
-                    failed_count += 1
-                    continue
-                new_stock = previous_stock - trans.quantity
-            elif trans.transaction_type == "ADJUST":
-                # ADJUST는 조정량을 의미 (양수: 증가, 음수: 감소)
-                new_stock = previous_stock + trans.quantity
-            else:
-                errors.append({
-                    "row": idx + 1,
-                    "error": f"알 수 없는 트랜잭션 타입: {trans.transaction_type}"
-                })
-                failed_count += 1
-                continue
-
-            # 트랜잭션 생성
-            transaction = Transaction(
-                product_code=trans.product_code,
-                transaction_type=trans.transaction_type,
-                quantity=trans.quantity,
-                previous_stock=previous_stock,
-                new_stock=new_stock,
-                reason=trans.reason,
-                memo=trans.memo,
-                location=product.zone_id,
-                created_by="batch_process",
-                transaction_date=transaction_date,
-                affects_current_stock=not is_past  # 과거 이력은 재고에 영향 없음
-            )
-
-            db.add(transaction)
-
-            # 과거 이력이 아닐 때만 제품 재고 업데이트
-            if not is_past:
-                product.current_stock = new_stock
-
-            success_count += 1
-
-        except Exception as e:
-            errors.append({
-                "row": idx + 1,
-                "error": str(e)
-            })
-            failed_count += 1
-
-    # 모든 변경사항 커밋
-    if success_count > 0:
-        db.commit()
+    success_count, failed_count, errors = _apply_transactions(
+        db,
+        [(idx + 1, trans) for idx, trans in enumerate(request.transactions)]
+    )
 
     return BatchResult(
         success=success_count,
@@ -198,41 +69,80 @@ def process_batch(
         errors=errors
     )
 
+
 @router.post("/upload-csv", response_model=BatchResult)
-async def upload_csv(
+def upload_csv(
     file: UploadFile = File(...),
+    chunk_size: int = Query(DEFAULT_CSV_CHUNK_SIZE, ge=100, le=10000, description="한 번에 검증/반영할 행 수"),
     db: Session = Depends(get_db)
 ):
     """
     CSV 파일 업로드 및 처리
+
+    파일을 스트리밍으로 읽어 chunk_size 행씩 검증하고 반영 (청크마다 커밋)
+    형식 오류 행도 행 번호와 함께 오류로 보고
     """
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="CSV 파일만 업로드 가능합니다")
-    
-    contents = await file.read()
-    decoded = contents.decode('utf-8-sig')  # BOM 처리
-    
-    csv_reader = csv.DictReader(io.StringIO(decoded))
-    transactions = []
-    
-    for row in csv_reader:
-        try:
-            trans = BatchTransaction(
-                product_code=row.get('제품코드', row.get('product_code', '')),
-                product_name=row.get('제품명', row.get('product_name', '')),
-                transaction_type=row.get('구분', row.get('type', '')).upper(),
-                quantity=int(row.get('수량', row.get('quantity', 0))),
-                date=row.get('날짜', row.get('date', '')),
-                reason=row.get('사유', row.get('reason', '')),
-                memo=row.get('메모', row.get('memo', ''))
-            )
-            transactions.append(trans)
-        except Exception as e:
-            continue
-    
-    # 배치 처리
-    request = BatchRequest(transactions=transactions)
-    return process_batch(request, db)
+
+    success_count = 0
+    failed_count = 0
+    errors: List[dict] = []
+
+    for valid, invalid in iter_csv_chunks(file.file, chunk_size):
+        chunk_success, chunk_failed, chunk_errors = _apply_transactions(db, valid)
+        success_count += chunk_success
+        failed_count += chunk_failed + len(invalid)
+
+        # 오류 목록은 MAX_REPORTED_ERRORS건까지만 보관 (건수는 전부 집계)
+        for error in sorted(invalid + chunk_errors, key=lambda e: e["row"]):
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(error)
+
+    if failed_count > len(errors):
+        errors.append({
+            "row": None,
+            "error": f"오류가 너무 많아 {MAX_REPORTED_ERRORS}건만 표시합니다 (전체 {failed_count}건)"
+        })
+
+    return BatchResult(
+        success=success_count,
+        failed=failed_count,
+        errors=errors
+    )
+
+@router.post("/bulk-import", response_model=BulkImportResult)
+def bulk_import_csv(
+    file: UploadFile = File(...),
+    allow_negative: bool = Query(False, description="재고가 음수가 되는 제품이 있어도 적재"),
+    regenerate_ledger: bool = Query(False, description="적재 기간의 기존 일일 수불부 재생성"),
+    db: Session = Depends(get_db)
+):
+    """
+    대용량 거래 CSV 적재 (과거 이력 마이그레이션용)
+
+    COPY로 스테이징 테이블에 적재한 뒤 SQL 한 번으로 transactions에 병합 (파일 전체가 한 트랜잭션)
+    열은 CSV 템플릿 순서(제품코드, 제품명, 구분, 수량, 날짜, 사유, 메모)여야 하며 첫 줄은 헤더로 건너뜀
+    형식 오류/미등록 제품 행은 제외하고 행 번호와 함께 보고
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="CSV 파일만 업로드 가능합니다")
+    if db.get_bind().dialect.name != "postgresql":
+        raise HTTPException(status_code=400, detail="대용량 적재는 PostgreSQL에서만 지원합니다")
+
+    try:
+        result = BulkIngestService.ingest(
+            db,
+            file.file,
+            created_by="bulk_import",
+            allow_negative=allow_negative,
+            regenerate_ledger=regenerate_ledger
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BulkImportResult(**result)
+
 
 @router.get("/template")
 def download_template():
@@ -270,97 +180,120 @@ def download_template():
 @router.post("/products", response_model=BatchResult)
 def process_batch_products(
     request: BatchProductRequest,
+    upsert: bool = Query(False, description="이미 있는 SKU는 요청에 포함된 필드로 갱신"),
     db: Session = Depends(get_db)
 ):
     """
     제품 일괄 추가 처리
-    """
-    from app.models.warehouse import Warehouse
-    import re
 
-    success_count = 0
-    failed_count = 0
-    errors = []
-
-    for idx, prod in enumerate(request.products):
-        try:
-            # SKU 중복 확인
-            existing_product = db.query(Product).filter(
-                Product.product_code == prod.productCode
-            ).first()
-
-            if existing_product:
-                errors.append({
-                    "row": idx + 1,
-                    "error": f"SKU '{prod.productCode}'가 이미 존재합니다."
-                })
-                failed_count += 1
-                continue
-
-            # 창고 이름으로 warehouse_id 찾기
-            warehouse_id = None
-            if prod.warehouse:
-                # 입력된 창고 이름에서 모든 공백 제거
-                normalized_input = re.sub(r'\s+', '', prod.warehouse)
-
-                # 모든 창고 조회
-                warehouses = db.query(Warehouse).all()
-                for warehouse in warehouses:
-                    # DB의 창고 이름에서도 모든 공백 제거하여 비교
-                    normalized_db = re.sub(r'\s+', '', warehouse.name)
-                    if normalized_input.lower() == normalized_db.lower():
-                        warehouse_id = warehouse.id
-                        break
-
-                if not warehouse_id:
-                    errors.append({
-                        "row": idx + 1,
-                        "error": f"창고 '{prod.warehouse}'를 찾을 수 없습니다."
-                    })
-                    failed_count += 1
-                    continue
-
-            # 새 제품 생성
-            new_product = Product(
-                product_code=prod.productCode,
-                product_name=prod.productName,
-                barcode=prod.barcode,
-                category=prod.category,
-                manufacturer=prod.manufacturer,
-                unit=prod.unit or "개",
-                safety_stock=prod.safetyStock,
-                purchase_price=prod.purchasePrice,
-                purchase_currency=prod.purchaseCurrency,
-                sale_price=prod.salePrice,
-                sale_currency=prod.saleCurrency,
-                zone_id=prod.zoneId,
-                warehouse_id=warehouse_id,  # 매핑된 warehouse_id 사용
-                supplier=prod.supplier,
-                supplier_email=prod.supplierEmail,
-                contact_email=prod.contactEmail,
-                lead_time_days=prod.leadTime,
-                moq=prod.moq,
-                memo=prod.memo,
-                current_stock=prod.initialStock,  # 초기 재고 설정
-                is_active=True
-            )
-
-            db.add(new_product)
-            success_count += 1
-
-        except Exception as e:
-            errors.append({
-                "row": idx + 1,
-                "error": str(e)
-            })
-            failed_count += 1
-
-    # 모든 변경사항 커밋
-    if success_count > 0:
-        db.commit()
+    upsert=True이면 기존 SKU를 오류로 처리하지 않고 일괄 갱신 (재고는 변경하지 않음)
+    """
+    success_count, failed_count, errors = BatchProductService.apply(
+        db,
+        [(idx + 1, prod) for idx, prod in enumerate(request.products)],
+        upsert=upsert
+    )
 
     return BatchResult(
         success=success_count,
         failed=failed_count,
         errors=errors
-    )
\ No newline at end of file
+    )
+
+
+def _get_job(db: Session, job_id: UUID) -> ImportJob:
+    """가져오기 작업 조회 (없으면 404)"""
+    job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="가져오기 작업을 찾을 수 없습니다")
+    return job
+
+
+def _start_job(job: ImportJob) -> ImportJobResponse:
+    """작업 스레드에 넘기고 현재 상태 반환"""
+    ImportJobService.submit(job.id)
+    return ImportJobResponse(**ImportJobService.build_progress(job))
+
+
+@router.post("/jobs/upload-csv", response_model=ImportJobResponse, status_code=202)
+def create_csv_import_job(
+    file: UploadFile = File(...),
+    chunk_size: int = Query(DEFAULT_CSV_CHUNK_SIZE, ge=100, le=10000, description="한 번에 반영(커밋)할 행 수"),
+    db: Session = Depends(get_db)
+):
+    """
+    거래 CSV 가져오기 작업 생성
+
+    파일을 저장한 뒤 작업 id를 바로 반환하고 백그라운드에서 청크 단위로 처리
+    진행 상황은 GET /batch/jobs/{job_id}로 조회
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="CSV 파일만 업로드 가능합니다")
+
+    job = ImportJobService.create_from_upload(db, file.file, file.filename, chunk_size)
+    return _start_job(job)
+
+
+@router.post("/jobs/process", response_model=ImportJobResponse, status_code=202)
+def create_transaction_import_job(
+    request: BatchRequest,
+    chunk_size: int = Query(DEFAULT_CSV_CHUNK_SIZE, ge=100, le=10000, description="한 번에 반영(커밋)할 행 수"),
+    db: Session = Depends(get_db)
+):
+    """일괄 트랜잭션 처리(/batch/process)를 가져오기 작업으로 실행"""
+    job = ImportJobService.create_from_transactions(db, request.transactions, chunk_size)
+    return _start_job(job)
+
+
+@router.post("/jobs/products", response_model=ImportJobResponse, status_code=202)
+def create_product_import_job(
+    request: BatchProductRequest,
+    chunk_size: int = Query(DEFAULT_CSV_CHUNK_SIZE, ge=100, le=10000, description="한 번에 반영(커밋)할 행 수"),
+    db: Session = Depends(get_db)
+):
+    """제품 일괄 추가(/batch/products)를 가져오기 작업으로 실행"""
+    job = ImportJobService.create_from_products(db, request.products, chunk_size)
+    return _start_job(job)
+
+
+@router.get("/jobs/{job_id}", response_model=ImportJobResponse)
+def get_import_job(
+    job_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """가져오기 작업 진행 상황 (처리/실패 행 수, 처리 속도, 예상 남은 시간)"""
+    return ImportJobResponse(**ImportJobService.build_progress(_get_job(db, job_id)))
+
+
+@router.get("/jobs/{job_id}/errors")
+def download_import_job_errors(
+    job_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """
+    가져오기 작업 실패 행 CSV 다운로드
+
+    행번호, 오류와 원본 값을 담으므로 수정 후 다시 업로드 가능
+    """
+    job = _get_job(db, job_id)
+
+    return StreamingResponse(
+        ImportJobService.iter_error_csv(job.id, job.job_type),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename=import_errors_{job.id}.csv"
+        }
+    )
+
+
+@router.post("/jobs/{job_id}/resume", response_model=ImportJobResponse)
+def resume_import_job(
+    job_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """실패했거나 중단된 가져오기 작업을 마지막으로 반영한 행 다음부터 다시 실행"""
+    job = _get_job(db, job_id)
+    if not ImportJobService.resume(db, job):
+        raise HTTPException(status_code=400, detail="완료되었거나 실행 중인 작업입니다")
+
+    return ImportJobResponse(**ImportJobService.build_progress(job))
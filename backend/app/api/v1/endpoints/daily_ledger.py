@@ -11,7 +11,9 @@ from app.api.deps import get_current_db
 from app.models.daily_ledger import DailyLedger
 from app.models.transaction import Transaction
 from app.models.product import Product
+from app.services.product_catalog_cache import product_catalog_cache
 from app.models.stock_checkpoint import StockCheckpoint, CheckpointType
+from app.services.checkpoint_head_service import CheckpointHeadService
 from app.schemas.daily_ledger import DailyLedgerCreate, DailyLedgerResponse
 
 router = APIRouter()
@@ -34,17 +36,9 @@ def should_create_checkpoint(
         True: 체크포인트 생성 필요
         False: 체크포인트 생성 불필요 (이미 있거나 미래 체크포인트 존재)
     """
-    # target_date 당일 또는 이후의 체크포인트가 있는지 확인
-    future_checkpoint = db.query(StockCheckpoint).filter(
-        and_(
-            StockCheckpoint.product_code == product_code,
-            func.date(StockCheckpoint.checkpoint_date) >= target_date,
-            StockCheckpoint.is_active == True
-        )
-    ).first()
-
+    # target_date 당일 또는 이후의 체크포인트가 있는지 확인 (제품별 최신 체크포인트로 판단)
     # 미래 체크포인트가 없으면 생성 가능
-    return future_checkpoint is None
+    return not CheckpointHeadService.has_checkpoint_on_or_after(db, product_code, target_date)
 
 
 def get_beginning_stock(
@@ -64,13 +58,7 @@ def get_beginning_stock(
         beginning_stock: 해당 날짜의 기초 재고
     """
     # 1. target_date 이전의 가장 최근 체크포인트 찾기
-    latest_checkpoint = db.query(StockCheckpoint).filter(
-        and_(
-            StockCheckpoint.product_code == product_code,
-            func.date(StockCheckpoint.checkpoint_date) < target_date,
-            StockCheckpoint.is_active == True
-        )
-    ).order_by(StockCheckpoint.checkpoint_date.desc()).first()
+    latest_checkpoint = CheckpointHeadService.get_latest_before(db, product_code, target_date)
 
     if latest_checkpoint:
         # 체크포인트가 있으면 체크포인트 ~ 전날까지의 거래를 집계
@@ -148,9 +136,10 @@ def get_daily_ledgers(
     ledgers = query.order_by(DailyLedger.ledger_date.desc()).offset(skip).limit(limit).all()
     
     # 제품 정보 추가
+    products = product_catalog_cache.get_many(db, [ledger.product_code for ledger in ledgers])
     result = []
     for ledger in ledgers:
-        product = db.query(Product).filter(Product.product_code == ledger.product_code).first()
+        product = products.get(ledger.product_code)
         ledger_dict = {
             "id": str(ledger.id),
             "ledger_date": ledger.ledger_date.isoformat(),
@@ -198,6 +187,10 @@ def generate_daily_ledger(
 
     ledgers_created = 0
     checkpoints_created = 0
+    checkpoint_product_codes = []
+
+    # 제품별 최신 체크포인트를 한 번에 읽어 둠
+    CheckpointHeadService.get_heads(db, [p.product_code for p in products])
 
     # 체크포인트를 생성할 날짜/시간 (해당 날짜의 23:59:59로 설정)
     checkpoint_datetime = datetime.combine(target_date, datetime.max.time())
@@ -286,7 +279,9 @@ def generate_daily_ledger(
                 )
 
                 checkpoints_created += 1
+                checkpoint_product_codes.append(product.product_code)
 
+    CheckpointHeadService.refresh(db, checkpoint_product_codes)
     db.commit()
 
     result = {
@@ -6,11 +6,13 @@ from typing import Optional, List
 from datetime import date, datetime, timedelta
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, or_, select, tuple_
 
 from app.api.deps import get_current_db
+from app.core.timezone_utils import day_range_bounds
 from app.models.transaction import Transaction
 from app.models.product import Product
+from app.models.sales_daily_fact import SalesDailyFact
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -55,10 +57,62 @@ class DisposalByReason(BaseModel):
     total_loss: float
 
 
+class DisposalOverview(BaseModel):
+    """폐기 리포트 화면 전체 데이터 (요약 + 제품별 + 사유별 + 상세 첫 페이지)"""
+    summary: DisposalSummary
+    by_product: List[DisposalByProduct]
+    by_reason: List[DisposalByReason]
+    details: List[DisposalDetail]
+
+
+# 폐기 사유 코드 → 표시명
+REASON_DISPLAY = {
+    'return_damaged': '반품(파손)',
+    'expiry': '유효기간 만료',
+    'quality_issue': '품질 문제',
+}
+
+
+def _reason_display(reason: Optional[str]) -> str:
+    """폐기 사유 표시명 변환"""
+    if not reason:
+        return '미지정'
+    return REASON_DISPLAY.get(reason, reason)
+
+
+def _disposal_window(start_date: date, end_date: date):
+    """
+    거래일 기간 조건
+    func.date(transaction_date) 대신 범위 조건을 사용해 transaction_date 인덱스를 탈 수 있게 함
+    """
+    range_start, range_end = day_range_bounds(start_date, end_date)
+    return and_(
+        Transaction.transaction_date >= range_start,
+        Transaction.transaction_date < range_end
+    )
+
+
+def _build_disposal_detail(trans: Transaction, product: Product) -> DisposalDetail:
+    """폐기 거래를 상세 응답으로 변환"""
+    unit_price = float(product.purchase_price or 0)
+    return DisposalDetail(
+        id=str(trans.id),
+        product_code=trans.product_code,
+        product_name=product.product_name,
+        disposal_date=trans.transaction_date,
+        quantity=trans.quantity,
+        unit_price=unit_price,
+        loss_amount=trans.quantity * unit_price,
+        reason=trans.reason,
+        created_by=trans.created_by
+    )
+
+
 @router.get("/summary", response_model=DisposalSummary)
 def get_disposal_summary(
     start_date: Optional[date] = Query(None, description="시작 날짜"),
     end_date: Optional[date] = Query(None, description="종료 날짜"),
+    use_fact: bool = Query(False, description="사전 집계 테이블(sales_daily_fact) 사용 여부"),
     db: Session = Depends(get_current_db)
 ):
     """
@@ -70,6 +124,28 @@ def get_disposal_summary(
     if not start_date:
         start_date = end_date - timedelta(days=30)
 
+    if use_fact:
+        # 집계 테이블 기준 (손실 금액은 원화 환산)
+        result = db.query(
+            func.sum(SalesDailyFact.transaction_count).label('count'),
+            func.sum(SalesDailyFact.quantity).label('total_quantity'),
+            func.sum(SalesDailyFact.cost_krw).label('total_loss')
+        ).filter(
+            and_(
+                SalesDailyFact.transaction_type == 'DISPOSAL',
+                SalesDailyFact.fact_date >= start_date,
+                SalesDailyFact.fact_date <= end_date
+            )
+        ).first()
+
+        return DisposalSummary(
+            total_disposal_count=int(result.count or 0),
+            total_disposal_quantity=int(result.total_quantity or 0),
+            total_loss_amount=float(result.total_loss or 0),
+            period_start=start_date,
+            period_end=end_date
+        )
+
     # DISPOSAL 타입 거래 조회
     query = db.query(
         func.count(Transaction.id).label('count'),
@@ -80,8 +156,7 @@ def get_disposal_summary(
     ).filter(
         and_(
             Transaction.transaction_type == 'DISPOSAL',
-            func.date(Transaction.transaction_date) >= start_date,
-            func.date(Transaction.transaction_date) <= end_date
+            _disposal_window(start_date, end_date)
         )
     )
 
@@ -121,12 +196,7 @@ def get_disposal_details(
     )
 
     # 날짜 필터
-    query = query.filter(
-        and_(
-            func.date(Transaction.transaction_date) >= start_date,
-            func.date(Transaction.transaction_date) <= end_date
-        )
-    )
+    query = query.filter(_disposal_window(start_date, end_date))
 
     # 제품 필터
     if product_code:
@@ -137,24 +207,7 @@ def get_disposal_details(
         Transaction.transaction_date.desc()
     ).offset(skip).limit(limit).all()
 
-    results = []
-    for trans in transactions:
-        product = trans.product
-        loss_amount = trans.quantity * float(product.purchase_price or 0)
-
-        results.append(DisposalDetail(
-            id=str(trans.id),
-            product_code=trans.product_code,
-            product_name=product.product_name,
-            disposal_date=trans.transaction_date,
-            quantity=trans.quantity,
-            unit_price=float(product.purchase_price or 0),
-            loss_amount=loss_amount,
-            reason=trans.reason,
-            created_by=trans.created_by
-        ))
-
-    return results
+    return [_build_disposal_detail(trans, trans.product) for trans in transactions]
 
 
 @router.get("/by-product", response_model=List[DisposalByProduct])
@@ -162,6 +215,7 @@ def get_disposal_by_product(
     start_date: Optional[date] = Query(None, description="시작 날짜"),
     end_date: Optional[date] = Query(None, description="종료 날짜"),
     limit: int = Query(10, ge=1, le=100, description="상위 N개"),
+    use_fact: bool = Query(False, description="사전 집계 테이블(sales_daily_fact) 사용 여부"),
     db: Session = Depends(get_current_db)
 ):
     """
@@ -173,6 +227,40 @@ def get_disposal_by_product(
     if not start_date:
         start_date = end_date - timedelta(days=30)
 
+    if use_fact:
+        # 집계 테이블 기준 (손실 금액은 원화 환산)
+        fact_query = db.query(
+            SalesDailyFact.product_code,
+            Product.product_name,
+            func.sum(SalesDailyFact.quantity).label('total_quantity'),
+            func.sum(SalesDailyFact.cost_krw).label('total_loss'),
+            func.sum(SalesDailyFact.transaction_count).label('disposal_count')
+        ).join(
+            Product, SalesDailyFact.product_code == Product.product_code
+        ).filter(
+            and_(
+                SalesDailyFact.transaction_type == 'DISPOSAL',
+                SalesDailyFact.fact_date >= start_date,
+                SalesDailyFact.fact_date <= end_date
+            )
+        ).group_by(
+            SalesDailyFact.product_code,
+            Product.product_name
+        ).order_by(
+            func.sum(SalesDailyFact.cost_krw).desc()
+        ).limit(limit)
+
+        return [
+            DisposalByProduct(
+                product_code=row.product_code,
+                product_name=row.product_name,
+                total_quantity=int(row.total_quantity or 0),
+                total_loss=float(row.total_loss or 0),
+                disposal_count=int(row.disposal_count or 0)
+            )
+            for row in fact_query.all()
+        ]
+
     query = db.query(
         Transaction.product_code,
         Product.product_name,
@@ -184,8 +272,7 @@ def get_disposal_by_product(
     ).filter(
         and_(
             Transaction.transaction_type == 'DISPOSAL',
-            func.date(Transaction.transaction_date) >= start_date,
-            func.date(Transaction.transaction_date) <= end_date
+            _disposal_window(start_date, end_date)
         )
     ).group_by(
         Transaction.product_code,
@@ -232,8 +319,7 @@ def get_disposal_by_reason(
     ).filter(
         and_(
             Transaction.transaction_type == 'DISPOSAL',
-            func.date(Transaction.transaction_date) >= start_date,
-            func.date(Transaction.transaction_date) <= end_date
+            _disposal_window(start_date, end_date)
         )
     ).group_by(
         Transaction.reason
@@ -243,19 +329,140 @@ def get_disposal_by_reason(
 
     results = []
     for row in query.all():
-        reason_display = row.reason or '미지정'
-        if row.reason == 'return_damaged':
-            reason_display = '반품(파손)'
-        elif row.reason == 'expiry':
-            reason_display = '유효기간 만료'
-        elif row.reason == 'quality_issue':
-            reason_display = '품질 문제'
-
         results.append(DisposalByReason(
-            reason=reason_display,
+            reason=_reason_display(row.reason),
             count=row.count or 0,
             total_quantity=row.total_quantity or 0,
             total_loss=float(row.total_loss or 0)
         ))
 
-    return results
\ No newline at end of file
+    return results
+
+
+@router.get("/overview", response_model=DisposalOverview)
+def get_disposal_overview(
+    start_date: Optional[date] = Query(None, description="시작 날짜"),
+    end_date: Optional[date] = Query(None, description="종료 날짜"),
+    top_n: int = Query(10, ge=1, le=100, description="제품별 상위 N개"),
+    details_limit: int = Query(100, ge=1, le=1000, description="상세 내역 첫 페이지 건수"),
+    db: Session = Depends(get_current_db)
+):
+    """
+    폐기 리포트 화면 전체 데이터 조회
+
+    summary / by-product / by-reason / 상세 내역을 GROUPING SETS 한 번으로 집계하여
+    기간 내 폐기 거래를 한 번만 읽습니다.
+    상세 내역은 거래 단위 그룹 중 거래일 역순 첫 페이지만 반환합니다.
+    """
+    # 기본값: 최근 30일
+    if not end_date:
+        end_date = date.today()
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+
+    loss = Transaction.quantity * func.coalesce(Product.purchase_price, 0)
+
+    # (전체), (제품), (사유), (거래 1건) 네 가지 그룹을 한 번의 스캔으로 집계
+    # 거래 단위 그룹은 거래일 역순 순번을 매겨 상세 첫 페이지만 반환
+    is_transaction_total = func.grouping(Transaction.id)
+    grouped = select(
+        Transaction.id,
+        Transaction.product_code,
+        Product.product_name,
+        Transaction.reason,
+        Transaction.transaction_date,
+        Transaction.created_by,
+        Product.purchase_price,
+        is_transaction_total.label('is_transaction_total'),
+        func.grouping(Transaction.product_code).label('is_product_total'),
+        func.grouping(Transaction.reason).label('is_reason_total'),
+        func.count(Transaction.id).label('count'),
+        func.sum(Transaction.quantity).label('total_quantity'),
+        func.sum(loss).label('total_loss'),
+        func.row_number().over(
+            partition_by=is_transaction_total,
+            order_by=Transaction.transaction_date.desc()
+        ).label('detail_rank')
+    ).join(
+        Product, Transaction.product_code == Product.product_code
+    ).where(
+        and_(
+            Transaction.transaction_type == 'DISPOSAL',
+            _disposal_window(start_date, end_date)
+        )
+    ).group_by(
+        func.grouping_sets(
+            tuple_(),
+            tuple_(Transaction.product_code, Product.product_name),
+            tuple_(Transaction.reason),
+            tuple_(
+                Transaction.id, Transaction.product_code, Product.product_name, Transaction.reason,
+                Transaction.transaction_date, Transaction.created_by, Product.purchase_price
+            )
+        )
+    ).subquery()
+
+    grouped_rows = db.query(grouped).filter(
+        or_(grouped.c.is_transaction_total == 1, grouped.c.detail_rank <= details_limit)
+    ).all()
+
+    summary = DisposalSummary(
+        total_disposal_count=0,
+        total_disposal_quantity=0,
+        total_loss_amount=0,
+        period_start=start_date,
+        period_end=end_date
+    )
+    by_product = []
+    by_reason = []
+    detail_rows = []
+
+    for row in grouped_rows:
+        if not row.is_transaction_total:
+            # 상세 (거래 1건)
+            detail_rows.append(row)
+        elif row.is_product_total and row.is_reason_total:
+            # 전체 합계
+            summary.total_disposal_count = row.count or 0
+            summary.total_disposal_quantity = row.total_quantity or 0
+            summary.total_loss_amount = float(row.total_loss or 0)
+        elif not row.is_product_total:
+            by_product.append(DisposalByProduct(
+                product_code=row.product_code,
+                product_name=row.product_name,
+                total_quantity=row.total_quantity or 0,
+                total_loss=float(row.total_loss or 0),
+                disposal_count=row.count or 0
+            ))
+        else:
+            by_reason.append(DisposalByReason(
+                reason=_reason_display(row.reason),
+                count=row.count or 0,
+                total_quantity=row.total_quantity or 0,
+                total_loss=float(row.total_loss or 0)
+            ))
+
+    by_product.sort(key=lambda x: x.total_loss, reverse=True)
+    by_reason.sort(key=lambda x: x.total_loss, reverse=True)
+
+    detail_rows.sort(key=lambda row: row.detail_rank)
+
+    return DisposalOverview(
+        summary=summary,
+        by_product=by_product[:top_n],
+        by_reason=by_reason,
+        details=[
+            DisposalDetail(
+                id=str(row.id),
+                product_code=row.product_code,
+                product_name=row.product_name,
+                disposal_date=row.transaction_date,
+                quantity=row.total_quantity,
+                unit_price=float(row.purchase_price or 0),
+                loss_amount=float(row.total_loss or 0),
+                reason=row.reason,
+                created_by=row.created_by
+            )
+            for row in detail_rows
+        ]
+    )
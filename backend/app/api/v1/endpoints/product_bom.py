@@ -12,9 +12,9 @@ from uuid import UUID
 
 from app.core.database import get_db
 from app.models import ProductBOM, Product
-from app.services.transaction_service import TransactionService
-from app.schemas.transaction import TransactionCreate
-from app.core.timezone_utils import get_current_utc_time
+from app.services.product_catalog_cache import product_catalog_cache
+from app.services.bom_service import BOMService, flat_bom_cache
+from app.schemas.product_bom import SetProductStockResponse, BuildableSetReport, AssemblyBatchRequest
 
 router = APIRouter()
 
@@ -58,11 +58,10 @@ def get_product_boms(
 
     # 응답 아이템 생성
     response_items = []
+    child_products = product_catalog_cache.get_many(db, [bom.child_product_code for bom in boms])
     for bom in boms:
         # child product name 조회
-        child_product = db.query(Product).filter(
-            Product.product_code == bom.child_product_code
-        ).first()
+        child_product = child_products.get(bom.child_product_code)
 
         child_product_name = child_product.product_name if child_product else "Unknown"
 
@@ -89,25 +88,22 @@ def create_product_bom(
     """
     제품 BOM 생성
     """
-    # 부모 제품 존재 확인
-    parent_product = db.query(Product).filter(
-        Product.product_code == bom_data.parent_product_code
-    ).first()
-
-    if not parent_product:
+    # 부모/자식 제품 존재 확인
+    products = {
+        p.product_code: p for p in db.query(Product).filter(
+            Product.product_code.in_([bom_data.parent_product_code, bom_data.child_product_code])
+        ).all()
+    }
+
+    if bom_data.parent_product_code not in products:
         raise HTTPException(status_code=404, detail="Parent product not found")
 
-    # 자식 제품 존재 확인
-    child_product = db.query(Product).filter(
-        Product.product_code == bom_data.child_product_code
-    ).first()
-
+    child_product = products.get(bom_data.child_product_code)
     if not child_product:
         raise HTTPException(status_code=404, detail="Child product not found")
 
-    # 순환 참조 방지
-    if bom_data.parent_product_code == bom_data.child_product_code:
-        raise HTTPException(status_code=400, detail="Parent and child cannot be the same")
+    # 순환 참조 방지 (자기 자신 및 하위 세트를 통한 순환)
+    BOMService.check_cycle(db, bom_data.parent_product_code, bom_data.child_product_code)
 
     # 중복 확인
     existing_bom = db.query(ProductBOM).filter(
@@ -128,6 +124,7 @@ def create_product_bom(
     )
 
     db.add(new_bom)
+    flat_bom_cache.notify_change(db)
     db.commit()
     db.refresh(new_bom)
 
@@ -155,97 +152,129 @@ def delete_product_bom(
         raise HTTPException(status_code=404, detail="BOM not found")
 
     db.delete(bom)
+    flat_bom_cache.notify_change(db)
     db.commit()
 
     return {"message": "BOM deleted successfully"}
 
-@router.post("/assemble")
-def assemble_set_products(
-    data: dict,
+@router.get("/explode/{product_code}")
+def explode_product_bom(
+    product_code: str,
     db: Session = Depends(get_db)
 ):
     """
-    세트 제품 조립
+    세트 제품 BOM 전개 (하위 세트를 최하위 구성품까지 펼친 세트 1개당 수량)
+    """
+    flat_bom = BOMService.get_flat_bom(db, product_code)
+    products = product_catalog_cache.get_many(db, flat_bom.keys())
+
+    return {
+        "parent_product_code": product_code,
+        "components": [
+            {
+                "product_code": code,
+                "product_name": products[code].product_name if code in products else "Unknown",
+                "quantity": flat_bom[code]
+            }
+            for code in sorted(flat_bom.keys())
+        ]
+    }
+
+@router.get("/buildable", response_model=BuildableSetReport)
+def get_buildable_sets(
+    is_active: Optional[bool] = Query(True, description="세트 상품 활성 상태 필터"),
+    db: Session = Depends(get_db)
+):
     """
+    전체 세트 상품 조립 가능 수량 보고서
+    
+    모든 세트의 조립 가능 수량과 제한 구성품을 한 번의 쿼리로 계산합니다.
+    조립 가능 수량이 적은 세트부터 반환합니다.
+    """
+    buildable_map = BOMService.get_buildable_map(db)
+    products = product_catalog_cache.get_many(
+        db,
+        list(buildable_map.keys()) + [b["limiting_component"] for b in buildable_map.values()]
+    )
+
+    items = []
+    for code, buildable in buildable_map.items():
+        product = products.get(code)
+        if is_active is not None and (product is None or product.is_active != is_active):
+            continue
+        limiting = products.get(buildable["limiting_component"])
+        items.append({
+            "product_code": code,
+            "product_name": product.product_name if product else "Unknown",
+            "limiting_component_name": limiting.product_name if limiting else "Unknown",
+            **buildable
+        })
+
+    items.sort(key=lambda item: (item["buildable_quantity"], item["product_code"]))
+    return BuildableSetReport(items=items, total=len(items))
+
+@router.get("/availability/{product_code}", response_model=SetProductStockResponse)
+def get_set_availability(
+    product_code: str,
+    db: Session = Depends(get_db)
+):
+    """
+    세트 제품 조립 가능 수량 (최하위 구성품 재고 기준)
+    """
+    return BOMService.get_availability(db, product_code)
+
+@router.post("/assemble-batch")
+def assemble_set_products_batch(
+    request: AssemblyBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    여러 세트 제품 조립/해체 일괄 처리
+    
+    관련 제품을 한 번에 잠그고 구성품 재고를 합산 검증한 뒤,
+    모든 입출고 거래를 한 번의 커밋으로 반영합니다. 하나라도 실패하면 전체가 취소됩니다.
+    """
+    return BOMService.process_assembly_batch(
+        db,
+        [item.model_dump() for item in request.items],
+        created_by=request.created_by or "system"
+    )
+
+def _process_single_set(db: Session, data: dict, operation: str) -> dict:
+    """단건 조립/해체 (일괄 처리와 같은 경로로 한 번에 커밋)"""
     product_code = data.get('product_code')
     quantity = data.get('quantity', 1)
 
     # 세트 제품 확인
-    set_product = db.query(Product).filter(Product.product_code == product_code).first()
-    if not set_product:
+    if not product_catalog_cache.get(db, product_code):
         raise HTTPException(status_code=404, detail="Set product not found")
 
-    # BOM 데이터 가져오기
-    boms = db.query(ProductBOM).filter(ProductBOM.parent_product_code == product_code).all()
-    if not boms:
-        raise HTTPException(status_code=400, detail="No BOM data found for this set")
-
-    # 구성 부품의 재고 확인
-    for bom in boms:
-        child_product = db.query(Product).filter(
-            Product.product_code == bom.child_product_code
-        ).first()
-
-        if not child_product:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Child product {bom.child_product_code} not found"
-            )
-
-        required_quantity = bom.quantity * quantity
-        if child_product.current_stock < required_quantity:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient stock for {child_product.product_name}. Need {required_quantity}, have {child_product.current_stock}"
-            )
-
-    # 트랜잭션 시작 - 재고 업데이트 및 트랜잭션 기록
-    try:
-        # 1. 세트 제품 입고 트랜잭션 생성
-        set_transaction = TransactionCreate(
-            transaction_type="IN",
-            product_code=set_product.product_code,
-            quantity=quantity,
-            reason="세트 조립",
-            created_by="system",
-            transaction_date=get_current_utc_time()
-        )
-        TransactionService.create_transaction(db, set_transaction, "system")
-
-        # 2. 구성 부품 출고 트랜잭션 생성
-        for bom in boms:
-            child_product = db.query(Product).filter(
-                Product.product_code == bom.child_product_code
-            ).first()
-
-            # 부품 출고 트랜잭션
-            component_transaction = TransactionCreate(
-                transaction_type="OUT",
-                product_code=bom.child_product_code,
-                quantity=bom.quantity * quantity,
-                reason=f"{set_product.product_code}_{set_product.product_name}_세트 조립",
-                created_by="system",
-                transaction_date=get_current_utc_time()
-            )
-            TransactionService.create_transaction(db, component_transaction, "system")
-
-        db.commit()
-
-        # 업데이트된 세트 제품 정보 다시 조회
-        db.refresh(set_product)
-
-        return {
-            "success": True,
-            "message": f"Successfully assembled {quantity} set(s)",
-            "set_product": {
-                "product_code": set_product.product_code,
-                "product_name": set_product.product_name,
-                "new_quantity": set_product.current_stock
-            }
+    result = BOMService.process_assembly_batch(
+        db,
+        [{"product_code": product_code, "quantity": quantity, "operation": operation}]
+    )
+    set_result = result["results"][0]
+
+    action = "assembled" if operation == "assemble" else "disassembled"
+    return {
+        "success": True,
+        "message": f"Successfully {action} {quantity} set(s)",
+        "set_product": {
+            "product_code": set_result["product_code"],
+            "product_name": set_result["product_name"],
+            "new_quantity": set_result["new_quantity"]
         }
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    }
+
+@router.post("/assemble")
+def assemble_set_products(
+    data: dict,
+    db: Session = Depends(get_db)
+):
+    """
+    세트 제품 조립
+    """
+    return _process_single_set(db, data, "assemble")
 
 @router.post("/disassemble")
 def disassemble_set_products(
@@ -255,76 +284,4 @@ def disassemble_set_products(
     """
     세트 제품 해체
     """
-    product_code = data.get('product_code')
-    quantity = data.get('quantity', 1)
-
-    # 세트 제품 확인
-    set_product = db.query(Product).filter(Product.product_code == product_code).first()
-    if not set_product:
-        raise HTTPException(status_code=404, detail="Set product not found")
-
-    # 세트 재고 확인
-    if set_product.current_stock < quantity:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Insufficient set stock. Need {quantity}, have {set_product.current_stock}"
-        )
-
-    # BOM 데이터 가져오기
-    boms = db.query(ProductBOM).filter(ProductBOM.parent_product_code == product_code).all()
-    if not boms:
-        raise HTTPException(status_code=400, detail="No BOM data found for this set")
-
-    # 트랜잭션 시작 - 재고 업데이트 및 트랜잭션 기록
-    try:
-        # 1. 세트 제품 출고 트랜잭션 생성
-        set_transaction = TransactionCreate(
-            transaction_type="OUT",
-            product_code=set_product.product_code,
-            quantity=quantity,
-            reason="세트 해체",
-            created_by="system",
-            transaction_date=get_current_utc_time()
-        )
-        TransactionService.create_transaction(db, set_transaction, "system")
-
-        # 2. 구성 부품 입고 트랜잭션 생성
-        for bom in boms:
-            child_product = db.query(Product).filter(
-                Product.product_code == bom.child_product_code
-            ).first()
-
-            if not child_product:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Child product {bom.child_product_code} not found"
-                )
-
-            # 부품 입고 트랜잭션
-            component_transaction = TransactionCreate(
-                transaction_type="IN",
-                product_code=bom.child_product_code,
-                quantity=bom.quantity * quantity,
-                reason="세트 해체",
-                created_by="system",
-                transaction_date=get_current_utc_time()
-            )
-            TransactionService.create_transaction(db, component_transaction, "system")
-
-        db.commit()
-
-        # 업데이트된 세트 제품 정보 다시 조회
-        db.refresh(set_product)
-
-        return {
-            "success": True,
-            "message": f"Successfully disassembled {quantity} set(s)",
-            "set_product": {
-                "product_code": set_product.product_code,
-                "product_name": set_product.product_name,
-                "new_quantity": set_product.current_stock
-            }
-        }
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    return _process_single_set(db, data, "disassemble")
@@ -3,16 +3,21 @@ Product API Endpoints
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.api.deps import get_current_db
 from app.schemas.product import (
     ProductCreate, ProductUpdate, ProductResponse, ProductListResponse,
-    PastQuantityResponse
+    PastQuantityResponse, BarcodeLookupResponse
 )
 from app.schemas.common import MessageResponse
 from app.services.product_service import ProductService
+from app.services.stock_query_service import StockQueryService, format_snapshot_stream
+from app.services.product_catalog_cache import product_catalog_cache
+from app.services.bom_service import BOMService
+from app.core.database import SessionLocal
 from app.models.transaction import Transaction
 from app.models.warehouse import Warehouse
 from app.models.product_bom import ProductBOM
@@ -32,6 +37,7 @@ def get_products(
     category: Optional[str] = Query(None, description="Filter by category"),
     warehouse_id: Optional[UUID] = Query(None, description="Filter by warehouse"),
     is_active: Optional[bool] = Query(True, description="Filter by active status"),
+    include_buildable: bool = Query(False, description="세트 상품의 조립 가능 수량 포함"),
     db: Session = Depends(get_current_db)
 ):
     """
@@ -106,6 +112,9 @@ def get_products(
             'quantity': bom.quantity
         })
 
+    # 3. 세트 상품의 조립 가능 수량 (요청 시, BOM이 있는 제품만 한 번에 계산)
+    buildable_map = BOMService.get_buildable_map(db, bom_map.keys()) if include_buildable else {}
+
     # 제품 응답 생성
     product_responses = []
     for product in products:
@@ -128,6 +137,7 @@ def get_products(
             "sale_price": product.sale_price or 0,
             "current_stock": product.current_stock or 0,
             "safety_stock": product.safety_stock or 0,
+            "on_order_qty": product.on_order_qty or 0,
             "is_auto_calculated": product.is_auto_calculated if product.is_auto_calculated is not None else False,
             "moq": product.moq or 1,
             "lead_time_days": product.lead_time_days or 7,
@@ -152,6 +162,11 @@ def get_products(
             product_dict['discrepancy_count'] = 0
             product_dict['last_discrepancy_date'] = None
 
+        buildable = buildable_map.get(product.product_code)
+        if buildable:
+            product_dict['buildable_quantity'] = buildable['buildable_quantity']
+            product_dict['limiting_component'] = buildable['limiting_component']
+
         product_responses.append(ProductResponse(**product_dict))
 
     return ProductListResponse(
@@ -199,6 +214,119 @@ def check_product_code_duplicate(
     }
 
 
+@router.get("/barcode/{barcode}", response_model=BarcodeLookupResponse)
+def get_product_by_barcode(
+    barcode: str,
+    db: Session = Depends(get_current_db)
+):
+    """
+    바코드로 제품 조회 (정확 일치)
+
+    메모리의 바코드 인덱스를 사용하므로 스캔마다 DB 검색을 하지 않습니다.
+    """
+    product = product_catalog_cache.get_by_barcode(db, barcode)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"바코드 {barcode}에 해당하는 제품을 찾을 수 없습니다"
+        )
+
+    return BarcodeLookupResponse(
+        barcode=barcode.strip(),
+        product_code=product.product_code,
+        product_name=product.product_name,
+        category=product.category,
+        unit=product.unit,
+        is_active=product.is_active
+    )
+
+
+@router.get("/past-quantity", response_model=PastQuantityResponse)
+def get_past_quantity(
+    product_code: str = Query(..., description="제품 코드"),
+    target_date: date = Query(..., description="조회할 날짜"),
+    db: Session = Depends(get_current_db)
+):
+    """
+    특정 날짜(종료 시점)의 제품 수량을 조회합니다.
+
+    가장 가까운 일일 수불부/체크포인트를 기준으로 그 이후 거래만 반영하므로
+    조회 날짜가 오래될수록 느려지지 않습니다.
+    """
+    product = ProductService.get_product_by_code(db, product_code)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"제품 코드 {product_code}를 찾을 수 없습니다"
+        )
+
+    stock = StockQueryService.get_stock_as_of(db, product, target_date)
+
+    # 해당 날짜의 트랜잭션 내역
+    day_transactions = StockQueryService.get_day_transactions(db, product_code, target_date)
+
+    transaction_summary = []
+    for trans in day_transactions:
+        transaction_summary.append({
+            "transaction_type": trans.transaction_type,
+            "quantity": trans.quantity,
+            "created_at": trans.transaction_date.isoformat(),
+            "memo": trans.memo
+        })
+
+    return PastQuantityResponse(
+        product_code=product_code,
+        product_name=product.product_name,
+        target_date=target_date,
+        quantity=max(0, stock["quantity"]),
+        current_stock=product.current_stock,
+        transactions=transaction_summary,
+        anchor_type=stock["anchor_type"],
+        anchor_date=stock["anchor_date"]
+    )
+
+
+@router.get("/stock-snapshot")
+def get_stock_snapshot(
+    dates: List[date] = Query(..., description="조회할 날짜 (여러 개 지정 가능)"),
+    product_codes: Optional[List[str]] = Query(None, description="제품 코드 필터"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    warehouse_id: Optional[UUID] = Query(None, description="Filter by warehouse"),
+    is_active: Optional[bool] = Query(True, description="Filter by active status"),
+    format: str = Query("csv", pattern="^(csv|json)$", description="출력 형식 (csv/json)")
+):
+    """
+    전체(또는 필터된) 제품의 날짜별 시점 재고를 한 번에 조회합니다.
+
+    제품별로 /past-quantity를 반복 호출하는 대신 하나의 쿼리로 계산하며,
+    결과는 서버 측 커서로 읽으면서 바로 스트리밍합니다.
+    """
+    if len(dates) > 31:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="한 번에 조회할 수 있는 날짜는 최대 31개입니다"
+        )
+
+    def generate():
+        # 응답 스트리밍이 끝날 때까지 유지되어야 하므로 전용 세션 사용
+        db = SessionLocal()
+        try:
+            rows = StockQueryService.iter_stock_snapshot(
+                db, dates, product_codes, category, warehouse_id, is_active
+            )
+            for chunk in format_snapshot_stream(rows, format):
+                yield chunk
+        finally:
+            db.close()
+
+    filename = f"stock_snapshot_{min(dates).isoformat()}_{max(dates).isoformat()}.{format}"
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv" if format == "csv" else "application/json",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
 @router.get("/{product_code}", response_model=ProductResponse)
 def get_product(
     product_code: str,
@@ -300,70 +428,3 @@ def calculate_safety_stock(
         success=True,
         message=f"Safety stock calculated: {safety_stock}"
     )
-
-
-@router.get("/past-quantity", response_model=PastQuantityResponse)
-def get_past_quantity(
-    product_code: str = Query(..., description="제품 코드"),
-    target_date: date = Query(..., description="조회할 날짜"),
-    db: Session = Depends(get_current_db)
-):
-    """특정 날짜의 제품 수량을 조회합니다."""
-    from app.models.product import Product
-
-    # 제품 확인
-    product = db.query(Product).filter(Product.product_code == product_code).first()
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"제품 코드 {product_code}를 찾을 수 없습니다"
-        )
-
-    # 대상 날짜 이후의 모든 트랜잭션 조회
-    target_datetime = datetime.combine(target_date, datetime.max.time())
-
-    transactions = db.query(Transaction).filter(
-        and_(
-            Transaction.product_code == product_code,
-            Transaction.created_at > target_datetime
-        )
-    ).order_by(Transaction.created_at).all()
-
-    # 현재 재고에서 역산
-    calculated_quantity = product.current_stock
-
-    for transaction in transactions:
-        if transaction.transaction_type == "IN":
-            calculated_quantity -= transaction.quantity
-        elif transaction.transaction_type == "OUT":
-            calculated_quantity += transaction.quantity
-        elif transaction.transaction_type == "adjustment":
-            calculated_quantity -= transaction.quantity
-        elif transaction.transaction_type == "return":
-            calculated_quantity += transaction.quantity
-
-    # 해당 날짜의 트랜잭션 내역
-    day_transactions = db.query(Transaction).filter(
-        and_(
-            Transaction.product_code == product_code,
-            func.date(Transaction.created_at) == target_date
-        )
-    ).all()
-
-    transaction_summary = []
-    for trans in day_transactions:
-        transaction_summary.append({
-            "transaction_type": trans.transaction_type,
-            "quantity": trans.quantity,
-            "created_at": trans.created_at.isoformat(),
-            "memo": trans.memo
-        })
-
-    return PastQuantityResponse(
-        product_code=product_code,
-        product_name=product.product_name,
-        target_date=target_date,
-        quantity=max(0, calculated_quantity),
-        current_stock=product.current_stock,
-        transactions=transaction_summary
-    )
\ No newline at end of file
@@ -11,7 +11,8 @@ import uuid
 
 from app.core.database import get_db
 from app.models.purchase_order import PurchaseOrder, PurchaseOrderItem
-from app.models.product import Product
+from app.services.purchase_order_service import PurchaseOrderService
+from app.services.reorder_service import ReorderService, DEFAULT_DEMAND_DAYS
 
 router = APIRouter()
 
@@ -40,6 +41,15 @@ class PurchaseOrderUpdate(BaseModel):
     notes: Optional[str] = None
     items: Optional[List[PurchaseOrderItemUpdate]] = None
 
+class PurchaseOrderReceiveItem(BaseModel):
+    item_id: str
+    quantity: int
+
+class PurchaseOrderReceiveRequest(BaseModel):
+    items: List[PurchaseOrderReceiveItem]
+    transaction_date: Optional[datetime] = None
+    created_by: Optional[str] = None
+
 class PurchaseOrderResponse(BaseModel):
     id: str
     po_number: str
@@ -65,7 +75,7 @@ def get_purchase_orders(
     """
     발주서 목록 조회
     """
-    query = db.query(PurchaseOrder)
+    query = PurchaseOrderService.get_order_query(db)
     
     if status:
         query = query.filter(PurchaseOrder.status == status)
@@ -74,51 +84,29 @@ def get_purchase_orders(
     
     orders = query.order_by(PurchaseOrder.created_at.desc()).offset(skip).limit(limit).all()
     
-    result = []
-    for order in orders:
-        # 발주 항목 조회
-        items = db.query(PurchaseOrderItem).filter(
-            PurchaseOrderItem.po_id == order.id
-        ).all()
-        
-        items_data = []
-        product_name = ""  # 첫 번째 품목명 저장용
-        currency = "KRW"  # 기본 통화
-        for item in items:
-            product = db.query(Product).filter(Product.product_code == item.product_code).first()
-            if product:
-                if not product_name:  # 첫 번째 품목명 저장
-                    product_name = product.product_name
-                # 첫 번째 제품의 구매 통화 저장
-                if hasattr(product, 'purchase_currency') and product.purchase_currency:
-                    currency = product.purchase_currency
-            items_data.append({
-                "id": str(item.id),
-                "product_code": item.product_code,
-                "product_name": product.product_name if product else "",
-                "ordered_quantity": item.ordered_quantity,
-                "received_quantity": item.received_quantity,
-                "unit_price": float(item.unit_price),
-                "subtotal": float(item.ordered_quantity * item.unit_price),
-                "status": item.status
-            })
-        
-        result.append({
-            "id": str(order.id),
-            "po_number": order.po_number,
-            "supplier": order.supplier,
-            "status": order.status,
-            "total_amount": float(order.total_amount),
-            "expected_date": order.expected_date.isoformat() if order.expected_date else None,
-            "notes": order.notes,
-            "created_at": order.created_at.isoformat(),
-            "updated_at": order.updated_at.isoformat(),
-            "items": items_data,
-            "product_name": product_name,  # 첫 번째 품목명 추가
-            "currency": currency  # 통화 정보 추가
-        })
+    return PurchaseOrderService.serialize_many(db, orders)
+
+def _build_order(po_number: str, order_data: PurchaseOrderCreate) -> PurchaseOrder:
+    """발주서와 발주 항목 객체 생성 (세션 추가/커밋은 호출자에서)"""
+    items = [
+        PurchaseOrderItem(
+            product_code=item_data.product_code,
+            ordered_quantity=item_data.ordered_quantity,
+            unit_price=item_data.unit_price,
+            status="pending"
+        )
+        for item_data in order_data.items
+    ]
     
-    return result
+    return PurchaseOrder(
+        po_number=po_number,
+        supplier=order_data.supplier,
+        status="draft",
+        expected_date=order_data.expected_date,
+        notes=order_data.notes,
+        total_amount=sum(i.ordered_quantity * i.unit_price for i in order_data.items),
+        items=items
+    )
 
 @router.post("/", response_model=PurchaseOrderResponse)
 def create_purchase_order(
@@ -128,95 +116,90 @@ def create_purchase_order(
     """
     새 발주서 생성
     """
-    # PO 번호 생성 (연도-월-순번 형식)
-    today = datetime.now()
-    po_prefix = f"PO{today.year}{today.month:02d}"
-    
-    # 이번 달 마지막 발주서 번호 찾기
-    last_order = db.query(PurchaseOrder).filter(
-        PurchaseOrder.po_number.like(f"{po_prefix}%")
-    ).order_by(PurchaseOrder.po_number.desc()).first()
-    
-    if last_order:
-        last_num = int(last_order.po_number[-4:])
-        new_num = last_num + 1
-    else:
-        new_num = 1
-    
-    po_number = f"{po_prefix}{new_num:04d}"
-    
-    # 발주서 생성
-    order = PurchaseOrder(
-        po_number=po_number,
-        supplier=order_data.supplier,
-        status="draft",
-        expected_date=order_data.expected_date,
-        notes=order_data.notes,
-        total_amount=0
-    )
+    # PO 번호 발급 (연도-월-순번 형식)
+    po_number = PurchaseOrderService.allocate_po_numbers(db)[0]
     
+    order = _build_order(po_number, order_data)
     db.add(order)
-    db.flush()  # ID 생성
-    
-    # 발주 항목 추가
-    total_amount = 0
-    items_data = []
-    
-    for item_data in order_data.items:
-        item = PurchaseOrderItem(
-            po_id=order.id,
-            product_code=item_data.product_code,
-            ordered_quantity=item_data.ordered_quantity,
-            unit_price=item_data.unit_price,
-            status="pending"
-        )
-        db.add(item)
-        total_amount += item_data.ordered_quantity * item_data.unit_price
-        
-        # 제품 정보 가져오기
-        product = db.query(Product).filter(Product.product_code == item.product_code).first()
-        items_data.append({
-            "id": str(item.id),
-            "product_code": item.product_code,
-            "product_name": product.product_name if product else "",
-            "ordered_quantity": item.ordered_quantity,
-            "received_quantity": 0,
-            "unit_price": float(item.unit_price),
-            "subtotal": float(item.ordered_quantity * item.unit_price),
-            "status": item.status
-        })
+    PurchaseOrderService.refresh_on_order_qty(db, [item.product_code for item in order.items])
+    db.commit()
     
-    # 총 금액 업데이트
-    order.total_amount = total_amount
+    order = PurchaseOrderService.get_order(db, order.id)
+    return PurchaseOrderService.serialize_many(db, [order])[0]
+
+@router.post("/bulk", response_model=List[PurchaseOrderResponse])
+def create_purchase_orders_bulk(
+    orders_data: List[PurchaseOrderCreate],
+    db: Session = Depends(get_db)
+):
+    """
+    발주서 일괄 생성 (대량 등록용)
     
+    PO 번호를 한 번에 연속 발급하고 전체를 한 번에 커밋합니다.
+    """
+    if not orders_data:
+        raise HTTPException(status_code=400, detail="생성할 발주서가 없습니다")
+    if len(orders_data) > 1000:
+        raise HTTPException(status_code=400, detail="한 번에 최대 1000건까지 생성할 수 있습니다")
+    
+    po_numbers = PurchaseOrderService.allocate_po_numbers(db, len(orders_data))
+    
+    orders = [
+        _build_order(po_number, order_data)
+        for po_number, order_data in zip(po_numbers, orders_data)
+    ]
+    db.add_all(orders)
+    PurchaseOrderService.refresh_on_order_qty(
+        db, [item.product_code for order in orders for item in order.items]
+    )
     db.commit()
-    db.refresh(order)
     
-    # 첫 번째 제품의 통화 정보 가져오기
-    currency = "KRW"
-    product_name = ""
-    if items_data:
-        first_product = db.query(Product).filter(Product.product_code == items_data[0]["product_code"]).first()
-        if first_product:
-            product_name = first_product.product_name
-            if hasattr(first_product, 'purchase_currency') and first_product.purchase_currency:
-                currency = first_product.purchase_currency
+    order_ids = [order.id for order in orders]
+    saved = PurchaseOrderService.get_order_query(db).filter(
+        PurchaseOrder.id.in_(order_ids)
+    ).order_by(PurchaseOrder.po_number).all()
+    return PurchaseOrderService.serialize_many(db, saved)
+
+@router.get("/reorder-suggestions")
+def get_reorder_suggestions(
+    supplier: Optional[str] = Query(None, description="공급업체 필터"),
+    category: Optional[str] = Query(None, description="카테고리 필터"),
+    demand_days: int = Query(DEFAULT_DEMAND_DAYS, ge=7, le=365, description="일평균 출고량 계산 기간(일)"),
+    db: Session = Depends(get_db)
+):
+    """
+    발주 제안 조회
+    
+    전체 활성 제품의 예상 재고(현재 재고 + 미입고 발주 - 리드타임 출고량)를 한 번에 계산하여
+    안전 재고 미만인 제품과 공급업체별 발주서 초안을 반환합니다.
+    """
+    suggestions = ReorderService.get_suggestions(db, demand_days, supplier, category)
+    drafts = ReorderService.group_by_supplier(suggestions)
     
     return {
-        "id": str(order.id),
-        "po_number": order.po_number,
-        "supplier": order.supplier,
-        "status": order.status,
-        "total_amount": float(order.total_amount),
-        "expected_date": order.expected_date.isoformat() if order.expected_date else None,
-        "notes": order.notes,
-        "created_at": order.created_at.isoformat(),
-        "updated_at": order.updated_at.isoformat(),
-        "items": items_data,
-        "product_name": product_name,
-        "currency": currency
+        "total": len(suggestions),
+        "suggestions": suggestions,
+        "drafts": drafts
     }
 
+@router.post("/reorder-suggestions/drafts", response_model=List[PurchaseOrderResponse])
+def create_reorder_drafts(
+    supplier: Optional[str] = Query(None, description="공급업체 필터"),
+    category: Optional[str] = Query(None, description="카테고리 필터"),
+    demand_days: int = Query(DEFAULT_DEMAND_DAYS, ge=7, le=365, description="일평균 출고량 계산 기간(일)"),
+    db: Session = Depends(get_db)
+):
+    """
+    발주 제안으로 공급업체별 draft 발주서 생성
+    """
+    suggestions = ReorderService.get_suggestions(db, demand_days, supplier, category)
+    drafts = ReorderService.group_by_supplier(suggestions)
+    if not drafts:
+        return []
+    
+    orders_data = [PurchaseOrderCreate(**draft) for draft in drafts]
+    return create_purchase_orders_bulk(orders_data, db)
+
 @router.get("/{po_id}", response_model=PurchaseOrderResponse)
 def get_purchase_order(
     po_id: str,
@@ -225,53 +208,8 @@ def get_purchase_order(
     """
     발주서 상세 조회
     """
-    order = db.query(PurchaseOrder).filter(
-        PurchaseOrder.id == uuid.UUID(po_id)
-    ).first()
-    
-    if not order:
-        raise HTTPException(status_code=404, detail="발주서를 찾을 수 없습니다")
-    
-    # 발주 항목 조회
-    items = db.query(PurchaseOrderItem).filter(
-        PurchaseOrderItem.po_id == order.id
-    ).all()
-    
-    items_data = []
-    currency = "KRW"
-    product_name = ""
-    for item in items:
-        product = db.query(Product).filter(Product.product_code == item.product_code).first()
-        if product:
-            if not product_name:
-                product_name = product.product_name
-            if hasattr(product, 'purchase_currency') and product.purchase_currency:
-                currency = product.purchase_currency
-        items_data.append({
-            "id": str(item.id),
-            "product_code": item.product_code,
-            "product_name": product.product_name if product else "",
-            "ordered_quantity": item.ordered_quantity,
-            "received_quantity": item.received_quantity,
-            "unit_price": float(item.unit_price),
-            "subtotal": float(item.ordered_quantity * item.unit_price),
-            "status": item.status
-        })
-    
-    return {
-        "id": str(order.id),
-        "po_number": order.po_number,
-        "supplier": order.supplier,
-        "status": order.status,
-        "total_amount": float(order.total_amount),
-        "expected_date": order.expected_date.isoformat() if order.expected_date else None,
-        "notes": order.notes,
-        "created_at": order.created_at.isoformat(),
-        "updated_at": order.updated_at.isoformat(),
-        "items": items_data,
-        "product_name": product_name,
-        "currency": currency
-    }
+    order = PurchaseOrderService.get_order(db, po_id)
+    return PurchaseOrderService.serialize_many(db, [order])[0]
 
 @router.put("/{po_id}")
 def update_purchase_order(
@@ -282,12 +220,9 @@ def update_purchase_order(
     """
     발주서 전체 정보 수정
     """
-    order = db.query(PurchaseOrder).filter(
-        PurchaseOrder.id == uuid.UUID(po_id)
-    ).first()
-    
-    if not order:
-        raise HTTPException(status_code=404, detail="발주서를 찾을 수 없습니다")
+    order = PurchaseOrderService.get_order(db, po_id)
+    # 변경 전 품목 (품목 제품 코드가 바뀌면 이전 제품도 재계산)
+    affected_codes = {item.product_code for item in order.items}
     
     # 발주서 기본 정보 업데이트
     if order_data.supplier is not None:
@@ -304,12 +239,11 @@ def update_purchase_order(
     # 발주 항목 업데이트
     if order_data.items is not None:
         total_amount = 0
+        existing_items = {str(item.id): item for item in order.items}
         for item_data in order_data.items:
             if item_data.item_id:
                 # 기존 항목 업데이트
-                item = db.query(PurchaseOrderItem).filter(
-                    PurchaseOrderItem.id == uuid.UUID(item_data.item_id)
-                ).first()
+                item = existing_items.get(item_data.item_id)
                 if item:
                     item.product_code = item_data.product_code
                     item.ordered_quantity = item_data.ordered_quantity
@@ -326,57 +260,16 @@ def update_purchase_order(
                 )
                 db.add(new_item)
                 total_amount += item_data.ordered_quantity * item_data.unit_price
+            affected_codes.add(item_data.product_code)
         
         # 총 금액 업데이트
         order.total_amount = total_amount
     
+    PurchaseOrderService.refresh_on_order_qty(db, affected_codes)
     db.commit()
-    db.refresh(order)
-    
-    # 응답 데이터 구성
-    items = db.query(PurchaseOrderItem).filter(
-        PurchaseOrderItem.po_id == order.id
-    ).all()
-    
-    items_data = []
-    product_name = ""
-    currency = "KRW"  # 기본값
     
-    for item in items:
-        product = db.query(Product).filter(Product.product_code == item.product_code).first()
-        if product:
-            if not product_name:
-                product_name = product.product_name
-            # 제품의 구매 통화 정보 가져오기
-            if product.purchase_currency:
-                currency = product.purchase_currency
-                
-        items_data.append({
-            "id": str(item.id),
-            "product_code": item.product_code,
-            "product_name": product.product_name if product else "",
-            "ordered_quantity": item.ordered_quantity,
-            "received_quantity": item.received_quantity,
-            "unit_price": float(item.unit_price),
-            "subtotal": float(item.ordered_quantity * item.unit_price),
-            "status": item.status,
-            "currency": currency
-        })
-    
-    return {
-        "id": str(order.id),
-        "po_number": order.po_number,
-        "supplier": order.supplier,
-        "status": order.status,
-        "total_amount": float(order.total_amount),
-        "expected_date": order.expected_date.isoformat() if order.expected_date else None,
-        "notes": order.notes,
-        "created_at": order.created_at.isoformat(),
-        "updated_at": order.updated_at.isoformat(),
-        "items": items_data,
-        "product_name": product_name,
-        "currency": currency
-    }
+    order = PurchaseOrderService.get_order(db, order.id)
+    return PurchaseOrderService.serialize_many(db, [order])[0]
 
 @router.put("/{po_id}/status")
 def update_purchase_order_status(
@@ -398,10 +291,28 @@ def update_purchase_order_status(
         raise HTTPException(status_code=400, detail="유효하지 않은 상태입니다")
     
     order.status = status
+    PurchaseOrderService.refresh_on_order_qty(db, [item.product_code for item in order.items])
     db.commit()
     
     return {"message": f"발주서 상태가 {status}로 변경되었습니다"}
 
+@router.post("/receive")
+def receive_purchase_orders_bulk(
+    request: PurchaseOrderReceiveRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    여러 발주서의 입고를 한 번에 처리
+    
+    항목별 IN 거래를 기록하고 재고/항목/발주서 상태를 한 번의 커밋으로 반영합니다.
+    """
+    return PurchaseOrderService.receive_items(
+        db,
+        [item.model_dump() for item in request.items],
+        created_by=request.created_by or "system",
+        transaction_date=request.transaction_date
+    )
+
 @router.post("/{po_id}/receive")
 def receive_purchase_order_items(
     po_id: str,
@@ -411,45 +322,9 @@ def receive_purchase_order_items(
     """
     발주 제품 입고 처리
     """
-    order = db.query(PurchaseOrder).filter(
-        PurchaseOrder.id == uuid.UUID(po_id)
-    ).first()
+    order = PurchaseOrderService.get_order(db, po_id)
     
-    if not order:
-        raise HTTPException(status_code=404, detail="발주서를 찾을 수 없습니다")
-    
-    for received_item in received_items:
-        item = db.query(PurchaseOrderItem).filter(
-            PurchaseOrderItem.id == uuid.UUID(received_item['item_id'])
-        ).first()
-        
-        if item:
-            item.received_quantity += received_item['quantity']
-            
-            # 상태 업데이트
-            if item.received_quantity >= item.ordered_quantity:
-                item.status = 'received'
-            elif item.received_quantity > 0:
-                item.status = 'partial'
-            
-            # 제품 재고 업데이트
-            product = db.query(Product).filter(Product.product_code == item.product_code).first()
-            if product:
-                product.current_stock += received_item['quantity']
-    
-    # 발주서 상태 확인 및 업데이트
-    all_items = db.query(PurchaseOrderItem).filter(
-        PurchaseOrderItem.po_id == order.id
-    ).all()
-    
-    if all(item.status == 'received' for item in all_items):
-        order.status = 'completed'
-    elif any(item.status in ['partial', 'received'] for item in all_items):
-        order.status = 'partial'
-    
-    db.commit()
-    
-    return {"message": "입고 처리가 완료되었습니다"}
+    return PurchaseOrderService.receive_items(db, received_items, po_id=order.id)
 
 @router.delete("/{po_id}")
 def delete_purchase_order(
@@ -474,6 +349,12 @@ def delete_purchase_order(
             detail="입고가 진행된 발주서는 삭제할 수 없습니다. 대신 취소 상태로 변경해주세요."
         )
     
+    affected_codes = [
+        code for (code,) in db.query(PurchaseOrderItem.product_code).filter(
+            PurchaseOrderItem.po_id == order.id
+        ).distinct()
+    ]
+    
     # 발주서와 연관된 항목들 삭제
     db.query(PurchaseOrderItem).filter(
         PurchaseOrderItem.po_id == order.id
@@ -481,6 +362,7 @@ def delete_purchase_order(
     
     # 발주서 삭제
     db.delete(order)
+    PurchaseOrderService.refresh_on_order_qty(db, affected_codes)
     db.commit()
     
     return {"message": "발주서가 삭제되었습니다"}
\ No newline at end of file
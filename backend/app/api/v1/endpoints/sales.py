@@ -3,51 +3,34 @@ Sales Analysis API Endpoints
 """
 from typing import Optional
 from datetime import date, datetime, timedelta
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import and_
 
 from app.core.database import get_db
 from app.models.product import Product
-from app.models.transaction import Transaction
+from app.models.sales_daily_fact import SalesDailyFact
 from app.schemas.sales import SalesAnalysisResponse
+from app.services.sales_fact_service import SalesFactService
 
 router = APIRouter()
 
 
-@router.get("/analysis", response_model=SalesAnalysisResponse)
-def get_sales_analysis(
-    start_date: Optional[date] = Query(None, description="시작 날짜"),
-    end_date: Optional[date] = Query(None, description="종료 날짜"),
-    group_by: str = Query("daily", description="그룹화 기준 (daily, weekly, monthly)"),
-    db: Session = Depends(get_db)
-):
-    """매출 분석 정보를 조회합니다."""
+def _summarize_rows(rows):
+    """
+    (날짜, 제품) 단위 집계 행을 일별/제품별/카테고리별 매출로 합산
 
-    # 기본 날짜 설정 (지난 30일)
-    if not end_date:
-        end_date = date.today()
-    if not start_date:
-        start_date = end_date - timedelta(days=30)
+    행은 SalesFactService.build_fact_select와 같은 컬럼
+    (fact_date, product_code, category, quantity, transaction_count, revenue_krw, product_name)
+    """
+    daily_sales = {}
+    product_sales = {}
+    category_sales = {}
 
-    # 출고 트랜잭션 조회
-    out_transactions = db.query(
-        Transaction,
-        Product
-    ).join(
-        Product, Transaction.product_code == Product.product_code
-    ).filter(
-        and_(
-            Transaction.transaction_type == 'OUT',
-            func.date(Transaction.created_at) >= start_date,
-            func.date(Transaction.created_at) <= end_date
-        )
-    ).all()
+    for row in rows:
+        date_str = row.fact_date.strftime('%Y-%m-%d')
+        sales_amount = float(row.revenue_krw or 0)
 
-    # 일별 매출 계산
-    daily_sales = {}
-    for trans, product in out_transactions:
-        date_str = trans.created_at.strftime('%Y-%m-%d')
         if date_str not in daily_sales:
             daily_sales[date_str] = {
                 'date': date_str,
@@ -55,50 +38,113 @@ def get_sales_analysis(
                 'quantity_sold': 0,
                 'transaction_count': 0
             }
-
-        sales_amount = float(trans.quantity * product.sale_price)
         daily_sales[date_str]['sales_amount'] += sales_amount
-        daily_sales[date_str]['quantity_sold'] += trans.quantity
-        daily_sales[date_str]['transaction_count'] += 1
+        daily_sales[date_str]['quantity_sold'] += row.quantity
+        daily_sales[date_str]['transaction_count'] += row.transaction_count
 
-    # 제품별 매출 순위
-    product_sales = {}
-    for trans, product in out_transactions:
-        if product.product_code not in product_sales:
-            product_sales[product.product_code] = {
-                'product_code': product.product_code,
-                'product_name': product.product_name,
+        if row.product_code not in product_sales:
+            product_sales[row.product_code] = {
+                'product_code': row.product_code,
+                'product_name': row.product_name or row.product_code,
                 'quantity_sold': 0,
                 'sales_amount': 0,
                 'transaction_count': 0
             }
+        product_sales[row.product_code]['quantity_sold'] += row.quantity
+        product_sales[row.product_code]['sales_amount'] += sales_amount
+        product_sales[row.product_code]['transaction_count'] += row.transaction_count
 
-        sales_amount = float(trans.quantity * product.sale_price)
-        product_sales[product.product_code]['quantity_sold'] += trans.quantity
-        product_sales[product.product_code]['sales_amount'] += sales_amount
-        product_sales[product.product_code]['transaction_count'] += 1
-
-    # 상위 10개 제품
-    top_products = sorted(
-        product_sales.values(),
-        key=lambda x: x['sales_amount'],
-        reverse=True
-    )[:10]
-
-    # 카테고리별 매출
-    category_sales = {}
-    for trans, product in out_transactions:
-        cat = product.category or 'Unknown'
+        cat = row.category or 'Unknown'
         if cat not in category_sales:
             category_sales[cat] = {
                 'category': cat,
                 'sales_amount': 0,
                 'quantity_sold': 0
             }
-
-        sales_amount = float(trans.quantity * product.sale_price)
         category_sales[cat]['sales_amount'] += sales_amount
-        category_sales[cat]['quantity_sold'] += trans.quantity
+        category_sales[cat]['quantity_sold'] += row.quantity
+
+    return daily_sales, product_sales, category_sales
+
+
+def _aggregate_from_facts(db: Session, start_date: date, end_date: date):
+    """
+    집계 테이블(sales_daily_fact)에서 일별/제품별/카테고리별 매출 계산
+
+    원본 거래 대신 (날짜, 제품) 단위로 미리 집계된 행만 읽음
+    """
+    rows = db.query(
+        SalesDailyFact.fact_date,
+        SalesDailyFact.product_code,
+        SalesDailyFact.category,
+        SalesDailyFact.quantity,
+        SalesDailyFact.transaction_count,
+        SalesDailyFact.revenue_krw,
+        Product.product_name
+    ).outerjoin(
+        Product, SalesDailyFact.product_code == Product.product_code
+    ).filter(
+        and_(
+            SalesDailyFact.transaction_type == 'OUT',
+            SalesDailyFact.fact_date >= start_date,
+            SalesDailyFact.fact_date <= end_date
+        )
+    ).all()
+
+    return _summarize_rows(rows)
+
+
+def _aggregate_from_transactions(db: Session, start_date: date, end_date: date):
+    """
+    원본 거래(transactions)에서 일별/제품별/카테고리별 매출 계산
+
+    집계 테이블 적재와 같은 SELECT(SalesFactService.build_fact_select)를 바로 실행하므로
+    날짜 기준(KST 거래일)과 금액(원화 환산)이 집계 테이블 경로와 같음
+    """
+    facts = SalesFactService.build_fact_select(start_date, end_date, ('OUT',)).subquery()
+
+    rows = db.query(
+        facts.c.fact_date,
+        facts.c.product_code,
+        facts.c.category,
+        facts.c.quantity,
+        facts.c.transaction_count,
+        facts.c.revenue_krw,
+        Product.product_name
+    ).outerjoin(
+        Product, facts.c.product_code == Product.product_code
+    ).all()
+
+    return _summarize_rows(rows)
+
+
+@router.get("/analysis", response_model=SalesAnalysisResponse)
+def get_sales_analysis(
+    start_date: Optional[date] = Query(None, description="시작 날짜"),
+    end_date: Optional[date] = Query(None, description="종료 날짜"),
+    group_by: str = Query("daily", description="그룹화 기준 (daily, weekly, monthly)"),
+    use_fact: bool = Query(False, description="사전 집계 테이블(sales_daily_fact) 사용 여부"),
+    db: Session = Depends(get_db)
+):
+    """매출 분석 정보를 조회합니다."""
+
+    # 기본 날짜 설정 (지난 30일)
+    if not end_date:
+        end_date = date.today()
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+
+    if use_fact:
+        daily_sales, product_sales, category_sales = _aggregate_from_facts(db, start_date, end_date)
+    else:
+        daily_sales, product_sales, category_sales = _aggregate_from_transactions(db, start_date, end_date)
+
+    # 상위 10개 제품
+    top_products = sorted(
+        product_sales.values(),
+        key=lambda x: x['sales_amount'],
+        reverse=True
+    )[:10]
 
     # 총계 계산
     total_sales = sum(d['sales_amount'] for d in daily_sales.values())
@@ -166,4 +212,39 @@ def get_sales_analysis(
         sales_trend=sales_trend,
         top_products=top_products,
         category_sales=list(category_sales.values())
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/facts/rebuild", response_model=dict)
+def rebuild_sales_facts(
+    start_date: date = Query(..., description="재적재 시작 날짜"),
+    end_date: date = Query(..., description="재적재 종료 날짜"),
+    db: Session = Depends(get_db)
+):
+    """
+    기간 내 매출/폐기 집계 테이블을 원본 거래에서 재적재합니다.
+    과거 이력 일괄 등록 후 등 집계가 어긋난 구간을 다시 맞출 때 사용합니다.
+    """
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="시작 날짜가 종료 날짜보다 늦을 수 없습니다")
+
+    result = SalesFactService.rebuild_range(db, start_date, end_date)
+    return {
+        "message": f"{start_date} ~ {end_date} 매출 집계 재적재 완료",
+        **result
+    }
+
+
+@router.get("/year-over-year", response_model=dict)
+def get_sales_year_over_year(
+    start_date: Optional[date] = Query(None, description="시작 날짜"),
+    end_date: Optional[date] = Query(None, description="종료 날짜"),
+    db: Session = Depends(get_db)
+):
+    """기간 매출을 전년 동기간과 비교합니다 (집계 테이블 기준, 기본 종료일은 집계가 끝난 어제)."""
+    if not end_date:
+        end_date = date.today() - timedelta(days=1)
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+
+    return SalesFactService.get_year_over_year(db, start_date, end_date)
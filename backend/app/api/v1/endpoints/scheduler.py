@@ -109,6 +109,7 @@ async def trigger_job(request: TriggerJobRequest):
     try:
         job_map = {
             "Daily Ledger 생성": "daily_ledger",
+            "매출 집계 적재": "sales_fact_refresh",
             "발주서 상태 확인": "purchase_order_check",
             "시스템 헬스 체크": "health_check",
             "안전 재고량 자동 업데이트": "safety_stock_update"
@@ -12,6 +12,7 @@ from app.api.deps import get_db
 from app.models.product import Product
 from app.models.transaction import Transaction
 from app.schemas.common import BaseResponse
+from app.services.sales_fact_service import SalesFactService
 
 router = APIRouter()
 
@@ -299,6 +300,11 @@ def get_dashboard_stats(
             "quantity": supplement_qty
         })
     
+    # 전년 동기 대비 매출 (이번 달 1일 ~ 어제, 사전 집계 테이블 기준)
+    # 집계 테이블은 어제까지만 적재되므로 오늘을 포함하면 올해 기간만 하루가 빠짐 (1일에는 지난달 전체)
+    yoy_end = today - timedelta(days=1)
+    year_over_year = SalesFactService.get_year_over_year(db, yoy_end.replace(day=1), yoy_end)
+
     data = {
         "today": {
             "inbound": today_inbound,
@@ -325,6 +331,7 @@ def get_dashboard_stats(
             "totalLossAmount": round(month_loss, 0)  # 총 손실액 (조정 + 폐기 포함)
         },
         "categoryOutboundTrend": category_outbound_trend,
+        "yearOverYear": year_over_year,
         "pendingDiscrepancies": []  # 실제로는 별도 테이블에서 가져와야 함
     }
     
@@ -12,11 +12,14 @@ from app.core.database import get_db
 from app.models.stock_checkpoint import StockCheckpoint, CheckpointType
 from app.models.product import Product
 from app.models.transaction import Transaction
+from app.services.checkpoint_head_service import CheckpointHeadService
 from app.schemas.stock_checkpoint import (
     StockCheckpointCreate,
     StockCheckpointUpdate,
     StockCheckpointResponse,
-    StockCheckpointValidation
+    StockCheckpointValidation,
+    BulkTransactionValidationRequest,
+    BulkTransactionValidationResponse
 )
 
 router = APIRouter()
@@ -80,6 +83,7 @@ def create_checkpoint(
     # 제품의 현재 재고를 체크포인트 재고로 업데이트
     product.current_stock = checkpoint.confirmed_stock
 
+    CheckpointHeadService.refresh(db, [checkpoint.product_code])
     db.commit()
     db.refresh(db_checkpoint)
 
@@ -149,6 +153,7 @@ def update_checkpoint(
 
     if checkpoint_update.is_active is not None:
         checkpoint.is_active = checkpoint_update.is_active
+        CheckpointHeadService.refresh(db, [checkpoint.product_code])
 
     db.commit()
     db.refresh(checkpoint)
@@ -169,22 +174,17 @@ def validate_transaction(
 ):
     """거래 날짜가 체크포인트 이전인지 검증"""
 
-    # 해당 제품의 가장 최근 활성 체크포인트 조회
-    latest_checkpoint = db.query(StockCheckpoint).filter(
-        and_(
-            StockCheckpoint.product_code == request.product_code,
-            StockCheckpoint.is_active == True,
-            StockCheckpoint.checkpoint_date <= request.transaction_date
-        )
-    ).order_by(desc(StockCheckpoint.checkpoint_date)).first()
+    # 해당 제품의 가장 최근 활성 체크포인트 (캐시 또는 기본키 조회)
+    # 거래 등록(create_transaction)과 같은 규칙: 거래 날짜 이후 체크포인트가 있으면 현재 재고에 미반영
+    latest_checkpoint = CheckpointHeadService.get_head(db, request.product_code)
 
-    if latest_checkpoint:
-        # 체크포인트가 존재하고 거래 날짜가 체크포인트 이후인 경우
+    if latest_checkpoint and latest_checkpoint.is_after(request.transaction_date):
+        # 체크포인트가 존재하고 거래 날짜가 체크포인트 이전인 경우
         return StockCheckpointValidation(
             is_valid=False,
-            message=f"이 거래는 {latest_checkpoint.checkpoint_date.strftime('%Y-%m-%d')} 체크포인트 이전 거래입니다. 현재 재고에는 반영되지 않습니다.",
+            message=f"이 거래는 {latest_checkpoint.checkpoint_day.strftime('%Y-%m-%d')} 체크포인트 이전 거래입니다. 현재 재고에는 반영되지 않습니다.",
             affects_current_stock=False,
-            checkpoint_id=latest_checkpoint.id
+            checkpoint_id=latest_checkpoint.checkpoint_id
         )
 
     # 체크포인트가 없거나 거래 날짜가 모든 체크포인트 이후인 경우
@@ -196,6 +196,29 @@ def validate_transaction(
     )
 
 
+@router.post("/validate-transactions", response_model=BulkTransactionValidationResponse)
+def validate_transactions_bulk(
+    request: BulkTransactionValidationRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    여러 거래의 체크포인트 일괄 검증 (CSV 가져오기 미리보기용)
+
+    제품별 최신 체크포인트를 한 번에 조회하여 행마다 현재 재고 반영 여부와 소속 체크포인트를 반환
+    """
+    results = CheckpointHeadService.validate_many(
+        db,
+        [(item.product_code, item.transaction_date) for item in request.items]
+    )
+
+    return BulkTransactionValidationResponse(
+        total=len(results),
+        past_count=sum(1 for r in results if not r["affects_current_stock"]),
+        unknown_product_count=sum(1 for r in results if not r["product_exists"]),
+        items=results
+    )
+
+
 @router.delete("/{checkpoint_id}")
 def delete_checkpoint(
     checkpoint_id: UUID,
@@ -220,6 +243,7 @@ def delete_checkpoint(
         synchronize_session=False
     )
 
+    CheckpointHeadService.refresh(db, [checkpoint.product_code])
     db.commit()
 
     return {"message": "체크포인트가 비활성화되었습니다"}
\ No newline at end of file
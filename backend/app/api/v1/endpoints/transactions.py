@@ -4,18 +4,20 @@ Transaction API Endpoints
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, date, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_db
 from app.schemas.transaction import (
     TransactionCreate, TransactionResponse, TransactionListResponse,
-    BatchTransactionCreate, StockCountRequest, TransactionSummaryResponse
+    BatchTransactionCreate, StockCountRequest, TransactionSummaryResponse,
+    ScanSessionRequest, ScanSessionResponse
 )
 from app.schemas.common import MessageResponse
 from app.services.transaction_service import TransactionService
+from app.services.transaction_stream_service import TransactionStreamService, DEFAULT_STREAM_BATCH_SIZE
 from app.models.product import Product
-from app.models.discrepancy import Discrepancy
 from sqlalchemy.orm import joinedload
 
 router = APIRouter()
@@ -125,6 +127,43 @@ def batch_create_transactions(
     )
 
 
+@router.post("/stream")
+async def stream_transactions(
+    request: Request,
+    batch_size: int = Query(DEFAULT_STREAM_BATCH_SIZE, ge=1, le=5000, description="한 번에 반영(커밋)할 줄 수"),
+    created_by: Optional[str] = Query(None, max_length=100, description="생성자")
+):
+    """
+    NDJSON 스트림 거래 등록 (채널 주문 동기화)
+
+    본문은 한 줄에 거래 하나 (external_id, transaction_type, product_code, quantity, date, reason, memo)
+    본문을 읽는 대로 batch_size 줄씩 반영하고, 줄별 결과({"line", "external_id", "status", "error"})를
+    NDJSON으로 바로 내려보냄 (status: created / duplicate / failed, 마지막 줄은 요약)
+    external_id가 같은 줄은 한 번만 반영
+    """
+    return StreamingResponse(
+        TransactionStreamService.stream_results(
+            request.stream(),
+            batch_size=batch_size,
+            created_by=created_by or "channel_stream"
+        ),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/scan-session", response_model=ScanSessionResponse)
+def process_scan_session(
+    request: ScanSessionRequest,
+    db: Session = Depends(get_current_db)
+):
+    """
+    바코드 스캔 세션 일괄 반영
+
+    같은 제품의 스캔은 합산하여 제품당 거래 1건으로 기록하고 한 번에 커밋합니다.
+    """
+    return TransactionService.process_scan_session(db, request)
+
+
 @router.post("/stock-count", response_model=MessageResponse)
 def process_stock_count(
     stock_count: StockCountRequest,
@@ -133,57 +172,14 @@ def process_stock_count(
     """
     Process stock count (inventory check)
     Creates adjustment transactions and discrepancy records
+
+    전체 실사 결과를 한 트랜잭션으로 반영 (일부만 반영되는 경우 없음)
     """
-    processed = 0
-    discrepancies_found = 0
-    
-    for count_item in stock_count.counts:
-        # Get product
-        product = db.query(Product).filter(Product.product_code == count_item.product_code).first()
-        if not product:
-            continue
-        
-        # Calculate discrepancy
-        discrepancy = count_item.physical_stock - product.current_stock
-        
-        if discrepancy != 0:
-            discrepancies_found += 1
-            
-            # Create discrepancy record
-            disc_record = Discrepancy(
-                product_code=count_item.product_code,
-                system_stock=product.current_stock,
-                physical_stock=count_item.physical_stock,
-                discrepancy=discrepancy,
-                explanation=count_item.explanation,
-                status="pending" if not count_item.explanation else "resolved"
-            )
-            
-            if count_item.explanation:
-                disc_record.resolved_at = datetime.now()
-                disc_record.resolved_by = stock_count.created_by or "system"
-            
-            db.add(disc_record)
-            
-            # Create adjustment transaction
-            if count_item.explanation:  # Only adjust if explanation provided
-                transaction = TransactionCreate(
-                    transaction_type="adjustment",
-                    product_code=count_item.product_code,
-                    quantity=discrepancy,
-                    reason="Stock Count",
-                    memo=count_item.explanation
-                )
-                TransactionService.create_transaction(
-                    db, transaction, stock_count.created_by or "system"
-                )
-                processed += 1
-    
-    db.commit()
-    
+    result = TransactionService.process_stock_count(db, stock_count)
+
     return MessageResponse(
         success=True,
-        message=f"Stock count completed. Processed: {processed}, Discrepancies: {discrepancies_found}"
+        message=f"Stock count completed. Processed: {result['processed']}, Discrepancies: {result['discrepancies']}"
     )
 
 
@@ -40,6 +40,16 @@ class Settings(BaseSettings):
     EMAIL_FROM: str = "ai@biocom.kr"  # 환경변수에서 오버라이드 가능
     EMAIL_FROM_NAME: str = "PLAYAUTO 시스템"  # 환경변수에서 오버라이드 가능
     EMAIL_USE_TLS: bool = True  # 환경변수에서 오버라이드 가능
+
+    # Product catalog cache
+    PRODUCT_CACHE_MAX_SIZE: int = 5000  # 워커당 캐시할 최대 제품 수
+    # 다른 워커의 변경 알림(LISTEN/NOTIFY) 수신 여부 - 제품 캐시뿐 아니라 체크포인트/BOM 캐시 무효화도 이 리스너를 사용
+    # 끄면 다른 워커의 변경이 이 워커 캐시에 반영되지 않음 (거래 등록 경로는 체크포인트 캐시를 쓰지 않음)
+    PRODUCT_CACHE_LISTEN: bool = True
+
+    # Import jobs
+    IMPORT_JOB_DIR: str = "storage/import_jobs"  # 가져오기 작업 파일 저장 경로
+    IMPORT_JOB_WORKERS: int = 2  # 워커당 동시에 실행할 가져오기 작업 수
     
     @property
     def cors_origins(self) -> List[str]:
@@ -20,6 +20,7 @@ from app.models.daily_ledger import DailyLedger
 from app.models.transaction import Transaction
 from app.models.product import Product
 from app.models.stock_checkpoint import StockCheckpoint, CheckpointType
+from app.services.checkpoint_head_service import CheckpointHeadService
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +90,15 @@ class BackgroundScheduler:
             misfire_grace_time=3600  # 1시간 내 실행 허용
         )
 
+        # 매출/폐기 집계 테이블 적재 (매일 자정 15분 - 한국 시간, 수불부 생성 이후)
+        self.scheduler.add_job(
+            self.run_sales_fact_refresh,
+            CronTrigger(hour=0, minute=15, timezone=KST),
+            id='sales_fact_refresh',
+            name='매출 집계 적재',
+            misfire_grace_time=3600
+        )
+
         # 발주서 처리 (비활성화 - 이메일 기능 미구현)
         # self.scheduler.add_job(
         #     self.run_purchase_order_check,
@@ -116,6 +126,15 @@ class BackgroundScheduler:
             misfire_grace_time=3600
         )
 
+        # 오래된 일일 마감 체크포인트 압축 (매주 일요일 새벽 4시 - 한국 시간)
+        self.scheduler.add_job(
+            self.run_checkpoint_compaction,
+            CronTrigger(day_of_week='sun', hour=4, minute=0, timezone=KST),
+            id='checkpoint_compaction',
+            name='체크포인트 압축',
+            misfire_grace_time=3600
+        )
+
         # 헬스 체크 (매시간 - 한국 시간)
         self.scheduler.add_job(
             self.health_check,
@@ -127,8 +146,10 @@ class BackgroundScheduler:
 
         logger.info("✅ 스케줄러 작업 설정 완료")
         logger.info("  - Daily Ledger: 매일 00:05")
+        logger.info("  - 매출 집계 적재: 매일 00:15")
         logger.info("  - DB 백업: 매일 02:00")
         logger.info("  - 안전 재고량 업데이트: 매일 03:00")
+        logger.info("  - 체크포인트 압축: 매주 일요일 04:00")
         logger.info("  - 헬스 체크: 매시간")
     
     def _get_beginning_stock(self, product_code: str, target_date: date, db: Session) -> int:
@@ -136,13 +157,7 @@ class BackgroundScheduler:
         beginning_stock 계산 (체크포인트를 고려한 정확한 계산)
         """
         # target_date 이전의 가장 최근 체크포인트 찾기
-        latest_checkpoint = db.query(StockCheckpoint).filter(
-            and_(
-                StockCheckpoint.product_code == product_code,
-                func.date(StockCheckpoint.checkpoint_date) < target_date,
-                StockCheckpoint.is_active == True
-            )
-        ).order_by(StockCheckpoint.checkpoint_date.desc()).first()
+        latest_checkpoint = CheckpointHeadService.get_latest_before(db, product_code, target_date)
 
         if latest_checkpoint:
             # 체크포인트가 있으면 체크포인트 ~ 전날까지의 거래를 집계
@@ -195,17 +210,9 @@ class BackgroundScheduler:
         """
         체크포인트를 생성해야 하는지 판단
         """
-        # target_date 당일 또는 이후의 체크포인트가 있는지 확인
-        future_checkpoint = db.query(StockCheckpoint).filter(
-            and_(
-                StockCheckpoint.product_code == product_code,
-                func.date(StockCheckpoint.checkpoint_date) >= target_date,
-                StockCheckpoint.is_active == True
-            )
-        ).first()
-
+        # target_date 당일 또는 이후의 체크포인트가 있는지 확인 (제품별 최신 체크포인트로 판단)
         # 미래 체크포인트가 없으면 생성 가능
-        return future_checkpoint is None
+        return not CheckpointHeadService.has_checkpoint_on_or_after(db, product_code, target_date)
 
     async def run_daily_ledger(self):
         """일일 수불부 생성 작업 (내부 로직)"""
@@ -227,6 +234,10 @@ class BackgroundScheduler:
 
                 ledgers_created = 0
                 checkpoints_created = 0
+                checkpoint_product_codes = []
+
+                # 제품별 최신 체크포인트를 한 번에 읽어 둠
+                CheckpointHeadService.get_heads(db, [p.product_code for p in products])
 
                 # 체크포인트 날짜/시간 (해당 날짜의 23:59:59)
                 checkpoint_datetime = datetime.combine(yesterday, datetime.max.time())
@@ -309,7 +320,9 @@ class BackgroundScheduler:
                             )
 
                             checkpoints_created += 1
+                            checkpoint_product_codes.append(product.product_code)
 
+                CheckpointHeadService.refresh(db, checkpoint_product_codes)
                 db.commit()
 
                 result_summary = {
@@ -338,6 +351,41 @@ class BackgroundScheduler:
             if log_id:
                 await self._log_job_complete(log_id, False, error_msg, start_time=start_time)
     
+    async def run_sales_fact_refresh(self):
+        """매출/폐기 집계 테이블 증분 적재 작업"""
+        start_time = time.time()
+        log_id = await self._log_job_start("매출 집계 적재", "sales_fact_refresh")
+
+        try:
+            # 어제 기준 최근 며칠을 다시 집계 (뒤늦게 입력된 거래 반영)
+            yesterday = date.today() - timedelta(days=1)
+            logger.info(f"🔄 매출 집계 적재 시작: {yesterday}")
+
+            db = self._get_db()
+            try:
+                from app.services.sales_fact_service import SalesFactService
+
+                result = SalesFactService.refresh_recent(db, yesterday)
+
+                logger.info(f"✅ 매출 집계 적재 완료 ({result['start_date']} ~ {result['end_date']})")
+                logger.info(f"  - 집계 행: {result['rows_written']}개")
+
+                if log_id:
+                    await self._log_job_complete(
+                        log_id, True,
+                        result_summary=result,
+                        start_time=start_time
+                    )
+
+            finally:
+                db.close()
+
+        except Exception as e:
+            error_msg = f"매출 집계 적재 오류: {e}"
+            logger.error(f"❌ {error_msg}")
+            if log_id:
+                await self._log_job_complete(log_id, False, error_msg, start_time=start_time)
+
     # 발주서 처리 작업 비활성화 (이메일 기능 미구현)
     # async def run_purchase_order_check(self):
     #     """발주서 상태 확인 및 처리 (비활성화)"""
@@ -451,6 +499,41 @@ class BackgroundScheduler:
             if log_id:
                 await self._log_job_complete(log_id, False, error_msg, start_time=start_time)
 
+    async def run_checkpoint_compaction(self):
+        """오래된 일일 마감 체크포인트 압축 작업"""
+        start_time = time.time()
+        log_id = await self._log_job_start("체크포인트 압축", "checkpoint_compaction")
+
+        try:
+            logger.info("🔄 체크포인트 압축 시작")
+
+            db = self._get_db()
+            try:
+                from app.services.checkpoint_compaction_service import CheckpointCompactionService
+
+                result = CheckpointCompactionService.compact(db)
+
+                logger.info(f"✅ 체크포인트 압축 완료 (기준일: {result['cutoff']})")
+                logger.info(f"  - 처리 월: {len(result['months'])}개")
+                logger.info(f"  - MONTHLY 전환: {result['promoted']}개")
+                logger.info(f"  - 보관 이동: {result['archived']}개")
+
+                if log_id:
+                    await self._log_job_complete(
+                        log_id, True,
+                        result_summary=result,
+                        start_time=start_time
+                    )
+
+            finally:
+                db.close()
+
+        except Exception as e:
+            error_msg = f"체크포인트 압축 오류: {e}"
+            logger.error(f"❌ {error_msg}")
+            if log_id:
+                await self._log_job_complete(log_id, False, error_msg, start_time=start_time)
+
     def start(self):
         """스케줄러 시작"""
         if not self.scheduler.running:
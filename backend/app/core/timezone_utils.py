@@ -2,12 +2,15 @@
 시간대 처리 유틸리티
 한국 시간대(KST)와 UTC 간 변환을 처리
 """
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Optional, Tuple
 
 # UTC 시간대
 UTC = timezone.utc
 
+# 한국 시간대 (DB 세션 시간대와 동일)
+KST = timezone(timedelta(hours=9))
+
 def get_current_utc_time() -> datetime:
     """현재 UTC 시간을 반환"""
     return datetime.now(UTC)
@@ -32,6 +35,15 @@ def ensure_timezone_aware(dt: Optional[datetime]) -> datetime:
     
     return dt
 
+def ensure_kst(dt: datetime) -> datetime:
+    """
+    DB에서 읽은 datetime을 KST 기준 timezone-aware로 변환
+    naive한 경우 DB 세션 시간대(Asia/Seoul) 값으로 간주
+    """
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=KST)
+    return dt.astimezone(KST)
+
 def parse_datetime_string(date_str: Optional[str]) -> datetime:
     """
     문자열을 datetime 객체로 변환
@@ -59,4 +71,14 @@ def parse_datetime_string(date_str: Optional[str]) -> datetime:
             dt = datetime.fromisoformat(date_str + 'T00:00:00')
             return dt.replace(tzinfo=UTC)
     except:
-        return get_current_utc_time()
\ No newline at end of file
+        return get_current_utc_time()
+
+def day_range_bounds(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """
+    날짜 구간을 [시작일 00:00, 종료일 다음날 00:00) 범위로 변환
+    func.date(컬럼) 비교 대신 인덱스를 탈 수 있는 범위 조건에 사용
+    (naive datetime이므로 DB 세션 시간대(Asia/Seoul) 기준으로 해석됨)
+    """
+    range_start = datetime.combine(start_date, time.min)
+    range_end = datetime.combine(end_date + timedelta(days=1), time.min)
+    return range_start, range_end
@@ -12,6 +12,8 @@ import logging
 from app.core.config import settings
 from app.core.database import init_database, create_tables, test_connection
 from app.core.scheduler import scheduler_instance
+from app.services.product_catalog_cache import product_cache_listener
+from app.services.import_job_service import ImportJobService
 from app.core.exceptions import register_exception_handlers
 from app.api.v1 import api_router
 
@@ -64,6 +66,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Scheduler startup failed: {e}")
         # 스케줄러 실패는 치명적이지 않으므로 계속 진행
+
+    # 캐시 무효화 리스너 시작 (제품/체크포인트/BOM 채널)
+    if settings.PRODUCT_CACHE_LISTEN:
+        product_cache_listener.start()
+
+    # 중단된 가져오기 작업 재개
+    try:
+        ImportJobService.resume_interrupted()
+    except Exception as e:
+        logger.error(f"Import job resume failed: {e}")
     
     yield
     
@@ -77,6 +89,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping scheduler: {e}")
 
+    product_cache_listener.stop()
+    ImportJobService.shutdown()
+
 
 # API 태그 정의
 tags_metadata = [
@@ -4,10 +4,12 @@ SQLAlchemy Models for PLAYAUTO
 from app.models.product import Product
 from app.models.transaction import Transaction
 from app.models.discrepancy import Discrepancy
-from app.models.purchase_order import PurchaseOrder, PurchaseOrderItem
+from app.models.purchase_order import PurchaseOrder, PurchaseOrderItem, PoNumberCounter
 from app.models.daily_ledger import DailyLedger
 from app.models.product_bom import ProductBOM
-from app.models.stock_checkpoint import StockCheckpoint, CheckpointType
+from app.models.stock_checkpoint import StockCheckpoint, CheckpointType, ProductCheckpointHead, StockCheckpointArchive
+from app.models.sales_daily_fact import SalesDailyFact
+from app.models.import_job import ImportJob, ImportJobError
 
 __all__ = [
     "Product",
@@ -15,8 +17,14 @@ __all__ = [
     "Discrepancy",
     "PurchaseOrder",
     "PurchaseOrderItem",
+    "PoNumberCounter",
     "DailyLedger",
     "ProductBOM",
     "StockCheckpoint",
-    "CheckpointType"
+    "CheckpointType",
+    "ProductCheckpointHead",
+    "StockCheckpointArchive",
+    "SalesDailyFact",
+    "ImportJob",
+    "ImportJobError"
 ]
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Import Job Model - 대용량 가져오기 작업
+업로드 파일을 디스크에 저장하고 백그라운드에서 청크 단위로 처리
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON, func
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+
+class ImportJob(Base):
+    """
+    가져오기 작업
+
+    청크를 반영할 때 같은 트랜잭션에서 last_row와 건수를 갱신하므로
+    중단된 작업은 last_row 다음 행부터 이어서 처리
+    """
+    __tablename__ = "import_jobs"
+    __table_args__ = {"schema": "playauto_platform"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_type = Column(String(30), nullable=False)
+    status = Column(String(20), nullable=False, default="pending", index=True)
+    file_name = Column(String(255))
+    file_path = Column(Text, nullable=False)
+    chunk_size = Column(Integer, nullable=False, default=1000)
+    created_by = Column(String(100))
+
+    # 진행 상황
+    total_rows = Column(Integer)
+    rows_done = Column(Integer, nullable=False, default=0)
+    rows_succeeded = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    last_row = Column(Integer, nullable=False, default=0)  # 반영이 끝난 마지막 행 번호
+    error_message = Column(Text)
+
+    # 이번 실행의 시작 시각/시작 행 수 (처리 속도 계산용)
+    run_started_at = Column(DateTime(timezone=True))
+    run_start_rows = Column(Integer, nullable=False, default=0)
+
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ImportJob(id={self.id}, type={self.job_type}, status={self.status})>"
+
+
+class ImportJobError(Base):
+    """가져오기 작업의 실패 행 (원본 값 포함, CSV로 내려받아 수정 후 다시 업로드)"""
+    __tablename__ = "import_job_errors"
+    __table_args__ = {"schema": "playauto_platform"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("playauto_platform.import_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    row_number = Column(Integer, nullable=False)
+    error = Column(Text, nullable=False)
+    row_data = Column(JSON)
+
+    def __repr__(self):
+        return f"<ImportJobError(job_id={self.job_id}, row={self.row_number})>"
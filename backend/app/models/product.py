@@ -39,6 +39,7 @@ class Product(Base):
     sale_price = Column(Numeric(12, 2), default=0)  # 판매가
     current_stock = Column(Integer, default=0)
     safety_stock = Column(Integer, default=0)
+    on_order_qty = Column(Integer, default=0, nullable=False)  # 미입고 발주 수량 (발주서 변경 시 갱신)
     is_auto_calculated = Column(Boolean, default=False)
     
     # 발주 정보
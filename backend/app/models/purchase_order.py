@@ -1,10 +1,12 @@
 """
 Purchase Order Models
 """
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, Date, Numeric
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, Date, Numeric, DateTime
+from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
+from app.core.database import Base
 from app.models.base import BaseModel
 
 
@@ -58,4 +60,20 @@ class PurchaseOrderItem(BaseModel):
     product = relationship("Product", foreign_keys=[product_code], back_populates="purchase_order_items")
     
     def __repr__(self):
-        return f"<POItem PO:{self.po_id} Product:{self.product_code} Qty:{self.ordered_quantity}>"
\ No newline at end of file
+        return f"<POItem PO:{self.po_id} Product:{self.product_code} Qty:{self.ordered_quantity}>"
+
+
+class PoNumberCounter(Base):
+    """발주서 번호 월별 채번 테이블"""
+    __tablename__ = "po_number_counters"
+
+    # 채번 기간 (YYYYMM)
+    period = Column(String(6), primary_key=True)
+
+    # 마지막으로 발급한 순번
+    last_value = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<PoNumberCounter {self.period}: {self.last_value}>"
@@ -0,0 +1,37 @@
+"""
+일별 판매/폐기 집계 (Fact) 모델
+매출·폐기 리포트를 원본 거래 테이블 대신 사전 집계 테이블에서 조회하기 위해 사용
+"""
+from sqlalchemy import Column, String, Integer, Date, Numeric, DateTime, Index
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class SalesDailyFact(Base):
+    """일별 제품·거래유형별 판매/폐기 집계 테이블"""
+    __tablename__ = "sales_daily_fact"
+    __table_args__ = (
+        Index('idx_sales_daily_fact_category_date', 'category', 'fact_date'),
+        Index('idx_sales_daily_fact_product_date', 'product_code', 'fact_date'),
+        {"schema": "playauto_platform"}
+    )
+
+    # 집계 키: 날짜(KST) + 제품 + 거래 유형(OUT, DISPOSAL)
+    fact_date = Column(Date, primary_key=True)
+    product_code = Column(String(50), primary_key=True)
+    transaction_type = Column(String(20), primary_key=True)
+
+    # 집계 시점의 카테고리 (카테고리별 리포트용)
+    category = Column(String(100))
+
+    # 집계 값
+    quantity = Column(Integer, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    revenue_krw = Column(Numeric(16, 2), nullable=False, default=0)  # 판매가 기준 금액 (원화 환산)
+    cost_krw = Column(Numeric(16, 2), nullable=False, default=0)  # 구매가 기준 금액 (원화 환산)
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<SalesDailyFact {self.fact_date} {self.product_code} {self.transaction_type}: {self.quantity}>"
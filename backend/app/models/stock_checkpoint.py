@@ -2,7 +2,7 @@
 Stock Checkpoint Model - 재고 체크포인트 관리
 재고 조정, 일일 마감 등의 시점에서 재고를 확정하여 무결성 유지
 """
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, ForeignKey, Enum, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -92,4 +92,68 @@ class StockCheckpoint(Base):
             "created_by": self.created_by,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "is_active": self.is_active
-        }
\ No newline at end of file
+        }
+
+
+class ProductCheckpointHead(Base):
+    """
+    제품별 최신 활성 체크포인트 (제품당 1행)
+
+    체크포인트 생성/수정/비활성화 시 CheckpointHeadService.refresh로 갱신
+    "이 시점 이후 체크포인트가 있는가" 검사를 기본키 조회로 처리하기 위한 테이블
+    """
+    __tablename__ = "product_checkpoint_head"
+    __table_args__ = {"schema": "playauto_platform"}
+
+    product_code = Column(
+        String(50),
+        ForeignKey("playauto_platform.products.product_code", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False
+    )
+    checkpoint_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("playauto_platform.stock_checkpoints.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    checkpoint_date = Column(DateTime(timezone=True), nullable=False)
+    confirmed_stock = Column(Integer, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self):
+        return f"<ProductCheckpointHead(product_code={self.product_code}, date={self.checkpoint_date})>"
+
+
+class StockCheckpointArchive(Base):
+    """
+    압축된 체크포인트 보관 모델
+
+    보관 기간이 지난 DAILY_CLOSE 체크포인트를 CheckpointCompactionService.compact가 옮겨 둠
+    folded_into_id는 해당 월을 대표하는 MONTHLY 체크포인트 (관련 거래도 이쪽으로 재연결됨)
+    """
+    __tablename__ = "stock_checkpoints_archive"
+    __table_args__ = {"schema": "playauto_platform"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, nullable=False)
+    product_code = Column(String(50), nullable=False, index=True)
+    checkpoint_date = Column(DateTime(timezone=True), nullable=False)
+    checkpoint_type = Column(String(20), nullable=False)
+    confirmed_stock = Column(Integer, nullable=False)
+    reason = Column(Text)
+    created_by = Column(String(100))
+    created_at = Column(DateTime(timezone=True))
+    is_active = Column(Boolean, nullable=False)
+    folded_into_id = Column(UUID(as_uuid=True))
+    archived_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self):
+        return f"<StockCheckpointArchive(product_code={self.product_code}, date={self.checkpoint_date})>"
@@ -40,6 +40,7 @@ class Transaction(BaseModel):
 
     # 메타데이터
     created_by = Column(String(100))
+    external_id = Column(String(200))  # 채널 주문/라인 id (고유, 중복 등록 방지)
     transaction_date = Column(DateTime(timezone=True), default=func.now(), index=True)
 
     # 관계
@@ -0,0 +1,102 @@
+"""
+Batch Processing Schemas
+일괄 거래/제품 등록 및 가져오기 작업
+"""
+from typing import List, Optional
+from datetime import date, datetime
+from uuid import UUID
+from enum import Enum
+from pydantic import BaseModel, Field
+
+
+class BatchTransaction(BaseModel):
+    product_code: str
+    product_name: str = None
+    transaction_type: str  # IN, OUT, ADJUST
+    quantity: int
+    date: str
+    reason: str = None
+    memo: str = None
+
+
+class BatchRequest(BaseModel):
+    transactions: List[BatchTransaction]
+
+
+class BatchProduct(BaseModel):
+    productCode: str
+    productName: str
+    barcode: str = None
+    category: str = None
+    manufacturer: str = None
+    unit: str = None
+    initialStock: int = 0
+    safetyStock: int = 0
+    purchasePrice: float = 0
+    purchaseCurrency: str = "KRW"
+    salePrice: float = 0
+    saleCurrency: str = "KRW"
+    zoneId: str = None
+    warehouse: str = None  # 창고 이름
+    supplier: str = None
+    supplierEmail: str = None
+    contactEmail: str = None
+    leadTime: int = None
+    moq: int = None
+    memo: str = None
+
+
+class BatchProductRequest(BaseModel):
+    products: List[BatchProduct]
+
+
+class BatchResult(BaseModel):
+    success: int
+    failed: int
+    errors: List[dict]
+
+
+class BulkImportResult(BaseModel):
+    """대용량 거래 적재 결과"""
+    staged: int = Field(..., description="스테이징 테이블에 적재한 행 수")
+    inserted: int = Field(..., description="transactions에 병합한 행 수")
+    historical: int = Field(..., description="과거 이력으로 기록한 행 수 (재고 영향 없음)")
+    failed: int = Field(..., description="형식 오류/미등록 제품으로 제외한 행 수")
+    products_updated: int
+    errors: List[dict]
+    first_date: Optional[date] = None
+    last_date: Optional[date] = None
+    ledger_dates: List[date] = Field(default_factory=list, description="재생성한 수불부 날짜")
+
+
+class ImportJobType(str, Enum):
+    """가져오기 작업 종류"""
+    TRANSACTIONS = "transactions"  # 거래 (CSV 또는 /batch/process 형식)
+    PRODUCTS = "products"          # 제품 (/batch/products 형식)
+
+
+class ImportJobStatus(str, Enum):
+    """가져오기 작업 상태"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJobResponse(BaseModel):
+    """가져오기 작업 진행 상황"""
+    id: UUID
+    job_type: ImportJobType
+    status: ImportJobStatus
+    file_name: Optional[str] = None
+    total_rows: Optional[int] = Field(None, description="전체 행 수 (작업 시작 후 계산)")
+    rows_done: int = Field(..., description="처리한 행 수 (실패 포함)")
+    rows_succeeded: int
+    rows_failed: int
+    progress_percent: Optional[float] = None
+    rows_per_second: Optional[float] = Field(None, description="이번 실행의 처리 속도")
+    eta_seconds: Optional[int] = Field(None, description="예상 남은 시간 (초)")
+    error_message: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
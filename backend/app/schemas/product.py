@@ -96,6 +96,7 @@ class ProductResponse(ProductBase):
     sale_price: Decimal = Field(default=0, description="판매가")
     current_stock: int = Field(default=0, description="현재 재고")
     safety_stock: int = Field(default=0, description="안전 재고")
+    on_order_qty: int = Field(default=0, description="미입고 발주 수량")
     is_auto_calculated: bool = Field(default=False, description="자동 계산 여부")
     is_active: bool = Field(default=True, description="활성 상태")
     created_at: datetime
@@ -117,6 +118,10 @@ class ProductResponse(ProductBase):
     # BOM 정보 추가
     bom: List[Dict[str, Any]] = Field(default_factory=list, description="BOM 구성 정보")
 
+    # 세트 조립 가능 수량 (include_buildable 요청 시, 세트 상품만)
+    buildable_quantity: Optional[int] = Field(None, description="현재 구성품 재고로 조립 가능한 세트 수")
+    limiting_component: Optional[str] = Field(None, description="조립 가능 수량을 제한하는 구성품 코드")
+
     model_config = ConfigDict(from_attributes=True)
 
     @field_validator('contact_email', 'supplier_email', mode='before')
@@ -143,4 +148,15 @@ class PastQuantityResponse(BaseModel):
     target_date: date
     quantity: int
     current_stock: int
-    transactions: List[Dict[str, Any]]
\ No newline at end of file
+    transactions: List[Dict[str, Any]]
+    anchor_type: Optional[str] = Field(None, description="기준점 유형 (DAILY_LEDGER, CHECKPOINT, CURRENT_STOCK)")
+    anchor_date: Optional[datetime] = Field(None, description="기준점 시각")
+
+class BarcodeLookupResponse(BaseModel):
+    """바코드 조회 응답"""
+    barcode: str
+    product_code: str
+    product_name: str
+    category: Optional[str] = None
+    unit: Optional[str] = None
+    is_active: bool = True
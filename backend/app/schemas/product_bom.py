@@ -1,7 +1,7 @@
 """
 Product BOM 스키마 정의
 """
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, Field, validator
@@ -72,6 +72,36 @@ class SetProductStockResponse(BaseModel):
     components: List[ComponentStock] = Field(..., description="구성품 재고 정보")
 
 
+class BuildableSet(BaseModel):
+    """세트 상품 조립 가능 수량"""
+    product_code: str
+    product_name: str
+    buildable_quantity: int = Field(..., description="조립 가능한 세트 수")
+    limiting_component: str = Field(..., description="조립 가능 수량을 제한하는 구성품 코드")
+    limiting_component_name: str = Field(..., description="제한 구성품명")
+    limiting_stock: int = Field(..., description="제한 구성품 현재 재고")
+    limiting_required: int = Field(..., description="세트당 제한 구성품 필요 수량")
+
+
+class BuildableSetReport(BaseModel):
+    """세트 상품 조립 가능 수량 보고서"""
+    items: List[BuildableSet]
+    total: int
+
+
+class AssemblyBatchItem(BaseModel):
+    """세트 조립/해체 작업"""
+    product_code: str = Field(..., description="세트 상품 코드")
+    quantity: int = Field(..., gt=0, description="조립/해체 수량")
+    operation: Literal["assemble", "disassemble"] = Field("assemble", description="작업 종류")
+
+
+class AssemblyBatchRequest(BaseModel):
+    """세트 조립/해체 일괄 요청"""
+    items: List[AssemblyBatchItem] = Field(..., min_length=1, max_length=1000, description="작업 목록")
+    created_by: Optional[str] = Field(None, description="처리자")
+
+
 class BOMTreeNode(BaseModel):
     """BOM 트리 구조 노드"""
     product_code: str
@@ -2,7 +2,7 @@
 Stock Checkpoint Schemas
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
@@ -51,4 +51,34 @@ class StockCheckpointValidation(BaseModel):
     is_valid: bool
     message: Optional[str] = None
     affects_current_stock: bool = True
-    checkpoint_id: Optional[UUID] = None
\ No newline at end of file
+    checkpoint_id: Optional[UUID] = None
+
+
+class TransactionValidationItem(BaseModel):
+    """일괄 검증 대상 거래"""
+    product_code: str = Field(..., description="제품 코드")
+    transaction_date: datetime = Field(..., description="거래 날짜")
+
+
+class BulkTransactionValidationRequest(BaseModel):
+    """거래 일괄 체크포인트 검증 요청"""
+    items: List[TransactionValidationItem] = Field(..., min_length=1, max_length=10000, description="검증할 거래 목록")
+
+
+class TransactionValidationResult(BaseModel):
+    """거래별 체크포인트 검증 결과"""
+    index: int = Field(..., description="요청 목록에서의 순번 (0부터)")
+    product_code: str
+    transaction_date: datetime
+    product_exists: bool = True
+    affects_current_stock: bool = True
+    checkpoint_id: Optional[UUID] = Field(None, description="거래가 속하는 체크포인트 (현재 재고 미반영 시)")
+    checkpoint_date: Optional[datetime] = None
+
+
+class BulkTransactionValidationResponse(BaseModel):
+    """거래 일괄 체크포인트 검증 결과"""
+    total: int
+    past_count: int = Field(..., description="체크포인트 이전이라 현재 재고에 반영되지 않는 거래 수")
+    unknown_product_count: int = Field(..., description="존재하지 않는 제품의 거래 수")
+    items: List[TransactionValidationResult]
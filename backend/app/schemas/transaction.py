@@ -2,7 +2,7 @@
 Transaction Pydantic schemas
 """
 from typing import Optional, List, Literal
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from uuid import UUID
 from datetime import datetime
 
@@ -36,6 +36,7 @@ class TransactionResponse(TransactionBase):
     # Checkpoint related fields
     affects_current_stock: bool = True
     checkpoint_id: Optional[UUID] = None
+    external_id: Optional[str] = None
 
     # Related product info
     product_name: Optional[str] = None
@@ -70,6 +71,67 @@ class StockCountRequest(BaseModel):
     created_by: Optional[str] = Field(None, max_length=100)
 
 
+class ScanLine(BaseModel):
+    """바코드 스캔 한 건"""
+    barcode: Optional[str] = Field(None, max_length=100, description="바코드")
+    product_code: Optional[str] = Field(None, max_length=50, description="제품 코드 (바코드 대신 사용 가능)")
+    quantity: int = Field(1, gt=0, description="수량")
+
+    @model_validator(mode='after')
+    def require_one_identifier(self):
+        """바코드와 제품 코드 중 정확히 하나만 허용"""
+        if bool(self.barcode) == bool(self.product_code):
+            raise ValueError("barcode와 product_code 중 하나만 입력해야 합니다")
+        return self
+
+
+class ScanSessionRequest(BaseModel):
+    """스캔 세션 요청 - 여러 스캔을 제품별로 합산하여 한 번에 반영"""
+    transaction_type: Literal['IN', 'OUT'] = Field(..., description="거래 유형")
+    scans: List[ScanLine] = Field(..., min_length=1, max_length=5000)
+    reason: Optional[str] = Field(None, max_length=100, description="사유")
+    memo: Optional[str] = Field(None, description="메모")
+    location: Optional[str] = Field(None, max_length=100, description="위치")
+    created_by: Optional[str] = Field(None, max_length=100, description="생성자")
+
+
+class ScanSessionResult(BaseModel):
+    """스캔 세션 제품별 반영 결과"""
+    product_code: str
+    product_name: str
+    scan_count: int
+    quantity: int
+    previous_stock: int
+    new_stock: int
+
+
+class ScanSessionResponse(BaseModel):
+    """스캔 세션 응답"""
+    success: bool = True
+    transaction_type: str
+    total_scans: int
+    results: List[ScanSessionResult]
+
+
+class StreamTransactionLine(BaseModel):
+    """NDJSON 스트림 등록의 거래 한 줄"""
+    external_id: Optional[str] = Field(None, max_length=200, description="채널 주문/라인 id (같은 id는 한 번만 반영)")
+    transaction_type: Literal['IN', 'OUT', 'ADJUST'] = Field(..., description="거래 유형")
+    product_code: str = Field(..., max_length=50, description="제품 코드")
+    quantity: int = Field(..., description="수량 (ADJUST는 조정량)")
+    date: Optional[str] = Field(None, description="거래 날짜 (ISO 8601, 없으면 현재 시각)")
+    reason: Optional[str] = Field(None, max_length=100, description="사유")
+    memo: Optional[str] = Field(None, description="메모")
+
+
+class StreamLineResult(BaseModel):
+    """NDJSON 스트림 등록의 줄별 결과"""
+    line: int = Field(..., description="요청 본문의 줄 번호 (1부터)")
+    external_id: Optional[str] = None
+    status: Literal['created', 'duplicate', 'failed']
+    error: Optional[str] = None
+
+
 class DailySummary(BaseModel):
     """일별 입출고 요약"""
     date: str
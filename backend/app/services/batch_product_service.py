@@ -0,0 +1,216 @@
+"""
+Batch Product Service Layer
+제품 일괄 등록 (엑셀 업로드 / 가져오기 작업)
+
+행마다 중복 확인 쿼리와 전체 창고 조회를 하던 방식 대신
+- 기존 제품 코드는 IN 쿼리 한 번, 창고 이름(공백 제거/소문자) 맵은 한 번만 만들어 사용
+- 신규 제품은 다중 행 INSERT 한 번, upsert 모드의 기존 제품은 기본키 기준 일괄 UPDATE 한 번
+"""
+import io
+import json
+import re
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.warehouse import Warehouse
+from app.schemas.batch import BatchProduct
+from app.services.product_catalog_cache import product_catalog_cache
+
+
+# 제품 필드 → products 컬럼 (upsert 시 요청에 포함된 필드만 갱신)
+PRODUCT_FIELD_COLUMNS = {
+    'productName': 'product_name',
+    'barcode': 'barcode',
+    'category': 'category',
+    'manufacturer': 'manufacturer',
+    'unit': 'unit',
+    'safetyStock': 'safety_stock',
+    'purchasePrice': 'purchase_price',
+    'purchaseCurrency': 'purchase_currency',
+    'salePrice': 'sale_price',
+    'saleCurrency': 'sale_currency',
+    'zoneId': 'zone_id',
+    'supplier': 'supplier',
+    'supplierEmail': 'supplier_email',
+    'contactEmail': 'contact_email',
+    'leadTime': 'lead_time_days',
+    'moq': 'moq',
+    'memo': 'memo',
+}
+
+
+def normalize_warehouse_name(name: str) -> str:
+    """창고 이름 비교용 키 (모든 공백 제거, 소문자)"""
+    return re.sub(r'\s+', '', name).lower()
+
+
+def iter_product_chunks(
+    stream: BinaryIO,
+    chunk_size: int,
+    start_after: int = 0
+) -> Iterator[Tuple[List[Tuple[int, BatchProduct]], List[dict]]]:
+    """
+    JSON Lines 파일(한 줄에 제품 하나)을 chunk_size 행 단위로 (유효한 제품, 행별 오류) 반환
+
+    행 번호는 1부터, start_after 이하 행은 건너뜀 (작업 재개용)
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+    valid: List[Tuple[int, BatchProduct]] = []
+    invalid: List[dict] = []
+    try:
+        for row_number, line in enumerate(text, start=1):
+            if row_number <= start_after or not line.strip():
+                continue
+            try:
+                valid.append((row_number, BatchProduct.model_validate_json(line)))
+            except ValidationError as e:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    data = None
+                invalid.append({
+                    "row": row_number,
+                    "error": "; ".join(
+                        f"{'.'.join(str(loc) for loc in err['loc']) or '행'}: {err['msg']}" for err in e.errors()
+                    ),
+                    "data": data if isinstance(data, dict) else None
+                })
+
+            if len(valid) + len(invalid) >= chunk_size:
+                yield valid, invalid
+                valid, invalid = [], []
+    finally:
+        # 스트림은 호출자가 닫으므로 래퍼만 분리
+        text.detach()
+
+    if valid or invalid:
+        yield valid, invalid
+
+
+class BatchProductService:
+    """Batch product business logic service"""
+
+    @staticmethod
+    def get_warehouse_map(db: Session) -> Dict[str, UUID]:
+        """정규화한 창고 이름 → 창고 id (한 번만 조회)"""
+        return {
+            normalize_warehouse_name(name): warehouse_id
+            for warehouse_id, name in db.query(Warehouse.id, Warehouse.name).all()
+        }
+
+    @staticmethod
+    def apply(
+        db: Session,
+        rows: Sequence[Tuple[int, BatchProduct]],
+        commit: bool = True,
+        upsert: bool = False
+    ) -> Tuple[int, int, List[dict]]:
+        """
+        (행 번호, 제품) 목록을 등록
+
+        commit=False이면 커밋하지 않음 (가져오기 작업이 진행 상황과 같은 트랜잭션으로 커밋)
+        upsert=True이면 이미 있는 SKU는 오류 대신 요청에 포함된 필드만 갱신
+        (재고는 거래로만 변경하므로 initialStock은 신규 제품에만 적용)
+
+        Returns:
+            (성공 건수, 실패 건수, 행별 오류 목록)
+        """
+        errors: List[dict] = []
+        if not rows:
+            return 0, 0, errors
+
+        # 1. 기존 SKU와 창고 이름 맵을 한 번에 조회
+        product_codes = {prod.productCode for _, prod in rows}
+        existing_codes = {
+            code for (code,) in db.query(Product.product_code).filter(
+                Product.product_code.in_(product_codes)
+            ).all()
+        }
+        warehouse_map = (
+            BatchProductService.get_warehouse_map(db)
+            if any(prod.warehouse for _, prod in rows) else {}
+        )
+
+        new_rows: List[dict] = []
+        update_rows: List[dict] = []
+        seen_codes = set(existing_codes)
+
+        for row_number, prod in rows:
+            # SKU 중복 확인 (파일 안의 중복 포함)
+            if prod.productCode in seen_codes and not upsert:
+                errors.append({
+                    "row": row_number,
+                    "error": f"SKU '{prod.productCode}'가 이미 존재합니다."
+                })
+                continue
+
+            # 창고 이름으로 warehouse_id 찾기 (공백/대소문자 무시)
+            warehouse_id: Optional[UUID] = None
+            if prod.warehouse:
+                warehouse_id = warehouse_map.get(normalize_warehouse_name(prod.warehouse))
+                if not warehouse_id:
+                    errors.append({
+                        "row": row_number,
+                        "error": f"창고 '{prod.warehouse}'를 찾을 수 없습니다."
+                    })
+                    continue
+
+            if prod.productCode in seen_codes:
+                # 기존 제품 갱신 (요청에 포함된 필드만)
+                values = {
+                    column: getattr(prod, field)
+                    for field, column in PRODUCT_FIELD_COLUMNS.items()
+                    if field in prod.model_fields_set
+                }
+                if 'warehouse' in prod.model_fields_set:
+                    values['warehouse_id'] = warehouse_id
+                values['product_code'] = prod.productCode
+                update_rows.append(values)
+                continue
+
+            # 새 제품
+            new_rows.append({
+                "product_code": prod.productCode,
+                "product_name": prod.productName,
+                "barcode": prod.barcode,
+                "category": prod.category,
+                "manufacturer": prod.manufacturer,
+                "unit": prod.unit or "개",
+                "safety_stock": prod.safetyStock,
+                "purchase_price": prod.purchasePrice,
+                "purchase_currency": prod.purchaseCurrency,
+                "sale_price": prod.salePrice,
+                "sale_currency": prod.saleCurrency,
+                "zone_id": prod.zoneId,
+                "warehouse_id": warehouse_id,  # 매핑된 warehouse_id 사용
+                "supplier": prod.supplier,
+                "supplier_email": prod.supplierEmail,
+                "contact_email": prod.contactEmail,
+                "lead_time_days": prod.leadTime,
+                "moq": prod.moq,
+                "memo": prod.memo,
+                "current_stock": prod.initialStock,  # 초기 재고 설정
+                "is_active": True
+            })
+            seen_codes.add(prod.productCode)
+
+        # 2. 신규 제품 다중 행 INSERT, 기존 제품 기본키 기준 일괄 UPDATE
+        if new_rows:
+            db.execute(insert(Product), new_rows)
+        if update_rows:
+            db.execute(update(Product), update_rows)
+
+        changed_codes = [row["product_code"] for row in new_rows + update_rows]
+        if changed_codes:
+            # 새 바코드/변경된 정보가 캐시에 반영되도록 무효화
+            product_catalog_cache.notify_change(db, *changed_codes)
+            if commit:
+                db.commit()
+
+        return len(changed_codes), len(errors), errors
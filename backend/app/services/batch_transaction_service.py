@@ -0,0 +1,283 @@
+"""
+Batch Transaction Service Layer
+일괄 거래 등록 (엑셀/CSV 업로드)
+
+행마다 제품/체크포인트를 조회하던 방식 대신
+- 제품 코드를 모아 제품(잠금 포함)과 최신 체크포인트를 각각 한 번에 조회
+- 과거 이력 여부와 제품별 누적 재고를 메모리에서 계산
+- 거래는 다중 행 INSERT 한 번, 재고 변화량은 CASE UPDATE 한 번으로 반영
+CSV 업로드는 한 줄씩 읽어 청크 단위로 검증 (메모리 사용량이 파일 크기와 무관)
+"""
+import csv
+import io
+from collections import defaultdict
+from typing import BinaryIO, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import case, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.transaction import Transaction
+from app.services.checkpoint_head_service import CheckpointHeadService, classify_import_row
+from app.services.sales_fact_service import FACT_TRANSACTION_TYPES, SalesFactService
+from app.schemas.batch import BatchTransaction
+from app.core.timezone_utils import parse_datetime_string, ensure_kst
+
+# CSV 업로드 시 한 번에 검증/반영할 기본 행 수
+DEFAULT_CSV_CHUNK_SIZE = 1000
+
+# CSV로 등록 가능한 거래 유형
+CSV_TRANSACTION_TYPES = ("IN", "OUT", "ADJUST")
+
+# CSV 열 (템플릿 한글 헤더, 영문 헤더)
+CSV_COLUMNS = [
+    ('제품코드', 'product_code'),
+    ('제품명', 'product_name'),
+    ('구분', 'type'),
+    ('수량', 'quantity'),
+    ('날짜', 'date'),
+    ('사유', 'reason'),
+    ('메모', 'memo'),
+]
+
+
+def _csv_value(row: dict, korean: str, english: str) -> str:
+    """한글/영문 헤더 중 있는 값 (없으면 빈 문자열)"""
+    value = row.get(korean)
+    if value is None:
+        value = row.get(english)
+    return (value or '').strip()
+
+
+def csv_row_data(row: dict) -> Dict[str, str]:
+    """CSV 한 행을 템플릿 한글 헤더 기준 값으로 (실패 행 CSV 재업로드용)"""
+    return {korean: _csv_value(row, korean, english) for korean, english in CSV_COLUMNS}
+
+
+def transaction_row_data(trans: BatchTransaction) -> Dict[str, str]:
+    """거래를 템플릿 한글 헤더 기준 값으로"""
+    return {
+        '제품코드': trans.product_code,
+        '제품명': trans.product_name or '',
+        '구분': trans.transaction_type,
+        '수량': str(trans.quantity),
+        '날짜': trans.date,
+        '사유': trans.reason or '',
+        '메모': trans.memo or ''
+    }
+
+
+def parse_csv_row(row: dict) -> BatchTransaction:
+    """
+    CSV 한 행을 거래로 변환
+
+    Raises:
+        ValueError: 필수 값 누락 또는 형식 오류
+    """
+    product_code = _csv_value(row, '제품코드', 'product_code')
+    if not product_code:
+        raise ValueError("제품코드가 비어 있습니다")
+
+    transaction_type = _csv_value(row, '구분', 'type').upper()
+    if transaction_type not in CSV_TRANSACTION_TYPES:
+        raise ValueError(f"알 수 없는 트랜잭션 타입: {transaction_type or '(빈 값)'}")
+
+    quantity_text = _csv_value(row, '수량', 'quantity')
+    try:
+        quantity = int(quantity_text)
+    except ValueError:
+        raise ValueError(f"수량이 숫자가 아닙니다: {quantity_text or '(빈 값)'}")
+
+    date_text = _csv_value(row, '날짜', 'date')
+    if not date_text:
+        raise ValueError("날짜가 비어 있습니다")
+
+    return BatchTransaction(
+        product_code=product_code,
+        product_name=_csv_value(row, '제품명', 'product_name'),
+        transaction_type=transaction_type,
+        quantity=quantity,
+        date=date_text,
+        reason=_csv_value(row, '사유', 'reason'),
+        memo=_csv_value(row, '메모', 'memo')
+    )
+
+
+def iter_csv_chunks(
+    stream: BinaryIO,
+    chunk_size: int,
+    start_after: int = 0
+) -> Iterator[Tuple[List[Tuple[int, BatchTransaction]], List[dict]]]:
+    """
+    업로드 파일을 한 줄씩 읽어 chunk_size 행 단위로 (유효한 거래, 행별 오류) 반환
+
+    파일 전체를 메모리에 올리지 않으므로 메모리 사용량은 파일 크기와 무관
+    행 번호는 헤더를 제외한 데이터 행 기준 (1부터), start_after 이하 행은 건너뜀 (작업 재개용)
+    오류에는 원본 값(data)을 함께 담음
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')  # BOM 처리
+    reader = csv.DictReader(text)
+
+    valid: List[Tuple[int, BatchTransaction]] = []
+    invalid: List[dict] = []
+    row_number = 0
+    try:
+        for row_number, row in enumerate(reader, start=1):
+            if row_number <= start_after:
+                continue
+            try:
+                valid.append((row_number, parse_csv_row(row)))
+            except ValueError as e:
+                invalid.append({"row": row_number, "error": str(e), "data": csv_row_data(row)})
+
+            if len(valid) + len(invalid) >= chunk_size:
+                yield valid, invalid
+                valid, invalid = [], []
+    except UnicodeDecodeError:
+        invalid.append({"row": row_number + 1, "error": "UTF-8로 읽을 수 없는 행입니다 (이후 행은 처리하지 않음)"})
+    finally:
+        # 스트림은 호출자가 닫으므로 래퍼만 분리
+        text.detach()
+
+    if valid or invalid:
+        yield valid, invalid
+
+
+class BatchTransactionService:
+    """Batch transaction business logic service"""
+
+    @staticmethod
+    def apply(
+        db: Session,
+        rows: Sequence[Tuple[int, object]],
+        created_by: str = "batch_process",
+        commit: bool = True
+    ) -> Tuple[int, int, List[dict]]:
+        """
+        (행 번호, 거래) 목록을 반영하고 커밋
+
+        commit=False이면 커밋하지 않음 (가져오기 작업이 진행 상황과 같은 트랜잭션으로 커밋)
+
+        거래는 product_code, transaction_type, quantity, date, reason, memo 속성을 가진 객체 (external_id가 있으면 함께 저장)
+        과거 이력 처리:
+        - 비활성화 제품, 또는 체크포인트 이전(체크포인트 시각 포함) 거래는 이력만 기록
+        - affects_current_stock = False로 저장하고 재고는 변경하지 않음
+
+        Returns:
+            (성공 건수, 실패 건수, 행별 오류 목록)
+        """
+        errors: List[dict] = []
+        if not rows:
+            return 0, 0, errors
+
+        # 1. 제품 잠금 (코드 순서, 비활성화 제품 포함) 및 최신 체크포인트 조회
+        product_codes = sorted({trans.product_code for _, trans in rows})
+        products = db.query(Product).filter(
+            Product.product_code.in_(product_codes)
+        ).order_by(Product.product_code).with_for_update().all()
+        product_map = {p.product_code: p for p in products}
+        heads = CheckpointHeadService.read_heads(db, product_map.keys())
+
+        # 2. 행 순서대로 과거 이력 여부와 누적 재고 계산
+        running_stock = {code: (p.current_stock or 0) for code, p in product_map.items()}
+        stock_deltas: Dict[str, int] = defaultdict(int)
+        transaction_rows = []
+
+        for row_number, trans in rows:
+            try:
+                product = product_map.get(trans.product_code)
+                if not product:
+                    errors.append({
+                        "row": row_number,
+                        "error": f"제품 코드 {trans.product_code}를 찾을 수 없습니다"
+                    })
+                    continue
+
+                # 날짜 처리: ISO 형식 문자열을 datetime 객체로 변환
+                transaction_date = parse_datetime_string(trans.date)
+
+                # 과거 이력인지 판단 (비활성화 제품 또는 체크포인트 시각 이전 거래, 미리보기와 같은 규칙)
+                is_past, checkpoint_id = classify_import_row(
+                    heads.get(product.product_code), transaction_date, product.is_active
+                )
+
+                previous_stock = running_stock[product.product_code]
+
+                if trans.transaction_type == "IN":
+                    delta = trans.quantity
+                elif trans.transaction_type == "OUT":
+                    # 과거 이력이 아닐 때만 재고 부족 검증
+                    if not is_past and trans.quantity > previous_stock:
+                        errors.append({
+                            "row": row_number,
+                            "error": f"재고 부족: 현재 {previous_stock}, 요청 {trans.quantity}"
+                        })
+                        continue
+                    delta = -trans.quantity
+                elif trans.transaction_type == "ADJUST":
+                    # ADJUST는 조정량을 의미 (양수: 증가, 음수: 감소)
+                    delta = trans.quantity
+                else:
+                    errors.append({
+                        "row": row_number,
+                        "error": f"알 수 없는 트랜잭션 타입: {trans.transaction_type}"
+                    })
+                    continue
+
+                new_stock = previous_stock + delta
+                transaction_rows.append({
+                    "product_code": product.product_code,
+                    "transaction_type": trans.transaction_type,
+                    "quantity": trans.quantity,
+                    "previous_stock": previous_stock,
+                    "new_stock": new_stock,
+                    "reason": trans.reason,
+                    "memo": trans.memo,
+                    "location": product.zone_id,
+                    "created_by": created_by,
+                    "transaction_date": transaction_date,
+                    "affects_current_stock": not is_past,  # 과거 이력은 재고에 영향 없음
+                    "checkpoint_id": checkpoint_id,
+                    "external_id": getattr(trans, "external_id", None)
+                })
+
+                # 과거 이력이 아닐 때만 누적 재고 반영
+                if not is_past:
+                    running_stock[product.product_code] = new_stock
+                    stock_deltas[product.product_code] += delta
+
+            except Exception as e:
+                errors.append({
+                    "row": row_number,
+                    "error": str(e)
+                })
+
+        if not transaction_rows:
+            if commit:
+                # 잠금 해제
+                db.rollback()
+            return 0, len(errors), errors
+
+        # 3. 거래 일괄 INSERT 및 재고 변화량 일괄 UPDATE
+        db.execute(insert(Transaction), transaction_rows)
+
+        changed = {code: delta for code, delta in stock_deltas.items() if delta}
+        if changed:
+            db.execute(
+                update(Product).where(
+                    Product.product_code.in_(list(changed.keys()))
+                ).values(
+                    current_stock=Product.current_stock + case(changed, value=Product.product_code, else_=0)
+                ).execution_options(synchronize_session=False)
+            )
+
+        # 4. 야간 적재 범위보다 오래된 판매/폐기 거래는 같은 트랜잭션에서 집계 테이블 재적재
+        SalesFactService.refresh_backdated(db, {
+            ensure_kst(row["transaction_date"]).date()
+            for row in transaction_rows if row["transaction_type"] in FACT_TRANSACTION_TYPES
+        })
+
+        if commit:
+            db.commit()
+
+        return len(transaction_rows), len(errors), errors
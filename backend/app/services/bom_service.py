@@ -0,0 +1,444 @@
+"""
+BOM Service Layer
+다단계 세트상품 BOM 전개 및 평탄화된 구성품 맵 캐시
+
+- 재귀 CTE로 세트 → 최하위 구성품(leaf)까지 전개하고 경로별 수량을 곱해 합산
+- 전개 결과(세트별 {구성품: 세트 1개당 수량})를 프로세스 내에 캐시하고,
+  BOM 추가/삭제 시 전체 무효화 (하위 세트 변경이 모든 상위 세트에 영향을 주므로)
+- 다른 워커에는 PostgreSQL NOTIFY로 무효화 전파 (제품 캐시 리스너에 채널 등록)
+- BOM 추가 시 순환 참조(하위 제품이 이미 상위 제품을 포함)를 검사
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import BigInteger, and_, case, cast, exists, func, insert, literal, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.product_bom import ProductBOM
+from app.models.transaction import Transaction
+from app.services.product_catalog_cache import (
+    NOTIFY_ALL,
+    invalidate_after_commit,
+    product_cache_listener
+)
+from app.services.transaction_service import TransactionService
+from app.core.timezone_utils import get_current_utc_time
+
+# 워커 간 BOM 변경 알림 채널
+BOM_NOTIFY_CHANNEL = "product_bom"
+
+# 최대 전개 단계 (순환 참조는 등록 시 차단하며, 이 값은 안전장치)
+MAX_BOM_DEPTH = 10
+
+# 세트 1개당 구성품 수량 맵 {구성품 코드: 수량}
+FlatBOM = Dict[str, int]
+
+
+def build_explosion_query(root_codes: Optional[List[str]] = None):
+    """
+    세트별 최하위 구성품 전개 쿼리
+
+    root_codes를 생략하면 BOM이 있는 모든 세트를 전개
+    반환 컬럼: root(세트 코드), component(최하위 구성품 코드), quantity(세트 1개당 수량)
+    """
+    bom = ProductBOM.__table__
+    child = bom.alias("child_bom")
+    sub = bom.alias("sub_bom")
+
+    anchor = select(
+        bom.c.parent_product_code.label("root"),
+        bom.c.child_product_code.label("component"),
+        cast(bom.c.quantity, BigInteger).label("quantity"),
+        literal(1).label("depth")
+    )
+    if root_codes is not None:
+        anchor = anchor.where(bom.c.parent_product_code.in_(root_codes))
+    explosion = anchor.cte("bom_explosion", recursive=True)
+
+    explosion = explosion.union_all(
+        select(
+            explosion.c.root,
+            child.c.child_product_code,
+            explosion.c.quantity * child.c.quantity,
+            explosion.c.depth + 1
+        ).where(
+            and_(
+                child.c.parent_product_code == explosion.c.component,
+                explosion.c.depth < MAX_BOM_DEPTH
+            )
+        )
+    )
+
+    # 하위 BOM이 없는 구성품만 (하위 세트는 구성품으로 전개되므로 제외)
+    has_children = exists().where(sub.c.parent_product_code == explosion.c.component)
+
+    return select(
+        explosion.c.root,
+        explosion.c.component,
+        func.sum(explosion.c.quantity).label("quantity")
+    ).where(~has_children).group_by(explosion.c.root, explosion.c.component)
+
+
+def build_buildable_query(root_codes: Optional[List[str]] = None):
+    """
+    세트별 조립 가능 수량 및 제약 구성품 쿼리
+
+    평탄화 BOM을 제품 재고와 조인하여 구성품별 floor(재고 / 필요 수량)을 구하고,
+    세트별로 가장 작은 값의 구성품 한 행만 남김 (DISTINCT ON)
+    반환 컬럼: product_code, buildable_quantity, limiting_component, limiting_stock, limiting_required
+    """
+    flat = build_explosion_query(root_codes).subquery("flat_bom")
+    possible = func.floor(
+        func.greatest(func.coalesce(Product.current_stock, 0), 0) / flat.c.quantity
+    )
+
+    return select(
+        flat.c.root.label("product_code"),
+        cast(possible, BigInteger).label("buildable_quantity"),
+        flat.c.component.label("limiting_component"),
+        func.coalesce(Product.current_stock, 0).label("limiting_stock"),
+        flat.c.quantity.label("limiting_required")
+    ).select_from(flat).join(
+        Product, Product.product_code == flat.c.component
+    ).distinct(flat.c.root).order_by(flat.c.root, possible, flat.c.component)
+
+
+def build_descendants_query(product_code: str):
+    """제품 아래의 모든 하위 제품 코드 조회 쿼리 (순환 참조 검사용)"""
+    bom = ProductBOM.__table__
+    child = bom.alias("child_bom")
+
+    descendants = select(
+        bom.c.child_product_code.label("product_code"),
+        literal(1).label("depth")
+    ).where(
+        bom.c.parent_product_code == product_code
+    ).cte("bom_descendants", recursive=True)
+
+    descendants = descendants.union_all(
+        select(
+            child.c.child_product_code,
+            descendants.c.depth + 1
+        ).where(
+            and_(
+                child.c.parent_product_code == descendants.c.product_code,
+                descendants.c.depth < MAX_BOM_DEPTH
+            )
+        )
+    )
+
+    return select(descendants.c.product_code).distinct()
+
+
+class FlatBOMCache:
+    """세트별 평탄화 BOM 캐시 (BOM이 없는 제품도 빈 맵으로 캐시)"""
+
+    def __init__(self):
+        self._items: Dict[str, FlatBOM] = {}
+        self._lock = threading.Lock()
+        # 무효화될 때마다 증가 - DB 조회 중 무효화된 값을 다시 채우지 않기 위함
+        self._generation = 0
+
+    def get(self, db: Session, product_code: str) -> FlatBOM:
+        """세트 하나의 평탄화 BOM"""
+        return self.get_many(db, [product_code]).get(product_code, {})
+
+    def get_many(self, db: Session, product_codes: Iterable[str]) -> Dict[str, FlatBOM]:
+        """
+        여러 세트의 평탄화 BOM을 한 번에 조회
+
+        캐시에 없는 세트만 모아 전개 쿼리 한 번으로 읽음
+        """
+        codes = {code for code in product_codes if code}
+        with self._lock:
+            found = {code: self._items[code] for code in codes if code in self._items}
+            generation = self._generation
+        missing = sorted(codes - found.keys())
+
+        if missing:
+            loaded: Dict[str, FlatBOM] = {code: {} for code in missing}
+            for row in db.execute(build_explosion_query(missing)):
+                loaded[row.root][row.component] = int(row.quantity)
+            found.update(loaded)
+
+            with self._lock:
+                if generation == self._generation:
+                    self._items.update(loaded)
+
+        return found
+
+    def invalidate(self, *product_codes: str):
+        """
+        캐시 무효화
+
+        하위 세트의 BOM 변경은 모든 상위 세트의 전개 결과에 영향을 주므로 항상 전체를 비움
+        """
+        self.clear()
+
+    def clear(self):
+        """캐시 전체 제거"""
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+
+    def notify_change(self, db: Session):
+        """
+        BOM 변경 알림 발행 및 로컬 무효화 예약
+
+        변경 내용과 같은 트랜잭션 안(commit 전)에서 호출해야 함
+        로컬 캐시는 커밋 직후에 비움 (pg_notify도 커밋 시점에 전달됨)
+        """
+        invalidate_after_commit(db, self, None)
+
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": BOM_NOTIFY_CHANNEL, "payload": NOTIFY_ALL}
+        )
+
+
+# 전역 캐시 인스턴스 (다른 워커의 BOM 변경 알림도 수신)
+flat_bom_cache = FlatBOMCache()
+product_cache_listener.add_channel(BOM_NOTIFY_CHANNEL, flat_bom_cache)
+
+
+class BOMService:
+    """BOM business logic service"""
+
+    @staticmethod
+    def check_cycle(db: Session, parent_product_code: str, child_product_code: str):
+        """
+        순환 참조 검사
+
+        자식 제품 아래에 이미 부모 제품이 있으면 parent → child 추가 시 순환이 생김
+        """
+        if parent_product_code == child_product_code:
+            raise HTTPException(status_code=400, detail="Parent and child cannot be the same")
+
+        descendants = db.execute(
+            build_descendants_query(child_product_code)
+        ).scalars().all()
+
+        if parent_product_code in descendants:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Circular BOM reference: {child_product_code} already contains {parent_product_code}"
+            )
+
+    @staticmethod
+    def get_flat_bom(db: Session, product_code: str) -> FlatBOM:
+        """세트 1개당 최하위 구성품 수량"""
+        return flat_bom_cache.get(db, product_code)
+
+    @staticmethod
+    def get_buildable_map(db: Session, product_codes: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """
+        세트별 조립 가능 수량 (한 번의 쿼리)
+
+        product_codes를 생략하면 모든 세트, BOM이 없는 제품은 결과에 포함되지 않음
+        반환값: {세트 코드: {"buildable_quantity", "limiting_component", "limiting_stock", "limiting_required"}}
+        """
+        root_codes = None
+        if product_codes is not None:
+            root_codes = sorted({code for code in product_codes if code})
+            if not root_codes:
+                return {}
+
+        rows = db.execute(build_buildable_query(root_codes)).all()
+        return {
+            row.product_code: {
+                "buildable_quantity": int(row.buildable_quantity),
+                "limiting_component": row.limiting_component,
+                "limiting_stock": int(row.limiting_stock),
+                "limiting_required": int(row.limiting_required)
+            }
+            for row in rows
+        }
+
+    @staticmethod
+    def get_availability(db: Session, product_code: str) -> dict:
+        """
+        세트 조립 가능 수량
+
+        평탄화 BOM의 구성품 재고를 한 번의 쿼리로 조회하여 min(재고 // 필요 수량) 계산
+        """
+        flat_bom = BOMService.get_flat_bom(db, product_code)
+        if not flat_bom:
+            raise HTTPException(status_code=400, detail="No BOM data found for this set")
+
+        products = {
+            p.product_code: p for p in db.query(Product).filter(
+                Product.product_code.in_(list(flat_bom.keys()))
+            ).all()
+        }
+
+        missing = [code for code in flat_bom if code not in products]
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Child product {', '.join(sorted(missing))} not found"
+            )
+
+        components = []
+        for code in sorted(flat_bom.keys()):
+            product = products[code]
+            required = flat_bom[code]
+            stock = product.current_stock or 0
+            components.append({
+                "product_code": code,
+                "product_name": product.product_name,
+                "required_quantity": required,
+                "current_stock": stock,
+                "possible_sets": max(stock, 0) // required
+            })
+
+        return {
+            "parent_product_code": product_code,
+            "possible_sets": min(c["possible_sets"] for c in components),
+            "components": components
+        }
+
+    @staticmethod
+    def process_assembly_batch(
+        db: Session,
+        operations: List[dict],
+        created_by: str = "system"
+    ) -> dict:
+        """
+        여러 세트의 조립/해체를 한 번의 커밋으로 처리
+
+        1. 평탄화 BOM을 한 번에 조회하여 작업별 세트/구성품 이동 수량 계산
+        2. 관련 제품 전체를 제품 코드 순서로 한 번에 잠금 (동시 요청 간 교착 방지)
+        3. 제품별 출고 합계가 현재 재고 이하인지 일괄 검증 (하나라도 부족하면 전체 롤백)
+        4. 모든 IN/OUT 거래를 한 번의 bulk INSERT, 재고는 UPDATE 한 문장으로 반영
+
+        operations: [{"product_code": str, "quantity": int, "operation": "assemble" | "disassemble"}, ...]
+        """
+        if not operations:
+            raise HTTPException(status_code=400, detail="No assembly operations")
+
+        # 1. 평탄화 BOM 조회
+        set_codes = {op["product_code"] for op in operations}
+        flat_boms = flat_bom_cache.get_many(db, set_codes)
+        no_bom = sorted(code for code in set_codes if not flat_boms.get(code))
+        if no_bom:
+            raise HTTPException(status_code=400, detail=f"No BOM data found for set: {', '.join(no_bom)}")
+
+        # 작업별 이동 목록 [(작업 순번, 제품 코드, IN/OUT, 수량, 사유 종류)]
+        moves = []
+        outbound: Dict[str, int] = defaultdict(int)
+        for index, op in enumerate(operations):
+            set_code = op["product_code"]
+            quantity = int(op["quantity"])
+            if quantity <= 0:
+                raise HTTPException(status_code=400, detail="Quantity must be greater than 0")
+            is_assemble = op.get("operation", "assemble") == "assemble"
+
+            moves.append((index, set_code, "IN" if is_assemble else "OUT", quantity, "set"))
+            for component, required in sorted(flat_boms[set_code].items()):
+                moves.append((index, component, "OUT" if is_assemble else "IN", required * quantity, "component"))
+
+        for _, code, transaction_type, quantity, _ in moves:
+            if transaction_type == "OUT":
+                outbound[code] += quantity
+
+        # 2. 제품 잠금 (코드 순서)
+        product_codes = sorted({code for _, code, _, _, _ in moves})
+        products = db.query(Product).filter(
+            Product.product_code.in_(product_codes)
+        ).order_by(Product.product_code).with_for_update().all()
+        product_map = {p.product_code: p for p in products}
+
+        missing = [code for code in product_codes if code not in product_map]
+        if missing:
+            db.rollback()
+            raise HTTPException(status_code=404, detail=f"Product with code {', '.join(missing)} not found")
+
+        transaction_date = get_current_utc_time()
+        later_checkpoints = TransactionService.get_later_checkpoints(db, product_codes, transaction_date)
+
+        # 3. 출고 합계 일괄 검증 (체크포인트 이후 거래는 현재 재고에 영향 없음)
+        shortages = [
+            f"{code} (재고 {product_map[code].current_stock or 0}, 필요 {quantity})"
+            for code, quantity in sorted(outbound.items())
+            if code not in later_checkpoints and (product_map[code].current_stock or 0) < quantity
+        ]
+        if shortages:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=f"Insufficient stock: {', '.join(shortages)}")
+
+        # 4. 거래 생성 (작업 순서대로 재고 누적)
+        running_stock = {code: (p.current_stock or 0) for code, p in product_map.items()}
+        stock_deltas: Dict[str, int] = defaultdict(int)
+        rows = []
+        for index, code, transaction_type, quantity, kind in moves:
+            set_product = product_map[operations[index]["product_code"]]
+            is_assemble = operations[index].get("operation", "assemble") == "assemble"
+            if kind == "set":
+                reason = "세트 조립" if is_assemble else "세트 해체"
+            else:
+                reason = f"{set_product.product_code}_{set_product.product_name}_세트 조립" if is_assemble else "세트 해체"
+
+            checkpoint_id = later_checkpoints.get(code)
+            affects_current_stock = checkpoint_id is None
+            previous_stock = running_stock[code]
+            delta = quantity if transaction_type == "IN" else -quantity
+            new_stock = previous_stock + delta if affects_current_stock else previous_stock
+
+            rows.append({
+                "transaction_type": transaction_type,
+                "product_code": code,
+                "quantity": quantity,
+                "previous_stock": previous_stock,
+                "new_stock": new_stock,
+                "reason": reason,
+                "created_by": created_by,
+                "transaction_date": transaction_date,
+                "affects_current_stock": affects_current_stock,
+                "checkpoint_id": checkpoint_id
+            })
+
+            if affects_current_stock:
+                running_stock[code] = new_stock
+                stock_deltas[code] += delta
+
+        db.execute(insert(Transaction), rows)
+
+        changed = {code: delta for code, delta in stock_deltas.items() if delta}
+        if changed:
+            db.execute(
+                update(Product).where(
+                    Product.product_code.in_(list(changed.keys()))
+                ).values(
+                    current_stock=Product.current_stock + case(changed, value=Product.product_code, else_=0)
+                ).execution_options(synchronize_session=False)
+            )
+
+        # 자동 안전재고 계산 (출고된 제품만)
+        db.flush()
+        for code in sorted(outbound.keys()):
+            product = product_map[code]
+            if product.is_auto_calculated:
+                product.safety_stock = TransactionService.calculate_safety_stock(db, code)
+
+        db.commit()
+
+        return {
+            "success": True,
+            "operations": len(operations),
+            "transactions_created": len(rows),
+            "results": [
+                {
+                    "product_code": op["product_code"],
+                    "product_name": product_map[op["product_code"]].product_name,
+                    "operation": op.get("operation", "assemble"),
+                    "quantity": int(op["quantity"]),
+                    "new_quantity": running_stock[op["product_code"]]
+                }
+                for op in operations
+            ]
+        }
@@ -0,0 +1,350 @@
+"""
+Bulk Ingest Service Layer
+대용량 과거 거래 적재 (수년치 채널 이력 마이그레이션 등)
+
+ORM으로 한 행씩 추가하는 대신
+- CSV를 psycopg2 copy_expert로 UNLOGGED 스테이징 테이블에 그대로 스트리밍
+- 형식 오류/미등록 제품 행은 SQL 한 번으로 찾아 행 번호와 함께 보고 (병합에서 제외)
+- 체크포인트 분류, affects_current_stock, 이전/이후 재고 계산, transactions INSERT,
+  제품 재고 UPDATE를 하나의 SQL 문으로 병합
+- 병합이 끝나면 스테이징 행 삭제 후 커밋, 필요 시 해당 기간 집계/수불부 재생성
+PostgreSQL 전용 (COPY, UNLOGGED 테이블, 윈도 함수 사용)
+"""
+import uuid
+from datetime import date, datetime
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.daily_ledger import DailyLedger
+from app.models.product import Product
+from app.models.stock_checkpoint import ProductCheckpointHead
+from app.models.transaction import Transaction
+from app.services.batch_transaction_service import CSV_TRANSACTION_TYPES
+from app.services.sales_fact_service import SalesFactService
+from app.core.timezone_utils import ensure_kst
+from app.core.config import settings
+
+# 응답에 포함할 최대 오류 건수
+MAX_REPORTED_ERRORS = 1000
+
+# 재고가 음수가 되는 제품을 보고할 최대 건수
+MAX_REPORTED_SHORTAGES = 100
+
+# COPY 시 한 번에 읽을 바이트 수
+COPY_BUFFER_SIZE = 1024 * 1024
+
+STAGING_TABLE = f"{settings.DB_SCHEMA}.transaction_import_staging"
+
+# CSV 템플릿 열 순서 그대로 적재 (제품코드, 제품명, 구분, 수량, 날짜, 사유, 메모)
+STAGING_COLUMNS = (
+    "product_code", "product_name", "transaction_type", "quantity",
+    "transaction_date", "reason", "memo"
+)
+
+COPY_SQL = (
+    f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')"
+)
+
+_TRANSACTION_TYPES_SQL = ", ".join(f"'{t}'" for t in CSV_TRANSACTION_TYPES)
+
+# 스테이징 행 정규화 (id 순서 = 파일의 데이터 행 순서)
+_STAGED_CTE = f"""
+staged AS (
+    SELECT
+        s.id,
+        btrim(s.product_code) AS product_code,
+        upper(btrim(s.transaction_type)) AS transaction_type,
+        btrim(s.quantity) AS quantity_text,
+        CASE WHEN btrim(s.quantity) ~ '^[+-]?[0-9]{{1,9}}$' THEN btrim(s.quantity)::integer END AS quantity,
+        btrim(s.transaction_date) AS date_text,
+        {settings.DB_SCHEMA}.try_timestamptz(btrim(s.transaction_date)) AS transaction_date,
+        left(NULLIF(btrim(s.reason), ''), 100) AS reason,
+        NULLIF(btrim(s.memo), '') AS memo
+    FROM {STAGING_TABLE} s
+    WHERE s.load_id = :load_id
+)"""
+
+# 유효한 행의 체크포인트 분류와 파일 순서 기준 누적 재고 계산
+# (checkpoint_head_service.classify_import_row와 같은 규칙: 비활성화 제품 또는 체크포인트 시각 이전(같은 시각 포함) 거래는 과거 이력)
+_RUNNING_CTE = f"""
+{_STAGED_CTE},
+classified AS (
+    SELECT
+        st.*,
+        p.zone_id,
+        COALESCE(p.current_stock, 0) AS current_stock,
+        h.checkpoint_id AS head_checkpoint_id,
+        (h.checkpoint_date IS NOT NULL AND st.transaction_date <= h.checkpoint_date) AS before_checkpoint,
+        (p.is_active AND NOT (h.checkpoint_date IS NOT NULL AND st.transaction_date <= h.checkpoint_date)) AS affects,
+        CASE WHEN st.transaction_type = 'OUT' THEN -st.quantity ELSE st.quantity END AS delta
+    FROM staged st
+    JOIN {Product.__table__.fullname} p ON p.product_code = st.product_code
+    LEFT JOIN {ProductCheckpointHead.__table__.fullname} h ON h.product_code = st.product_code
+    WHERE st.transaction_type IN ({_TRANSACTION_TYPES_SQL})
+      AND st.quantity IS NOT NULL
+      AND st.transaction_date IS NOT NULL
+),
+running AS (
+    SELECT
+        c.*,
+        c.current_stock + COALESCE(
+            SUM(CASE WHEN c.affects THEN c.delta ELSE 0 END) OVER (
+                PARTITION BY c.product_code ORDER BY c.id
+                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            ), 0
+        ) AS previous_stock
+    FROM classified c
+)"""
+
+VALIDATE_SQL = f"""
+WITH {_STAGED_CTE},
+checked AS (
+    SELECT
+        row_number() OVER (ORDER BY st.id) AS row_number,
+        CASE
+            WHEN st.product_code IS NULL OR st.product_code = '' THEN '제품코드가 비어 있습니다'
+            WHEN p.product_code IS NULL THEN '제품 코드 ' || st.product_code || '를 찾을 수 없습니다'
+            WHEN st.transaction_type IS NULL OR st.transaction_type NOT IN ({_TRANSACTION_TYPES_SQL})
+                THEN '알 수 없는 트랜잭션 타입: ' || COALESCE(NULLIF(st.transaction_type, ''), '(빈 값)')
+            WHEN st.quantity IS NULL
+                THEN '수량이 숫자가 아닙니다: ' || COALESCE(NULLIF(st.quantity_text, ''), '(빈 값)')
+            WHEN st.date_text IS NULL OR st.date_text = '' THEN '날짜가 비어 있습니다'
+            WHEN st.transaction_date IS NULL THEN '날짜 형식이 올바르지 않습니다: ' || st.date_text
+        END AS error
+    FROM staged st
+    LEFT JOIN {Product.__table__.fullname} p ON p.product_code = st.product_code
+)
+SELECT row_number, error, count(*) OVER () AS total_errors
+FROM checked
+WHERE error IS NOT NULL
+ORDER BY row_number
+LIMIT :max_errors
+"""
+
+LOCK_PRODUCTS_SQL = f"""
+SELECT p.product_code
+FROM {Product.__table__.fullname} p
+WHERE p.product_code IN (
+    SELECT DISTINCT btrim(s.product_code) FROM {STAGING_TABLE} s WHERE s.load_id = :load_id
+)
+ORDER BY p.product_code
+FOR UPDATE
+"""
+
+SHORTAGE_SQL = f"""
+WITH {_RUNNING_CTE}
+SELECT product_code, min(previous_stock + delta) AS lowest_stock
+FROM running
+WHERE affects
+GROUP BY product_code
+HAVING min(previous_stock + delta) < 0
+ORDER BY product_code
+LIMIT :max_shortages
+"""
+
+MERGE_SQL = f"""
+WITH {_RUNNING_CTE},
+inserted AS (
+    INSERT INTO {Transaction.__table__.fullname} (
+        id, transaction_type, product_code, quantity, previous_stock, new_stock,
+        reason, memo, location, affects_current_stock, checkpoint_id,
+        created_by, transaction_date, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), r.transaction_type, r.product_code, r.quantity,
+        r.previous_stock, r.previous_stock + r.delta,
+        r.reason, r.memo, r.zone_id, r.affects,
+        CASE WHEN r.before_checkpoint THEN r.head_checkpoint_id END,
+        :created_by, r.transaction_date, now(), now()
+    FROM running r
+    ORDER BY r.id
+    RETURNING product_code, transaction_type, quantity, affects_current_stock, transaction_date
+),
+stock AS (
+    UPDATE {Product.__table__.fullname} p
+    SET current_stock = COALESCE(p.current_stock, 0) + d.delta,
+        updated_at = now()
+    FROM (
+        SELECT product_code,
+               SUM(CASE WHEN transaction_type = 'OUT' THEN -quantity ELSE quantity END) AS delta
+        FROM inserted
+        WHERE affects_current_stock
+        GROUP BY product_code
+    ) d
+    WHERE p.product_code = d.product_code AND d.delta <> 0
+    RETURNING p.product_code
+)
+SELECT
+    (SELECT count(*) FROM inserted) AS inserted,
+    (SELECT count(*) FROM inserted WHERE NOT affects_current_stock) AS historical,
+    (SELECT count(*) FROM stock) AS products_updated,
+    (SELECT min(transaction_date) FROM inserted) AS first_date,
+    (SELECT max(transaction_date) FROM inserted) AS last_date,
+    (SELECT min(transaction_date) FROM inserted WHERE affects_current_stock) AS first_stock_date,
+    (SELECT max(transaction_date) FROM inserted WHERE affects_current_stock) AS last_stock_date
+"""
+
+CLEANUP_SQL = f"DELETE FROM {STAGING_TABLE} WHERE load_id = :load_id"
+
+
+def _kst_date(value: Optional[datetime]) -> Optional[date]:
+    """적재된 거래 시각을 한국 날짜로 (집계/수불부 기준)"""
+    return ensure_kst(value).date() if value is not None else None
+
+
+class BulkIngestService:
+    """Bulk transaction ingest business logic service"""
+
+    @staticmethod
+    def copy_to_staging(db: Session, stream: BinaryIO, load_id: str) -> int:
+        """
+        CSV 스트림을 스테이징 테이블로 COPY (세션의 현재 트랜잭션 안에서 실행)
+
+        첫 줄은 헤더로 건너뛰고, 열은 CSV 템플릿 순서대로 7개여야 함
+
+        Returns:
+            적재된 행 수
+
+        Raises:
+            ValueError: 열 개수/인코딩 오류 등으로 COPY 실패
+        """
+        raw_connection = db.connection().connection
+        cursor = raw_connection.cursor()
+        try:
+            # 스테이징 행의 load_id 기본값 (트랜잭션 종료 시 해제)
+            cursor.execute(
+                "SELECT set_config('playauto.import_load_id', %s, true)",
+                (load_id,)
+            )
+            cursor.copy_expert(COPY_SQL, stream, size=COPY_BUFFER_SIZE)
+            return cursor.rowcount
+        except psycopg2.DataError as e:
+            raise ValueError(f"CSV 적재 실패: {e.diag.message_primary or e}")
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def find_invalid_rows(db: Session, load_id: str) -> Tuple[List[dict], int]:
+        """
+        병합에서 제외될 행 (미등록 제품, 알 수 없는 유형, 수량/날짜 형식 오류)
+
+        Returns:
+            (행별 오류 목록 - 최대 MAX_REPORTED_ERRORS건, 전체 오류 건수)
+        """
+        rows = db.execute(
+            text(VALIDATE_SQL),
+            {"load_id": load_id, "max_errors": MAX_REPORTED_ERRORS}
+        ).all()
+
+        errors = [{"row": row.row_number, "error": row.error} for row in rows]
+        total = rows[0].total_errors if rows else 0
+        return errors, total
+
+    @staticmethod
+    def ingest(
+        db: Session,
+        stream: BinaryIO,
+        created_by: str = "bulk_import",
+        allow_negative: bool = False,
+        regenerate_ledger: bool = False
+    ) -> Dict:
+        """
+        CSV 파일 전체를 한 트랜잭션으로 적재
+
+        1. 스테이징 테이블로 COPY
+        2. 형식 오류 행 보고 (병합 대상에서 제외)
+        3. 대상 제품 잠금 후, allow_negative가 아니면 재고가 음수가 되는 제품이 있을 때 전체 취소
+        4. 분류/재고 계산/INSERT/재고 UPDATE를 SQL 한 번으로 병합, 스테이징 행 삭제 후 커밋
+        5. 적재 기간의 판매 집계 재적재, regenerate_ledger이면 해당 기간의 기존 수불부 재생성
+
+        날짜에 시간대가 없으면 UTC로 해석 (일괄 등록/CSV 업로드와 동일)
+
+        Raises:
+            ValueError: COPY 실패 또는 재고 부족 (적재 내용은 모두 롤백)
+        """
+        load_id = str(uuid.uuid4())
+
+        try:
+            staged_rows = BulkIngestService.copy_to_staging(db, stream, load_id)
+
+            # 시간대 없는 날짜를 UTC로 해석 (이 트랜잭션에서만)
+            db.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+
+            errors, invalid_count = BulkIngestService.find_invalid_rows(db, load_id)
+
+            db.execute(text(LOCK_PRODUCTS_SQL), {"load_id": load_id})
+
+            if not allow_negative:
+                shortages = db.execute(
+                    text(SHORTAGE_SQL),
+                    {"load_id": load_id, "max_shortages": MAX_REPORTED_SHORTAGES}
+                ).all()
+                if shortages:
+                    details = ", ".join(f"{row.product_code}({row.lowest_stock})" for row in shortages)
+                    raise ValueError(f"재고가 음수가 되는 제품이 있습니다: {details}")
+
+            merged = db.execute(
+                text(MERGE_SQL),
+                {"load_id": load_id, "created_by": created_by}
+            ).one()
+
+            db.execute(text(CLEANUP_SQL), {"load_id": load_id})
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        result = {
+            "staged": staged_rows,
+            "inserted": merged.inserted,
+            "historical": merged.historical,
+            "failed": invalid_count,
+            "products_updated": merged.products_updated,
+            "errors": errors,
+            "first_date": _kst_date(merged.first_date),
+            "last_date": _kst_date(merged.last_date),
+            "ledger_dates": []
+        }
+
+        if merged.inserted:
+            # 판매 집계는 재고 영향 여부와 관계없이 출고를 집계하므로 적재 기간 전체를 재적재
+            SalesFactService.rebuild_range(db, result["first_date"], result["last_date"])
+
+        if regenerate_ledger and merged.first_stock_date is not None:
+            result["ledger_dates"] = BulkIngestService.regenerate_ledgers(
+                db,
+                _kst_date(merged.first_stock_date),
+                _kst_date(merged.last_stock_date)
+            )
+
+        return result
+
+    @staticmethod
+    def regenerate_ledgers(db: Session, start_date: date, end_date: date) -> List[date]:
+        """
+        기간 내 이미 생성된 일일 수불부를 날짜 순서대로 재생성
+
+        수불부는 재고에 영향을 주는 거래만 집계하므로 체크포인트 이전 이력만 적재한 경우에는 대상이 없음
+        수불부가 없던 날짜는 새로 만들지 않음 (수년치 빈 수불부 생성 방지)
+
+        Returns:
+            재생성한 날짜 목록
+        """
+        # 엔드포인트 함수 재사용 (수불부 생성 로직은 엔드포인트 모듈에 있음)
+        from app.api.v1.endpoints.daily_ledger import generate_daily_ledger
+
+        ledger_dates = [
+            row[0] for row in db.query(DailyLedger.ledger_date).filter(
+                DailyLedger.ledger_date >= start_date,
+                DailyLedger.ledger_date <= end_date
+            ).distinct().order_by(DailyLedger.ledger_date).all()
+        ]
+
+        for ledger_date in ledger_dates:
+            generate_daily_ledger(target_date=ledger_date, create_checkpoint=False, db=db)
+
+        return ledger_dates
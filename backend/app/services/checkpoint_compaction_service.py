@@ -0,0 +1,228 @@
+"""
+Checkpoint Compaction Service
+오래된 일일 마감(DAILY_CLOSE) 체크포인트 압축 및 보관
+
+일일 수불부가 제품마다 매일 DAILY_CLOSE 체크포인트를 만들기 때문에
+stock_checkpoints는 제품 수 × 365행씩 늘어남. 보관 기간이 지난 달은
+- 제품별로 그 달의 마지막 체크포인트 하나만 MONTHLY로 남기고 (이미 MONTHLY가 있으면 그것을 유지)
+- 나머지 DAILY_CLOSE는 stock_checkpoints_archive로 옮긴 뒤 삭제
+- 옮긴 체크포인트를 가리키던 거래(checkpoint_id)는 남긴 MONTHLY 체크포인트로 재연결
+ADJUST / MONTHLY 체크포인트는 건드리지 않음. 한 달 단위로 커밋
+"""
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import String, case, cast, column, delete, func, insert, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from app.models.stock_checkpoint import StockCheckpoint, StockCheckpointArchive, CheckpointType
+from app.models.transaction import Transaction
+from app.services.checkpoint_head_service import CheckpointHeadService
+from app.core.timezone_utils import day_range_bounds, ensure_kst
+
+logger = logging.getLogger(__name__)
+
+# DAILY_CLOSE 체크포인트 보관 기간 (이 기간 이전의 "완전히 지난 달"만 압축)
+DEFAULT_RETENTION_DAYS = 90
+
+# 거래 재연결/보관 시 한 번에 처리할 체크포인트 수
+DEFAULT_BATCH_SIZE = 5000
+
+
+class CheckpointCompactionService:
+    """Checkpoint compaction business logic service"""
+
+    @staticmethod
+    def get_cutoff(today: date, retention_days: int = DEFAULT_RETENTION_DAYS) -> date:
+        """압축 기준일 (보관 기간 시작일이 속한 달의 1일, 이 날짜 이전 달만 압축)"""
+        return (today - timedelta(days=retention_days)).replace(day=1)
+
+    @staticmethod
+    def iter_months(start: date, cutoff: date) -> Iterator[Tuple[date, date]]:
+        """start가 속한 달부터 cutoff 이전 달까지 (월 첫날, 월 말일)"""
+        month = start.replace(day=1)
+        while month < cutoff:
+            next_month = (month + timedelta(days=32)).replace(day=1)
+            yield month, next_month - timedelta(days=1)
+            month = next_month
+
+    @staticmethod
+    def build_fold_map(
+        keepers: Dict[str, UUID],
+        folded: List[Tuple[UUID, str]]
+    ) -> List[Tuple[UUID, Optional[UUID]]]:
+        """
+        압축할 체크포인트 → 대체 체크포인트 매핑
+
+        활성 체크포인트가 하나도 없던 제품(모두 비활성)은 대체 체크포인트가 None
+        """
+        return [(checkpoint_id, keepers.get(product_code)) for checkpoint_id, product_code in folded]
+
+    @staticmethod
+    def compact_month(
+        db: Session,
+        month_start: date,
+        month_end: date,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> dict:
+        """한 달치 DAILY_CLOSE 체크포인트 압축 (commit은 호출자가 수행)"""
+        range_start, range_end = day_range_bounds(month_start, month_end)
+        in_month = (
+            StockCheckpoint.checkpoint_date >= range_start,
+            StockCheckpoint.checkpoint_date < range_end
+        )
+
+        # 1. 제품별로 남길 체크포인트 (달의 마지막 활성 체크포인트, 같은 시각이면 MONTHLY 우선)
+        #    더 이른 MONTHLY가 있어도 이후 DAILY_CLOSE를 접으면 확정 재고가 과거 값으로 돌아가므로
+        #    마지막 DAILY_CLOSE를 남겨 승격 (기존 MONTHLY는 DAILY_CLOSE가 아니므로 그대로 유지)
+        keeper_rows = db.execute(
+            select(
+                StockCheckpoint.product_code,
+                StockCheckpoint.id,
+                StockCheckpoint.checkpoint_type
+            ).where(
+                *in_month,
+                StockCheckpoint.is_active == True,
+                StockCheckpoint.checkpoint_type.in_([CheckpointType.DAILY_CLOSE, CheckpointType.MONTHLY])
+            ).distinct(
+                StockCheckpoint.product_code
+            ).order_by(
+                StockCheckpoint.product_code,
+                StockCheckpoint.checkpoint_date.desc(),
+                case((StockCheckpoint.checkpoint_type == CheckpointType.MONTHLY, 1), else_=0).desc()
+            )
+        ).all()
+        keepers = {row.product_code: row.id for row in keeper_rows}
+        promote_ids = [row.id for row in keeper_rows if row.checkpoint_type == CheckpointType.DAILY_CLOSE]
+
+        # 2. 보관할 DAILY_CLOSE 체크포인트 (남길 체크포인트 제외, 비활성 포함)
+        folded = db.execute(
+            select(StockCheckpoint.id, StockCheckpoint.product_code).where(
+                *in_month,
+                StockCheckpoint.checkpoint_type == CheckpointType.DAILY_CLOSE
+            )
+        ).all()
+        keeper_ids = set(keepers.values())
+        fold_map = CheckpointCompactionService.build_fold_map(
+            keepers,
+            [(row.id, row.product_code) for row in folded if row.id not in keeper_ids]
+        )
+
+        # 3. 마지막 DAILY_CLOSE를 MONTHLY로 승격 (id가 그대로이므로 연결된 거래/최신 체크포인트는 유지)
+        reason = f"{month_start.strftime('%Y-%m')} 월말 결산 (일일 마감 압축)"
+        for i in range(0, len(promote_ids), batch_size):
+            db.execute(
+                update(StockCheckpoint).where(
+                    StockCheckpoint.id.in_(promote_ids[i:i + batch_size])
+                ).values(
+                    checkpoint_type=CheckpointType.MONTHLY,
+                    reason=reason
+                ).execution_options(synchronize_session=False)
+            )
+
+        # 4. 배치 단위로 거래 재연결 → 보관 테이블로 복사 → 삭제
+        transactions_repointed = 0
+        for i in range(0, len(fold_map), batch_size):
+            chunk = fold_map[i:i + batch_size]
+            mapping = values(
+                column('old_id', PG_UUID(as_uuid=True)),
+                column('keeper_id', PG_UUID(as_uuid=True)),
+                name='folded'
+            ).data(chunk)
+
+            result = db.execute(
+                update(Transaction).where(
+                    Transaction.checkpoint_id == mapping.c.old_id
+                ).values(
+                    checkpoint_id=mapping.c.keeper_id
+                ).execution_options(synchronize_session=False)
+            )
+            transactions_repointed += result.rowcount
+
+            db.execute(
+                insert(StockCheckpointArchive).from_select(
+                    [
+                        "id", "product_code", "checkpoint_date", "checkpoint_type", "confirmed_stock",
+                        "reason", "created_by", "created_at", "is_active", "folded_into_id"
+                    ],
+                    select(
+                        StockCheckpoint.id,
+                        StockCheckpoint.product_code,
+                        StockCheckpoint.checkpoint_date,
+                        cast(StockCheckpoint.checkpoint_type, String),
+                        StockCheckpoint.confirmed_stock,
+                        StockCheckpoint.reason,
+                        StockCheckpoint.created_by,
+                        StockCheckpoint.created_at,
+                        StockCheckpoint.is_active,
+                        mapping.c.keeper_id
+                    ).join(mapping, mapping.c.old_id == StockCheckpoint.id)
+                )
+            )
+
+            db.execute(
+                delete(StockCheckpoint).where(
+                    StockCheckpoint.id.in_([old_id for old_id, _ in chunk])
+                ).execution_options(synchronize_session=False)
+            )
+
+        # 최신 체크포인트는 보통 최근 달에 있지만, 이 달이 마지막 체크포인트였던 제품도 있으므로 갱신
+        CheckpointHeadService.refresh(db, {row.product_code for row in folded})
+
+        return {
+            "month": month_start.strftime('%Y-%m'),
+            "promoted": len(promote_ids),
+            "archived": len(fold_map),
+            "transactions_repointed": transactions_repointed
+        }
+
+    @staticmethod
+    def compact(
+        db: Session,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        today: Optional[date] = None
+    ) -> dict:
+        """
+        보관 기간이 지난 DAILY_CLOSE 체크포인트 압축
+
+        가장 오래된 달부터 한 달씩 처리하고 달마다 커밋하므로 중간에 실패해도 이전 달은 유지됨
+        """
+        cutoff = CheckpointCompactionService.get_cutoff(today or date.today(), retention_days)
+        cutoff_start, _ = day_range_bounds(cutoff, cutoff)
+
+        oldest = db.query(func.min(StockCheckpoint.checkpoint_date)).filter(
+            StockCheckpoint.checkpoint_type == CheckpointType.DAILY_CLOSE,
+            StockCheckpoint.checkpoint_date < cutoff_start
+        ).scalar()
+
+        summary = {
+            "cutoff": cutoff.isoformat(),
+            "months": [],
+            "promoted": 0,
+            "archived": 0,
+            "transactions_repointed": 0
+        }
+        if oldest is None:
+            return summary
+
+        for month_start, month_end in CheckpointCompactionService.iter_months(ensure_kst(oldest).date(), cutoff):
+            try:
+                result = CheckpointCompactionService.compact_month(db, month_start, month_end, batch_size)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            logger.info(
+                f"체크포인트 압축 {result['month']}: MONTHLY {result['promoted']}개, "
+                f"보관 {result['archived']}개, 거래 재연결 {result['transactions_repointed']}건"
+            )
+            summary["months"].append(result["month"])
+            for key in ("promoted", "archived", "transactions_repointed"):
+                summary[key] += result[key]
+
+        return summary
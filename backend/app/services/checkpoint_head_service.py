@@ -0,0 +1,316 @@
+"""
+Checkpoint Head Service
+제품별 최신 활성 체크포인트(product_checkpoint_head) 관리 및 프로세스 내 캐시
+
+- 체크포인트를 만들거나 활성 상태를 바꾸는 모든 경로는 커밋 전에 refresh를 호출
+- 거래 등록 시 "거래 시각 이후 체크포인트" 검사는 현재 트랜잭션에서 기본키 조회로 처리
+  (캐시는 미리보기/조회 전용)
+  (최신 체크포인트가 거래 시각 이후이면, 거래 시각 이후 가장 최근 체크포인트도 바로 그 체크포인트)
+- 다른 워커에는 PostgreSQL NOTIFY로 무효화 전파 (제품 캐시 리스너에 채널 등록)
+"""
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, delete, exists, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.stock_checkpoint import StockCheckpoint, ProductCheckpointHead
+from app.services.product_catalog_cache import (
+    NOTIFY_ALL,
+    invalidate_after_commit,
+    product_cache_listener
+)
+from app.core.timezone_utils import ensure_timezone_aware, ensure_kst
+
+# 워커 간 체크포인트 변경 알림 채널
+CHECKPOINT_NOTIFY_CHANNEL = "checkpoint_head"
+
+
+@dataclass(frozen=True)
+class CheckpointHead:
+    """제품의 최신 활성 체크포인트"""
+    checkpoint_id: UUID
+    checkpoint_date: datetime
+    confirmed_stock: int
+
+    @property
+    def checkpoint_day(self) -> date:
+        """체크포인트 날짜 (KST 기준)"""
+        return ensure_kst(self.checkpoint_date).date()
+
+    def is_after(self, transaction_date: datetime) -> bool:
+        """체크포인트가 거래 시각 이후인지"""
+        return ensure_timezone_aware(self.checkpoint_date) > ensure_timezone_aware(transaction_date)
+
+
+def classify_import_row(
+    head: Optional[CheckpointHead],
+    transaction_date: datetime,
+    product_active: bool = True
+) -> Tuple[bool, Optional[UUID]]:
+    """
+    가져오기 거래 한 행의 과거 이력 판단
+
+    BatchTransactionService.apply와 가져오기 미리보기(validate_many)가 함께 사용
+    (bulk_ingest_service의 적재 SQL도 같은 규칙)
+    - 비활성화 제품의 거래는 항상 과거 이력
+    - 최신 체크포인트 시각 이전(같은 시각 포함) 거래는 과거 이력이며 그 체크포인트에 연결
+
+    Returns:
+        (과거 이력 여부, 연결할 체크포인트 id)
+    """
+    before_checkpoint = head is not None and (
+        ensure_timezone_aware(transaction_date) <= ensure_timezone_aware(head.checkpoint_date)
+    )
+    is_past = (not product_active) or before_checkpoint
+    return is_past, head.checkpoint_id if before_checkpoint else None
+
+
+def load_heads(db: Session, product_codes: Iterable[str]) -> Dict[str, Optional[CheckpointHead]]:
+    """여러 제품의 최신 체크포인트를 기본키 IN 조회 한 번으로 읽음 (캐시 미사용)"""
+    loaded: Dict[str, Optional[CheckpointHead]] = {code: None for code in product_codes}
+    if not loaded:
+        return loaded
+    for row in db.query(ProductCheckpointHead).filter(
+        ProductCheckpointHead.product_code.in_(list(loaded))
+    ).all():
+        loaded[row.product_code] = CheckpointHead(
+            checkpoint_id=row.checkpoint_id,
+            checkpoint_date=row.checkpoint_date,
+            confirmed_stock=row.confirmed_stock
+        )
+    return loaded
+
+
+class CheckpointHeadCache:
+    """제품 코드 → 최신 체크포인트 캐시 (체크포인트가 없는 제품은 None으로 캐시)"""
+
+    def __init__(self):
+        self._items: Dict[str, Optional[CheckpointHead]] = {}
+        self._lock = threading.Lock()
+        # 무효화될 때마다 증가 - DB 조회 중 무효화된 값을 다시 채우지 않기 위함
+        self._generation = 0
+
+    def get_many(self, db: Session, product_codes: Iterable[str]) -> Dict[str, Optional[CheckpointHead]]:
+        """여러 제품의 최신 체크포인트 (캐시에 없는 제품만 기본키 IN 조회 한 번)"""
+        codes = {code for code in product_codes if code}
+        with self._lock:
+            found = {code: self._items[code] for code in codes if code in self._items}
+            generation = self._generation
+        missing = codes - found.keys()
+
+        if missing:
+            loaded = load_heads(db, missing)
+            found.update(loaded)
+
+            with self._lock:
+                if generation == self._generation:
+                    self._items.update(loaded)
+
+        return found
+
+    def invalidate(self, *product_codes: str):
+        """이 프로세스의 캐시에서 제품 제거"""
+        with self._lock:
+            self._generation += 1
+            for code in product_codes:
+                self._items.pop(code, None)
+
+    def clear(self):
+        """이 프로세스의 캐시 전체 제거"""
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+
+    def notify_change(self, db: Session, product_codes: Optional[Iterable[str]] = None):
+        """
+        체크포인트 변경 알림 발행 및 로컬 무효화 예약 (commit 전에 호출)
+
+        로컬 캐시는 커밋 직후에 비움 (pg_notify도 커밋 시점에 전달됨)
+        product_codes를 생략하면 전체 무효화
+        """
+        codes = None if product_codes is None else sorted(set(product_codes))
+        invalidate_after_commit(db, self, codes)
+
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        for payload in ([NOTIFY_ALL] if codes is None else codes):
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHECKPOINT_NOTIFY_CHANNEL, "payload": payload}
+            )
+
+
+# 전역 캐시 인스턴스 (다른 워커의 체크포인트 변경 알림도 수신)
+checkpoint_head_cache = CheckpointHeadCache()
+product_cache_listener.add_channel(CHECKPOINT_NOTIFY_CHANNEL, checkpoint_head_cache)
+
+
+class CheckpointHeadService:
+    """Checkpoint head business logic service"""
+
+    @staticmethod
+    def refresh(db: Session, product_codes: Optional[Iterable[str]] = None):
+        """
+        제품별 최신 활성 체크포인트 재계산 (같은 트랜잭션 안, commit 전에 호출)
+
+        1. 최신 활성 체크포인트를 DISTINCT ON으로 구해 UPSERT
+        2. 활성 체크포인트가 없어진 제품은 삭제
+        product_codes를 생략하면 전체 제품 재구축
+        """
+        codes = None
+        if product_codes is not None:
+            codes = sorted({code for code in product_codes if code})
+            if not codes:
+                return
+
+        db.flush()
+
+        latest = select(
+            StockCheckpoint.product_code,
+            StockCheckpoint.id,
+            StockCheckpoint.checkpoint_date,
+            StockCheckpoint.confirmed_stock
+        ).where(
+            StockCheckpoint.is_active == True
+        ).distinct(
+            StockCheckpoint.product_code
+        ).order_by(
+            StockCheckpoint.product_code,
+            StockCheckpoint.checkpoint_date.desc()
+        )
+        if codes is not None:
+            latest = latest.where(StockCheckpoint.product_code.in_(codes))
+
+        upsert = pg_insert(ProductCheckpointHead).from_select(
+            ["product_code", "checkpoint_id", "checkpoint_date", "confirmed_stock"],
+            latest
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[ProductCheckpointHead.product_code],
+            set_={
+                "checkpoint_id": upsert.excluded.checkpoint_id,
+                "checkpoint_date": upsert.excluded.checkpoint_date,
+                "confirmed_stock": upsert.excluded.confirmed_stock,
+                "updated_at": func.now()
+            }
+        )
+        db.execute(upsert)
+
+        has_active = exists().where(and_(
+            StockCheckpoint.product_code == ProductCheckpointHead.product_code,
+            StockCheckpoint.is_active == True
+        ))
+        stale = delete(ProductCheckpointHead).where(~has_active)
+        if codes is not None:
+            stale = stale.where(ProductCheckpointHead.product_code.in_(codes))
+        db.execute(stale.execution_options(synchronize_session=False))
+
+        checkpoint_head_cache.notify_change(db, codes)
+
+    @staticmethod
+    def get_heads(db: Session, product_codes: Iterable[str]) -> Dict[str, Optional[CheckpointHead]]:
+        """여러 제품의 최신 체크포인트 (캐시 사용 - 미리보기/조회용)"""
+        return checkpoint_head_cache.get_many(db, product_codes)
+
+    @staticmethod
+    def read_heads(db: Session, product_codes: Iterable[str]) -> Dict[str, Optional[CheckpointHead]]:
+        """
+        여러 제품의 최신 체크포인트를 현재 트랜잭션에서 직접 조회 (쓰기 경로용)
+
+        워커별 캐시는 다른 워커의 체크포인트 생성을 비동기 알림으로만 알게 되므로
+        (리스너가 꺼져 있거나 재연결 중이면 반영되지 않음)
+        affects_current_stock/checkpoint_id를 결정하는 경로는 캐시를 쓰지 않음
+        """
+        return load_heads(db, {code for code in product_codes if code})
+
+    @staticmethod
+    def get_head(db: Session, product_code: str) -> Optional[CheckpointHead]:
+        """제품의 최신 체크포인트"""
+        return checkpoint_head_cache.get_many(db, [product_code]).get(product_code)
+
+    @staticmethod
+    def get_later_checkpoints(
+        db: Session,
+        product_codes: Iterable[str],
+        transaction_date: datetime
+    ) -> Dict[str, UUID]:
+        """
+        거래 시각 이후 활성 체크포인트가 있는 제품
+
+        반환: {product_code: 체크포인트 id} (여기에 포함된 제품의 거래는 현재 재고에 반영하지 않음)
+        거래 등록 경로에서 사용하므로 캐시 대신 현재 트랜잭션에서 기본키 조회
+        """
+        heads = CheckpointHeadService.read_heads(db, product_codes)
+        return {
+            code: head.checkpoint_id
+            for code, head in heads.items()
+            if head is not None and head.is_after(transaction_date)
+        }
+
+    @staticmethod
+    def has_checkpoint_on_or_after(db: Session, product_code: str, target_date: date) -> bool:
+        """target_date 당일 또는 이후의 활성 체크포인트 존재 여부 (KST 날짜 기준)"""
+        head = CheckpointHeadService.get_head(db, product_code)
+        return head is not None and head.checkpoint_day >= target_date
+
+    @staticmethod
+    def get_latest_before(db: Session, product_code: str, target_date: date):
+        """
+        target_date 이전(KST 날짜 기준)의 가장 최근 활성 체크포인트
+
+        최신 체크포인트가 target_date 이전이면 그대로 사용하고 (수불부 생성의 일반적인 경우),
+        target_date 이후 체크포인트가 있을 때만 체크포인트 테이블을 조회
+        반환값은 checkpoint_date, confirmed_stock 속성을 가진 객체 또는 None
+        """
+        head = CheckpointHeadService.get_head(db, product_code)
+        if head is None:
+            return None
+        if head.checkpoint_day < target_date:
+            return head
+
+        return db.query(StockCheckpoint).filter(
+            and_(
+                StockCheckpoint.product_code == product_code,
+                func.date(StockCheckpoint.checkpoint_date) < target_date,
+                StockCheckpoint.is_active == True
+            )
+        ).order_by(StockCheckpoint.checkpoint_date.desc()).first()
+
+    @staticmethod
+    def validate_many(db: Session, items: List[Tuple[str, datetime]]) -> List[dict]:
+        """
+        여러 (제품 코드, 거래 날짜)의 체크포인트 일괄 검증 (가져오기 미리보기)
+
+        제품 목록과 제품별 최신 체크포인트를 한 번씩만 조회하여 행마다 판단
+        (가져오기와 같은 classify_import_row 규칙: 비활성화 제품 또는 체크포인트 시각 이전 거래는 과거 이력)
+        """
+        product_codes = {code for code, _ in items}
+        active = dict(
+            db.query(Product.product_code, Product.is_active).filter(
+                Product.product_code.in_(list(product_codes))
+            ).all()
+        )
+        heads = checkpoint_head_cache.get_many(db, active.keys())
+
+        results = []
+        for index, (product_code, transaction_date) in enumerate(items):
+            head = heads.get(product_code)
+            is_past, checkpoint_id = classify_import_row(
+                head, transaction_date, bool(active.get(product_code, True))
+            )
+            results.append({
+                "index": index,
+                "product_code": product_code,
+                "transaction_date": transaction_date,
+                "product_exists": product_code in active,
+                "affects_current_stock": not is_past,
+                "checkpoint_id": checkpoint_id,
+                "checkpoint_date": head.checkpoint_date if checkpoint_id else None
+            })
+        return results
@@ -0,0 +1,371 @@
+"""
+Import Job Service
+대용량 가져오기 작업 (업로드 → 백그라운드 청크 처리 → 진행 상황 조회)
+
+- 업로드/요청 본문은 스트리밍으로 디스크(IMPORT_JOB_DIR)에 저장하고 작업 id를 즉시 반환
+- 작업 스레드가 파일을 청크 단위로 읽어 반영하고, 같은 트랜잭션에서 진행 상황(last_row)을 커밋
+  → 서버가 중간에 내려가도 마지막으로 커밋한 청크 다음 행부터 이어서 처리
+- 여러 워커가 같은 작업을 잡지 않도록 상태/하트비트 조건부 UPDATE로 작업을 점유
+- 실패 행은 원본 값과 함께 저장하여 CSV로 내려받아 수정 후 다시 업로드
+"""
+import csv
+import io
+import logging
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, insert, or_, and_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.timezone_utils import ensure_timezone_aware, get_current_utc_time
+from app.models.import_job import ImportJob, ImportJobError
+from app.schemas.batch import BatchProduct, BatchTransaction, ImportJobStatus, ImportJobType
+from app.services.batch_product_service import BatchProductService, iter_product_chunks
+from app.services.batch_transaction_service import (
+    BatchTransactionService,
+    CSV_COLUMNS,
+    iter_csv_chunks,
+    transaction_row_data
+)
+
+logger = logging.getLogger(__name__)
+
+# 하트비트가 이 시간 이상 멈춘 실행 중 작업은 중단된 것으로 보고 다시 점유
+IMPORT_JOB_STALE_SECONDS = 300
+
+# 파일 복사 버퍼 크기
+COPY_BUFFER_SIZE = 1024 * 1024
+
+_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_JOB_WORKERS, thread_name_prefix="import-job")
+
+
+def _job_dir() -> Path:
+    """작업 파일 저장 디렉터리"""
+    path = Path(settings.IMPORT_JOB_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _error_columns(job_type: str) -> List[str]:
+    """실패 행 CSV의 원본 값 열"""
+    if job_type == ImportJobType.PRODUCTS.value:
+        return list(BatchProduct.model_fields.keys())
+    return [korean for korean, _ in CSV_COLUMNS]
+
+
+class ImportJobService:
+    """Import job business logic service"""
+
+    @staticmethod
+    def create_job(
+        db: Session,
+        job_type: ImportJobType,
+        write_file: Callable[[BinaryIO], None],
+        file_name: Optional[str] = None,
+        chunk_size: int = 1000,
+        created_by: Optional[str] = None
+    ) -> ImportJob:
+        """작업 파일을 저장하고 대기 상태의 작업 생성 (실행은 submit)"""
+        job_id = uuid.uuid4()
+        extension = "jsonl" if job_type == ImportJobType.PRODUCTS else "csv"
+        path = _job_dir() / f"{job_id}.{extension}"
+
+        try:
+            with open(path, "wb") as f:
+                write_file(f)
+
+            job = ImportJob(
+                id=job_id,
+                job_type=job_type.value,
+                status=ImportJobStatus.PENDING.value,
+                file_name=file_name,
+                file_path=str(path),
+                chunk_size=chunk_size,
+                created_by=created_by
+            )
+            db.add(job)
+            db.commit()
+        except Exception:
+            db.rollback()
+            path.unlink(missing_ok=True)
+            raise
+
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def create_from_upload(db: Session, stream: BinaryIO, file_name: str, chunk_size: int) -> ImportJob:
+        """업로드된 거래 CSV를 그대로 저장"""
+        return ImportJobService.create_job(
+            db,
+            ImportJobType.TRANSACTIONS,
+            lambda f: shutil.copyfileobj(stream, f, COPY_BUFFER_SIZE),
+            file_name=file_name,
+            chunk_size=chunk_size
+        )
+
+    @staticmethod
+    def create_from_transactions(db: Session, transactions: Sequence[BatchTransaction], chunk_size: int) -> ImportJob:
+        """/batch/process 형식의 거래 목록을 템플릿 CSV로 저장"""
+        def write(f: BinaryIO):
+            text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+            writer = csv.writer(text)
+            writer.writerow([korean for korean, _ in CSV_COLUMNS])
+            for trans in transactions:
+                writer.writerow(transaction_row_data(trans).values())
+            text.flush()
+            text.detach()
+
+        return ImportJobService.create_job(db, ImportJobType.TRANSACTIONS, write, chunk_size=chunk_size)
+
+    @staticmethod
+    def create_from_products(db: Session, products: Sequence[BatchProduct], chunk_size: int) -> ImportJob:
+        """/batch/products 형식의 제품 목록을 JSON Lines로 저장"""
+        def write(f: BinaryIO):
+            for product in products:
+                f.write(product.model_dump_json(exclude_none=True).encode("utf-8") + b"\n")
+
+        return ImportJobService.create_job(db, ImportJobType.PRODUCTS, write, chunk_size=chunk_size)
+
+    @staticmethod
+    def submit(job_id: UUID):
+        """작업 스레드에서 실행"""
+        _executor.submit(ImportJobService.run_job, job_id)
+
+    @staticmethod
+    def claim(db: Session, job_id: UUID) -> bool:
+        """대기 중이거나 하트비트가 멈춘 작업을 점유 (다른 워커가 이미 실행 중이면 False)"""
+        stale_before = func.now() - timedelta(seconds=IMPORT_JOB_STALE_SECONDS)
+        result = db.execute(
+            update(ImportJob).where(
+                ImportJob.id == job_id,
+                or_(
+                    ImportJob.status == ImportJobStatus.PENDING.value,
+                    and_(
+                        ImportJob.status == ImportJobStatus.RUNNING.value,
+                        ImportJob.heartbeat_at < stale_before
+                    )
+                )
+            ).values(
+                status=ImportJobStatus.RUNNING.value,
+                error_message=None,
+                started_at=func.coalesce(ImportJob.started_at, func.now()),
+                run_started_at=func.now(),
+                run_start_rows=ImportJob.rows_done,
+                heartbeat_at=func.now()
+            ).execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def count_rows(job: ImportJob) -> int:
+        """
+        작업 파일의 데이터 행 수 (진행률/ETA 계산용, 스트리밍으로 셈)
+
+        작업자(iter_csv_chunks)와 같이 csv.DictReader로 세어 빈 줄은 제외
+        """
+        with open(job.file_path, "r", encoding="utf-8-sig", newline="") as f:
+            if job.job_type == ImportJobType.PRODUCTS.value:
+                return sum(1 for line in f if line.strip())
+            return sum(1 for _ in csv.DictReader(f))
+
+    @staticmethod
+    def apply_chunk(db: Session, job: ImportJob, valid: List[Tuple[int, object]], invalid: List[dict]):
+        """청크 하나를 반영하고 진행 상황/실패 행과 함께 한 번에 커밋"""
+        if job.job_type == ImportJobType.PRODUCTS.value:
+            succeeded, failed, errors = BatchProductService.apply(db, valid, commit=False)
+            row_data = lambda item: item.model_dump()
+        else:
+            succeeded, failed, errors = BatchTransactionService.apply(
+                db, valid, created_by=job.created_by or "import_job", commit=False
+            )
+            row_data = transaction_row_data
+
+        items = dict(valid)
+        error_rows = [
+            {"job_id": job.id, "row_number": e["row"], "error": e["error"], "row_data": e.get("data")}
+            for e in invalid
+        ] + [
+            {"job_id": job.id, "row_number": e["row"], "error": e["error"], "row_data": row_data(items[e["row"]])}
+            for e in errors
+        ]
+        if error_rows:
+            db.execute(insert(ImportJobError), error_rows)
+
+        row_numbers = [row for row, _ in valid] + [e["row"] for e in invalid]
+        job.rows_done += len(valid) + len(invalid)
+        job.rows_succeeded += succeeded
+        job.rows_failed += failed + len(invalid)
+        job.last_row = max([job.last_row] + row_numbers)
+        job.heartbeat_at = func.now()
+        db.commit()
+
+    @staticmethod
+    def run_job(job_id: UUID):
+        """작업 실행 (last_row 다음 행부터 청크 단위로 처리)"""
+        db = SessionLocal()
+        try:
+            if not ImportJobService.claim(db, job_id):
+                return
+
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            if job.total_rows is None:
+                job.total_rows = ImportJobService.count_rows(job)
+                db.commit()
+
+            logger.info(f"가져오기 작업 시작: {job_id} ({job.job_type}, {job.last_row}행 이후부터)")
+            read_chunks = iter_product_chunks if job.job_type == ImportJobType.PRODUCTS.value else iter_csv_chunks
+            with open(job.file_path, "rb") as stream:
+                for valid, invalid in read_chunks(stream, job.chunk_size, start_after=job.last_row):
+                    ImportJobService.apply_chunk(db, job, valid, invalid)
+
+            job.status = ImportJobStatus.COMPLETED.value
+            job.finished_at = func.now()
+            db.commit()
+            Path(job.file_path).unlink(missing_ok=True)
+            logger.info(f"가져오기 작업 완료: {job_id} (성공 {job.rows_succeeded}, 실패 {job.rows_failed})")
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"가져오기 작업 실패: {job_id} - {e}")
+            db.execute(
+                update(ImportJob).where(ImportJob.id == job_id).values(
+                    status=ImportJobStatus.FAILED.value,
+                    error_message=str(e)
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def resume(db: Session, job: ImportJob) -> bool:
+        """실패했거나 중단된 작업을 대기 상태로 돌리고 다시 실행 (완료/실행 중이면 False)"""
+        if job.status == ImportJobStatus.COMPLETED.value:
+            return False
+        if job.status == ImportJobStatus.RUNNING.value:
+            heartbeat = ensure_timezone_aware(job.heartbeat_at) if job.heartbeat_at else None
+            if heartbeat and heartbeat > get_current_utc_time() - timedelta(seconds=IMPORT_JOB_STALE_SECONDS):
+                return False
+
+        job.status = ImportJobStatus.PENDING.value
+        job.error_message = None
+        db.commit()
+        ImportJobService.submit(job.id)
+        return True
+
+    @staticmethod
+    def resume_interrupted():
+        """서버 시작 시 대기 중이거나 중단된 작업을 다시 실행"""
+        db = SessionLocal()
+        try:
+            stale_before = func.now() - timedelta(seconds=IMPORT_JOB_STALE_SECONDS)
+            job_ids = [
+                job_id for (job_id,) in db.query(ImportJob.id).filter(
+                    or_(
+                        ImportJob.status == ImportJobStatus.PENDING.value,
+                        and_(
+                            ImportJob.status == ImportJobStatus.RUNNING.value,
+                            or_(ImportJob.heartbeat_at == None, ImportJob.heartbeat_at < stale_before)
+                        )
+                    )
+                ).all()
+            ]
+        finally:
+            db.close()
+
+        for job_id in job_ids:
+            ImportJobService.submit(job_id)
+        if job_ids:
+            logger.info(f"중단된 가져오기 작업 {len(job_ids)}개 재개")
+
+    @staticmethod
+    def shutdown():
+        """대기 중인 작업 취소 (실행 중인 청크는 커밋되지 않으면 다음 시작 시 이어서 처리)"""
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def build_progress(job: ImportJob, now: Optional[datetime] = None) -> dict:
+        """진행률, 이번 실행의 처리 속도, 예상 남은 시간"""
+        now = now or get_current_utc_time()
+        progress_percent = None
+        if job.total_rows is not None:
+            progress_percent = 100.0 if job.total_rows == 0 else round(job.rows_done * 100 / job.total_rows, 1)
+
+        rows_per_second = None
+        eta_seconds = None
+        if job.run_started_at is not None and job.status != ImportJobStatus.PENDING.value:
+            end = job.finished_at if job.status == ImportJobStatus.COMPLETED.value and job.finished_at else now
+            if job.status == ImportJobStatus.FAILED.value and job.heartbeat_at:
+                end = job.heartbeat_at
+            elapsed = (ensure_timezone_aware(end) - ensure_timezone_aware(job.run_started_at)).total_seconds()
+            processed = job.rows_done - (job.run_start_rows or 0)
+            if elapsed > 0 and processed > 0:
+                rows_per_second = round(processed / elapsed, 1)
+                if job.status == ImportJobStatus.RUNNING.value and job.total_rows is not None:
+                    eta_seconds = int(max(job.total_rows - job.rows_done, 0) / rows_per_second)
+
+        return {
+            "id": job.id,
+            "job_type": job.job_type,
+            "status": job.status,
+            "file_name": job.file_name,
+            "total_rows": job.total_rows,
+            "rows_done": job.rows_done,
+            "rows_succeeded": job.rows_succeeded,
+            "rows_failed": job.rows_failed,
+            "progress_percent": progress_percent,
+            "rows_per_second": rows_per_second,
+            "eta_seconds": eta_seconds,
+            "error_message": job.error_message,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at
+        }
+
+    @staticmethod
+    def iter_error_csv(job_id: UUID, job_type: str) -> Iterator[str]:
+        """
+        실패 행 CSV (행번호, 오류, 원본 값) 스트리밍
+
+        응답 전송 중에도 사용할 수 있도록 별도 세션으로 조회
+        """
+        columns = _error_columns(job_type)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush() -> str:
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return value
+
+        writer.writerow(['행번호', '오류'] + columns)
+        yield "\ufeff" + flush()  # BOM 추가 (엑셀 한글 인식)
+
+        db = SessionLocal()
+        try:
+            errors = db.query(ImportJobError).filter(
+                ImportJobError.job_id == job_id
+            ).order_by(ImportJobError.row_number).yield_per(1000)
+
+            for error in errors:
+                data = error.row_data if isinstance(error.row_data, dict) else {}
+                writer.writerow(
+                    [error.row_number, error.error] +
+                    ["" if data.get(column) is None else data.get(column) for column in columns]
+                )
+                if buffer.tell() > 64 * 1024:
+                    yield flush()
+        finally:
+            db.close()
+
+        yield flush()
@@ -0,0 +1,329 @@
+"""
+Product Catalog Cache
+제품 코드 기준 제품 기본 정보(이름, 단위, 카테고리, 가격, 통화 등) 프로세스 내 캐시
+
+- 읽기 시 캐시에 없으면 DB에서 읽어 채움 (read-through)
+- 최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- 제품 생성/수정/삭제 시 ProductService가 무효화하고,
+  PostgreSQL NOTIFY로 다른 uvicorn 워커에도 무효화를 전파
+- 재고 수량처럼 자주 바뀌는 값은 캐시하지 않음 (재고 변경 경로는 항상 DB 행을 사용)
+"""
+import logging
+import select
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+# 워커 간 무효화 알림 채널
+NOTIFY_CHANNEL = "product_catalog"
+
+# 전체 무효화 payload
+NOTIFY_ALL = "*"
+
+# 세션 info 키: 커밋 후 무효화할 {id(캐시): (캐시, 키 집합)}
+_PENDING_INVALIDATIONS = "pending_cache_invalidations"
+
+
+def invalidate_after_commit(db: Session, cache, keys: Optional[Iterable[str]]):
+    """
+    현재 트랜잭션이 끝난 뒤 이 프로세스의 cache에서 keys 제거 예약 (None이면 전체 비움)
+
+    커밋 전에 지우면 같은 워커의 다른 요청이 이전 행을 다시 읽어 캐시할 수 있으므로
+    로컬 무효화는 커밋(또는 롤백) 직후에 실행
+    """
+    pending = db.info.setdefault(_PENDING_INVALIDATIONS, {})
+    _, pending_keys = pending.get(id(cache), (cache, set()))
+    if keys is None or pending_keys is None:
+        pending_keys = None
+    else:
+        pending_keys.update(keys)
+    pending[id(cache)] = (cache, pending_keys)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _run_pending_invalidations(session: Session):
+    """예약된 로컬 무효화 실행 (롤백 시에도 실행 - 추가 무효화는 무해)"""
+    pending = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if not pending:
+        return
+    for cache, keys in pending.values():
+        if keys is None:
+            cache.clear()
+        else:
+            cache.invalidate(*keys)
+
+
+@dataclass(frozen=True)
+class CachedProduct:
+    """캐시되는 제품 기본 정보 (불변)"""
+    product_code: str
+    product_name: str
+    barcode: Optional[str]
+    category: Optional[str]
+    manufacturer: Optional[str]
+    supplier: Optional[str]
+    unit: Optional[str]
+    purchase_currency: str
+    sale_currency: str
+    purchase_price: Decimal
+    sale_price: Decimal
+    is_active: bool
+
+    @classmethod
+    def from_model(cls, product: Product) -> "CachedProduct":
+        return cls(
+            product_code=product.product_code,
+            product_name=product.product_name,
+            barcode=product.barcode,
+            category=product.category,
+            manufacturer=product.manufacturer,
+            supplier=product.supplier,
+            unit=product.unit,
+            purchase_currency=product.purchase_currency or "KRW",
+            sale_currency=product.sale_currency or "KRW",
+            purchase_price=product.purchase_price if product.purchase_price is not None else Decimal(0),
+            sale_price=product.sale_price if product.sale_price is not None else Decimal(0),
+            is_active=bool(product.is_active)
+        )
+
+
+class ProductCatalogCache:
+    """크기 제한이 있는 LRU 제품 카탈로그 캐시"""
+
+    def __init__(self, max_size: int = 5000):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, CachedProduct]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 무효화될 때마다 증가 - DB 조회 중 무효화된 값을 다시 채우지 않기 위함
+        self._generation = 0
+        # 바코드 → 제품 코드 정확 일치 인덱스 (첫 바코드 조회 시 전체 로드)
+        self._barcodes: Optional[Dict[str, str]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, product_code: str) -> Optional[CachedProduct]:
+        """제품 코드로 조회 (캐시에 없으면 DB 조회 후 저장)"""
+        return self.get_many(db, [product_code]).get(product_code)
+
+    def get_many(self, db: Session, product_codes: Iterable[str]) -> Dict[str, CachedProduct]:
+        """
+        여러 제품 코드를 한 번에 조회
+
+        캐시에 없는 코드만 모아 IN 쿼리 한 번으로 읽음
+        """
+        codes = {code for code in product_codes if code}
+        found: Dict[str, CachedProduct] = {}
+        missing = []
+
+        with self._lock:
+            for code in codes:
+                item = self._items.get(code)
+                if item is None:
+                    missing.append(code)
+                else:
+                    self._items.move_to_end(code)
+                    found[code] = item
+            self.hits += len(found)
+            self.misses += len(missing)
+            generation = self._generation
+
+        if missing:
+            products = db.query(Product).filter(Product.product_code.in_(missing)).all()
+            loaded = {p.product_code: CachedProduct.from_model(p) for p in products}
+            found.update(loaded)
+
+            with self._lock:
+                if generation == self._generation:
+                    for code, item in loaded.items():
+                        self._put(code, item)
+
+        return found
+
+    def get_by_barcode(self, db: Session, barcode: str) -> Optional[CachedProduct]:
+        """
+        바코드 정확 일치 조회
+
+        바코드 인덱스는 활성 제품 전체를 한 번에 읽어 만들고,
+        제품이 변경되면 버렸다가 다음 조회 때 다시 만듦
+        """
+        barcode = (barcode or "").strip()
+        if not barcode:
+            return None
+
+        with self._lock:
+            barcodes = self._barcodes
+            generation = self._generation
+
+        if barcodes is None:
+            rows = db.query(Product.barcode, Product.product_code).filter(
+                Product.is_active == True,
+                Product.barcode.isnot(None),
+                Product.barcode != ''
+            ).all()
+            barcodes = {row.barcode.strip(): row.product_code for row in rows}
+
+            with self._lock:
+                if generation == self._generation:
+                    self._barcodes = barcodes
+
+        product_code = barcodes.get(barcode)
+        if product_code is None:
+            return None
+        return self.get(db, product_code)
+
+    def _put(self, product_code: str, item: CachedProduct):
+        """항목 저장 및 LRU 제거 (lock 보유 상태에서 호출)"""
+        self._items[product_code] = item
+        self._items.move_to_end(product_code)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, *product_codes: str):
+        """이 프로세스의 캐시에서 제품 제거"""
+        with self._lock:
+            self._generation += 1
+            self._barcodes = None
+            for code in product_codes:
+                self._items.pop(code, None)
+
+    def clear(self):
+        """이 프로세스의 캐시 전체 제거"""
+        with self._lock:
+            self._generation += 1
+            self._barcodes = None
+            self._items.clear()
+
+    def notify_change(self, db: Session, *product_codes: str):
+        """
+        제품 변경 알림 발행 및 로컬 무효화 예약
+
+        NOTIFY는 현재 트랜잭션이 커밋될 때 다른 워커에 전달되므로
+        변경 내용과 같은 트랜잭션 안(commit 전)에서 호출해야 함
+        이 워커의 캐시도 커밋 직후에 무효화 (LISTEN 설정과 무관)
+        """
+        invalidate_after_commit(db, self, product_codes)
+
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        for code in product_codes:
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFY_CHANNEL, "payload": code}
+            )
+
+    def stats(self) -> dict:
+        """캐시 상태"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total * 100, 1) if total else 0.0
+            }
+
+
+class ProductCacheListener:
+    """
+    다른 워커의 제품 변경 알림(LISTEN)을 받아 로컬 캐시를 무효화하는 백그라운드 스레드
+
+    채널별로 invalidate(*keys)/clear()를 가진 캐시를 등록할 수 있음 (add_channel)
+    """
+
+    def __init__(self, cache: ProductCatalogCache, poll_timeout: float = 5.0):
+        self.cache = cache
+        self.poll_timeout = poll_timeout
+        self._caches = {NOTIFY_CHANNEL: cache}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_channel(self, channel: str, cache):
+        """추가 알림 채널과 무효화할 캐시 등록 (start 전에 호출)"""
+        self._caches[channel] = cache
+
+    def _clear_all(self):
+        """등록된 모든 캐시 비우기"""
+        for cache in self._caches.values():
+            cache.clear()
+
+    def start(self):
+        """리스너 스레드 시작"""
+        from app.core.database import engine
+
+        if engine.dialect.name != "postgresql":
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="product-cache-listener", daemon=True)
+        self._thread.start()
+        logger.info("✅ 제품 캐시 무효화 리스너 시작")
+
+    def stop(self):
+        """리스너 스레드 중지"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_timeout + 1)
+            self._thread = None
+
+    def _run(self):
+        """연결이 끊기면 캐시를 비우고 다시 연결"""
+        from app.core.database import engine
+
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = engine.raw_connection()
+                # autocommit + LISTEN 상태로 풀에 반환되지 않도록 풀에서 분리 (close 시 실제로 닫힘)
+                connection.detach()
+                dbapi_conn = connection.dbapi_connection
+                # connect 이벤트(SET TIME ZONE)로 열린 트랜잭션을 닫은 뒤 autocommit 전환
+                dbapi_conn.commit()
+                dbapi_conn.autocommit = True
+                with dbapi_conn.cursor() as cursor:
+                    for channel in self._caches:
+                        cursor.execute(f"LISTEN {channel}")
+
+                # 연결 전 놓쳤을 수 있는 알림 대신 전체 무효화
+                self._clear_all()
+
+                while not self._stop.is_set():
+                    if select.select([dbapi_conn], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    dbapi_conn.poll()
+                    while dbapi_conn.notifies:
+                        notify = dbapi_conn.notifies.pop(0)
+                        cache = self._caches.get(notify.channel)
+                        if cache is None:
+                            continue
+                        if notify.payload == NOTIFY_ALL:
+                            cache.clear()
+                        else:
+                            cache.invalidate(notify.payload)
+            except Exception as e:
+                logger.error(f"제품 캐시 리스너 오류: {e}")
+                self._clear_all()
+                self._stop.wait(self.poll_timeout)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+# 전역 캐시 인스턴스
+product_catalog_cache = ProductCatalogCache(max_size=settings.PRODUCT_CACHE_MAX_SIZE)
+product_cache_listener = ProductCacheListener(product_catalog_cache)
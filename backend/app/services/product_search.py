@@ -0,0 +1,101 @@
+"""
+Product Search
+제품 검색 조건 및 정렬 순위 생성
+
+- 제품명/제조사/제품코드를 합친 검색 문서에 pg_trgm 트라이그램 인덱스를 사용
+  (한글 제품명도 문자 단위 트라이그램으로 부분 일치 및 오타 허용 검색 가능)
+- 제품코드/바코드처럼 보이는 검색어는 접두어 조건을 함께 사용하여 btree 인덱스로 바로 찾음
+- 결과는 접두어 일치 > 트라이그램 유사도 순으로 정렬
+"""
+import re
+from sqlalchemy import or_, case, func, literal, literal_column
+
+from app.models.product import Product
+
+# 제품코드/바코드 형태의 검색어 (영문, 숫자, -, _)
+CODE_LIKE_PATTERN = re.compile(r"^[A-Za-z0-9\-_]+$")
+
+# 최대 검색어 길이
+MAX_SEARCH_LENGTH = 100
+
+
+def normalize_search_term(search: str) -> str:
+    """검색어 정규화 (앞뒤 공백 제거, 연속 공백 축약, 소문자화)"""
+    term = " ".join(search.split())[:MAX_SEARCH_LENGTH]
+    return term.lower()
+
+
+def escape_like(term: str) -> str:
+    """LIKE 패턴의 특수 문자 이스케이프"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def is_code_like(term: str) -> bool:
+    """제품코드/바코드 형태의 검색어인지 여부"""
+    return bool(CODE_LIKE_PATTERN.match(term))
+
+
+def search_document():
+    """
+    검색 문서 식
+
+    migrations/021의 트라이그램 인덱스 식과 정확히 같아야 인덱스를 사용함
+    """
+    empty = literal_column("''")
+    separator = literal_column("' '")
+    return func.lower(
+        func.coalesce(Product.product_code, empty)
+        + separator + func.coalesce(Product.product_name, empty)
+        + separator + func.coalesce(Product.manufacturer, empty)
+    )
+
+
+def _prefix_conditions(term: str):
+    """제품코드/바코드 접두어 조건"""
+    pattern = f"{escape_like(term)}%"
+    return [
+        func.lower(Product.product_code).like(pattern, escape="\\"),
+        func.lower(Product.barcode).like(pattern, escape="\\")
+    ]
+
+
+def build_search_filter(search: str):
+    """
+    검색 조건 생성
+
+    - 부분 문자열 일치 (트라이그램 인덱스로 처리되는 ILIKE)
+    - 단어 유사도 일치 (오타 허용, term <% document)
+    - 제품코드/바코드 형태이면 접두어 일치
+    """
+    term = normalize_search_term(search)
+    document = search_document()
+
+    conditions = [
+        document.like(f"%{escape_like(term)}%", escape="\\"),
+        # word_similarity 임계값(pg_trgm.word_similarity_threshold, 기본 0.6) 이상
+        literal(term).op("<%")(document),
+    ]
+    if is_code_like(term):
+        conditions.extend(_prefix_conditions(term))
+
+    return or_(*conditions)
+
+
+def build_search_rank(search: str):
+    """
+    검색 결과 정렬 순위 식 (높을수록 우선)
+
+    제품코드 정확 일치(3) > 제품코드/바코드 접두어 일치(2) > 유사도(0~1)
+    """
+    term = normalize_search_term(search)
+    document = search_document()
+    similarity = func.word_similarity(term, document)
+
+    if not is_code_like(term):
+        return similarity
+
+    return case(
+        (func.lower(Product.product_code) == term, 3.0),
+        (or_(*_prefix_conditions(term)), 2.0),
+        else_=similarity
+    )
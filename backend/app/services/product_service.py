@@ -3,11 +3,13 @@ Product Service Layer
 """
 from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func
+from sqlalchemy import func
 from fastapi import HTTPException, status
 from uuid import UUID
 
 from app.models.product import Product
+from app.services.product_search import build_search_filter, build_search_rank
+from app.services.product_catalog_cache import product_catalog_cache
 from app.schemas.product import ProductCreate, ProductUpdate
 
 
@@ -39,14 +41,11 @@ class ProductService:
         if warehouse_id:
             query = query.filter(Product.warehouse_id == warehouse_id)
         
-        # 검색 필터
-        if search:
-            search_filter = or_(
-                Product.product_code.ilike(f"%{search}%"),
-                Product.product_name.ilike(f"%{search}%"),
-                Product.manufacturer.ilike(f"%{search}%")
+        # 검색 필터 (트라이그램/접두어 일치, 관련도순 정렬)
+        if search and search.strip():
+            query = query.filter(build_search_filter(search)).order_by(
+                build_search_rank(search).desc(), Product.product_name
             )
-            query = query.filter(search_filter)
         
         return query.offset(skip).limit(limit).all()
     
@@ -69,6 +68,7 @@ class ProductService:
         # 제품 생성
         product = Product(**product_create.model_dump())
         db.add(product)
+        product_catalog_cache.notify_change(db, product.product_code)
         db.commit()
         db.refresh(product)
         return product
@@ -101,7 +101,8 @@ class ProductService:
         
         for field, value in update_data.items():
             setattr(product, field, value)
-        
+
+        product_catalog_cache.notify_change(db, product_code, product.product_code)
         db.commit()
         db.refresh(product)
         return product
@@ -118,6 +119,7 @@ class ProductService:
         
         # Soft delete
         product.is_active = False
+        product_catalog_cache.notify_change(db, product_code)
         db.commit()
         return True
     
@@ -141,13 +143,8 @@ class ProductService:
         if warehouse_id:
             query = query.filter(Product.warehouse_id == warehouse_id)
         
-        if search:
-            search_filter = or_(
-                Product.product_code.ilike(f"%{search}%"),
-                Product.product_name.ilike(f"%{search}%"),
-                Product.manufacturer.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
+        if search and search.strip():
+            query = query.filter(build_search_filter(search))
         
         return query.scalar()
     
@@ -182,14 +179,11 @@ class ProductService:
         if warehouse_id:
             query = query.filter(Product.warehouse_id == warehouse_id)
 
-        # 검색 필터
-        if search:
-            search_filter = or_(
-                Product.product_code.ilike(f"%{search}%"),
-                Product.product_name.ilike(f"%{search}%"),
-                Product.manufacturer.ilike(f"%{search}%")
+        # 검색 필터 (트라이그램/접두어 일치, 관련도순 정렬)
+        if search and search.strip():
+            query = query.filter(build_search_filter(search)).order_by(
+                build_search_rank(search).desc(), Product.product_name
             )
-            query = query.filter(search_filter)
 
         return query.offset(skip).limit(limit).all()
 
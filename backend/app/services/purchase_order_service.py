@@ -0,0 +1,364 @@
+"""
+Purchase Order Service Layer
+발주서 조회 및 응답 직렬화
+"""
+from typing import Dict, Iterable, List, Optional
+from collections import defaultdict
+from datetime import datetime
+import uuid
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import update, case, exists, and_, not_, select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from fastapi import HTTPException
+
+from app.models.purchase_order import PurchaseOrder, PurchaseOrderItem, PoNumberCounter
+from app.models.product import Product
+from app.models.transaction import Transaction
+from app.services.product_catalog_cache import product_catalog_cache, CachedProduct
+from app.services.transaction_service import TransactionService
+from app.core.timezone_utils import get_current_utc_time, ensure_timezone_aware
+
+
+# 미입고 발주로 보지 않는 발주서 상태
+CLOSED_PO_STATUSES = ('completed', 'cancelled')
+
+
+def open_quantity_subquery():
+    """
+    제품별 미입고 발주 수량 상관 서브쿼리 (Product 행 기준)
+
+    완료/취소되지 않은 발주서의 미입고 항목에 대해 주문 수량 - 입고 수량 합계
+    """
+    return select(
+        func.coalesce(func.sum(
+            func.greatest(PurchaseOrderItem.ordered_quantity - func.coalesce(PurchaseOrderItem.received_quantity, 0), 0)
+        ), 0)
+    ).join(
+        PurchaseOrder, PurchaseOrderItem.po_id == PurchaseOrder.id
+    ).where(
+        and_(
+            PurchaseOrderItem.product_code == Product.product_code,
+            PurchaseOrder.status.notin_(CLOSED_PO_STATUSES),
+            PurchaseOrderItem.status != 'received'
+        )
+    ).scalar_subquery()
+
+
+class PurchaseOrderService:
+    """Purchase order business logic service"""
+
+    @staticmethod
+    def allocate_po_numbers(db: Session, count: int = 1, now: Optional[datetime] = None) -> List[str]:
+        """
+        발주서 번호 발급 (PO{YYYYMM}{NNNN})
+
+        월별 채번 행을 INSERT ... ON CONFLICT DO UPDATE ... RETURNING 한 문장으로 증가시키므로
+        동시에 생성해도 번호가 겹치지 않음 (같은 달 채번은 커밋 시까지 행 잠금으로 직렬화)
+        count > 1이면 연속된 번호를 한 번에 발급 (대량 등록용)
+        """
+        if count < 1:
+            raise ValueError("발급할 번호 수는 1 이상이어야 합니다")
+
+        period = (now or datetime.now()).strftime("%Y%m")
+
+        stmt = pg_insert(PoNumberCounter).values(period=period, last_value=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PoNumberCounter.period],
+            set_={"last_value": PoNumberCounter.last_value + stmt.excluded.last_value}
+        ).returning(PoNumberCounter.last_value)
+
+        last_value = db.execute(stmt).scalar_one()
+        first_value = last_value - count + 1
+
+        return [f"PO{period}{n:04d}" for n in range(first_value, last_value + 1)]
+
+    @staticmethod
+    def refresh_on_order_qty(db: Session, product_codes: Optional[Iterable[str]] = None) -> int:
+        """
+        제품 미입고 발주 수량(on_order_qty) 재계산
+
+        발주서 생성/수정/입고/삭제 시 해당 제품만 같은 트랜잭션 안에서(commit 전) 갱신
+        product_codes를 생략하면 전체 제품 재계산 (재구축 스크립트용)
+
+        제품 행을 먼저 FOR UPDATE로 잠그고 재계산은 별도 문장으로 실행
+        (READ COMMITTED에서는 문장마다 새 스냅샷을 쓰므로, 같은 제품을 바꾼 다른 발주 트랜잭션이
+        커밋될 때까지 기다린 뒤 그 항목까지 포함해 합계를 다시 계산)
+        반환값: 갱신된 제품 수
+        """
+        stmt = update(Product).values(on_order_qty=open_quantity_subquery())
+        lock = db.query(Product.product_code)
+        if product_codes is not None:
+            codes = sorted({code for code in product_codes if code})
+            if not codes:
+                return 0
+            stmt = stmt.where(Product.product_code.in_(codes))
+            lock = lock.filter(Product.product_code.in_(codes))
+
+        db.flush()
+        # 제품 코드 순서로 잠가 동시 발주 간 교착을 피함
+        lock.order_by(Product.product_code).with_for_update().all()
+        result = db.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount
+
+    @staticmethod
+    def get_order_query(db: Session):
+        """발주 항목을 함께 읽는 발주서 쿼리 (항목은 selectin으로 한 번에 로드)"""
+        return db.query(PurchaseOrder).options(selectinload(PurchaseOrder.items))
+
+    @staticmethod
+    def get_order(db: Session, po_id) -> PurchaseOrder:
+        """발주서 단건 조회 (없으면 404)"""
+        if isinstance(po_id, str):
+            po_id = uuid.UUID(po_id)
+
+        order = PurchaseOrderService.get_order_query(db).filter(
+            PurchaseOrder.id == po_id
+        ).first()
+
+        if not order:
+            raise HTTPException(status_code=404, detail="발주서를 찾을 수 없습니다")
+        return order
+
+    @staticmethod
+    def load_product_map(db: Session, orders: List[PurchaseOrder]) -> Dict[str, CachedProduct]:
+        """발주서들에 포함된 모든 제품을 한 번에 조회"""
+        product_codes = {item.product_code for order in orders for item in order.items}
+        return product_catalog_cache.get_many(db, product_codes)
+
+    @staticmethod
+    def serialize(order: PurchaseOrder, product_map: Dict[str, CachedProduct]) -> dict:
+        """
+        발주서 응답 생성
+
+        product_name/currency는 첫 번째 품목의 제품명과 구매 통화
+        """
+        items_data = []
+        product_name = ""
+        currency = "KRW"
+
+        for item in order.items:
+            product = product_map.get(item.product_code)
+            item_currency = product.purchase_currency if product else "KRW"
+            if product and not product_name:
+                product_name = product.product_name
+                currency = item_currency
+
+            unit_price = item.unit_price or 0
+            items_data.append({
+                "id": str(item.id),
+                "product_code": item.product_code,
+                "product_name": product.product_name if product else "",
+                "ordered_quantity": item.ordered_quantity,
+                "received_quantity": item.received_quantity or 0,
+                "unit_price": float(unit_price),
+                "subtotal": float(item.ordered_quantity * unit_price),
+                "status": item.status,
+                "currency": item_currency
+            })
+
+        return {
+            "id": str(order.id),
+            "po_number": order.po_number,
+            "supplier": order.supplier,
+            "status": order.status,
+            "total_amount": float(order.total_amount or 0),
+            "expected_date": order.expected_date.isoformat() if order.expected_date else None,
+            "notes": order.notes,
+            "created_at": order.created_at.isoformat(),
+            "updated_at": order.updated_at.isoformat(),
+            "items": items_data,
+            "product_name": product_name,
+            "currency": currency
+        }
+
+    @staticmethod
+    def serialize_many(db: Session, orders: List[PurchaseOrder]) -> List[dict]:
+        """발주서 목록 응답 생성 (제품 조회는 전체 목록에 대해 한 번)"""
+        product_map = PurchaseOrderService.load_product_map(db, orders)
+        return [PurchaseOrderService.serialize(order, product_map) for order in orders]
+
+    @staticmethod
+    def receive_items(
+        db: Session,
+        receipts: List[dict],
+        created_by: str = "system",
+        transaction_date: Optional[datetime] = None,
+        po_id: Optional[uuid.UUID] = None
+    ) -> dict:
+        """
+        발주 항목 입고 처리 (여러 발주서 동시 처리 가능)
+
+        1. 입고 대상 항목(발주번호 포함)과 제품을 각각 한 번의 쿼리로 잠금 조회
+           (완료/취소된 발주서, 미입고 수량 초과, 없는 제품은 아무것도 쓰기 전에 거부)
+        2. 항목별 IN 거래를 한 번에 추가 (체크포인트 이후 거래 규칙은 create_transaction과 동일)
+        3. 제품 재고, 항목 입고수량/상태, 발주서 상태를 각각 UPDATE 한 문장으로 반영
+        4. 한 번에 커밋
+
+        receipts: [{"item_id": str, "quantity": int}, ...]
+        po_id를 지정하면 모든 항목이 해당 발주서 소속인지 검증
+        """
+        # 같은 항목이 여러 번 오면 합산
+        quantities: Dict[uuid.UUID, int] = defaultdict(int)
+        for receipt in receipts:
+            try:
+                item_id = uuid.UUID(str(receipt["item_id"]))
+                quantity = int(receipt["quantity"])
+            except (KeyError, ValueError, TypeError):
+                raise HTTPException(status_code=400, detail=f"잘못된 입고 항목입니다: {receipt}")
+            if quantity <= 0:
+                raise HTTPException(status_code=400, detail="입고 수량은 0보다 커야 합니다")
+            quantities[item_id] += quantity
+
+        if not quantities:
+            raise HTTPException(status_code=400, detail="입고할 항목이 없습니다")
+
+        # 1-1. 항목 잠금 조회 (id 순서로 잠가 동시 입고 간 교착 방지)
+        rows = db.query(PurchaseOrderItem, PurchaseOrder.po_number, PurchaseOrder.status).join(
+            PurchaseOrder, PurchaseOrderItem.po_id == PurchaseOrder.id
+        ).filter(
+            PurchaseOrderItem.id.in_(list(quantities.keys()))
+        ).order_by(PurchaseOrderItem.id).with_for_update(of=PurchaseOrderItem).all()
+
+        found_ids = {item.id for item, _, _ in rows}
+        missing = [str(item_id) for item_id in quantities if item_id not in found_ids]
+        if missing:
+            db.rollback()
+            raise HTTPException(status_code=404, detail=f"발주 항목을 찾을 수 없습니다: {', '.join(missing)}")
+        if po_id is not None and any(item.po_id != po_id for item, _, _ in rows):
+            db.rollback()
+            raise HTTPException(status_code=400, detail="다른 발주서의 항목이 포함되어 있습니다")
+
+        # 완료/취소된 발주서의 항목, 미입고 수량을 넘는 입고는 거부
+        closed = sorted({po_number for _, po_number, po_status in rows if po_status in CLOSED_PO_STATUSES})
+        if closed:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=f"완료/취소된 발주서는 입고할 수 없습니다: {', '.join(closed)}")
+        over = []
+        for item, po_number, _ in rows:
+            remaining = item.ordered_quantity - (item.received_quantity or 0)
+            if quantities[item.id] > remaining:
+                over.append(f"{po_number} {item.product_code} (미입고 {remaining}, 요청 {quantities[item.id]})")
+        if over:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=f"미입고 수량을 초과했습니다: {', '.join(over)}")
+
+        # 1-2. 제품 잠금 조회 (제품 코드 순서)
+        product_deltas: Dict[str, int] = defaultdict(int)
+        for item, _, _ in rows:
+            product_deltas[item.product_code] += quantities[item.id]
+        product_codes = sorted(product_deltas.keys())
+
+        products = db.query(Product).filter(
+            Product.product_code.in_(product_codes)
+        ).order_by(Product.product_code).with_for_update().all()
+        product_map = {p.product_code: p for p in products}
+
+        missing_products = [code for code in product_codes if code not in product_map]
+        if missing_products:
+            db.rollback()
+            raise HTTPException(status_code=404, detail=f"제품을 찾을 수 없습니다: {', '.join(missing_products)}")
+
+        # 2. IN 거래 생성
+        transaction_date = ensure_timezone_aware(transaction_date) if transaction_date else get_current_utc_time()
+        later_checkpoints = TransactionService.get_later_checkpoints(db, product_codes, transaction_date)
+
+        running_stock = {code: (p.current_stock or 0) for code, p in product_map.items()}
+        stock_deltas: Dict[str, int] = defaultdict(int)
+        transactions = []
+        for item, po_number, _ in rows:
+            quantity = quantities[item.id]
+            checkpoint_id = later_checkpoints.get(item.product_code)
+            affects_current_stock = checkpoint_id is None
+            previous_stock = running_stock[item.product_code]
+            new_stock = previous_stock + quantity if affects_current_stock else previous_stock
+
+            transactions.append(Transaction(
+                transaction_type="IN",
+                product_code=item.product_code,
+                quantity=quantity,
+                previous_stock=previous_stock,
+                new_stock=new_stock,
+                reason="발주 입고",
+                memo=f"발주서 {po_number} 입고",
+                created_by=created_by,
+                transaction_date=transaction_date,
+                affects_current_stock=affects_current_stock,
+                checkpoint_id=checkpoint_id
+            ))
+
+            if affects_current_stock:
+                running_stock[item.product_code] = new_stock
+                stock_deltas[item.product_code] += quantity
+
+        db.add_all(transactions)
+
+        # 3-1. 제품 재고 (증감을 더하는 원자적 UPDATE)
+        if stock_deltas:
+            db.execute(
+                update(Product).where(
+                    Product.product_code.in_(list(stock_deltas.keys()))
+                ).values(
+                    current_stock=Product.current_stock + case(dict(stock_deltas), value=Product.product_code, else_=0)
+                ).execution_options(synchronize_session=False)
+            )
+
+        # 3-2. 항목 입고 수량 및 상태
+        item_delta = case(
+            {item_id: qty for item_id, qty in quantities.items()},
+            value=PurchaseOrderItem.id,
+            else_=0
+        )
+        new_received = PurchaseOrderItem.received_quantity + item_delta
+        db.execute(
+            update(PurchaseOrderItem).where(
+                PurchaseOrderItem.id.in_(list(quantities.keys()))
+            ).values(
+                received_quantity=new_received,
+                status=case(
+                    (new_received >= PurchaseOrderItem.ordered_quantity, 'received'),
+                    (new_received > 0, 'partial'),
+                    else_=PurchaseOrderItem.status
+                )
+            ).execution_options(synchronize_session=False)
+        )
+
+        # 3-3. 발주서 상태 (항목 상태 기준으로 재계산)
+        po_ids = list({item.po_id for item, _, _ in rows})
+        not_received = exists().where(and_(
+            PurchaseOrderItem.po_id == PurchaseOrder.id,
+            PurchaseOrderItem.status != 'received'
+        ))
+        any_received = exists().where(and_(
+            PurchaseOrderItem.po_id == PurchaseOrder.id,
+            PurchaseOrderItem.status.in_(['partial', 'received'])
+        ))
+        db.execute(
+            update(PurchaseOrder).where(
+                PurchaseOrder.id.in_(po_ids)
+            ).values(
+                status=case(
+                    (not_(not_received), 'completed'),
+                    (any_received, 'partial'),
+                    else_=PurchaseOrder.status
+                )
+            ).execution_options(synchronize_session=False)
+        )
+
+        # 3-4. 미입고 발주 수량
+        PurchaseOrderService.refresh_on_order_qty(db, product_codes)
+
+        db.commit()
+
+        orders = db.query(PurchaseOrder.id, PurchaseOrder.po_number, PurchaseOrder.status).filter(
+            PurchaseOrder.id.in_(po_ids)
+        ).order_by(PurchaseOrder.po_number).all()
+
+        return {
+            "message": "입고 처리가 완료되었습니다",
+            "received_items": len(rows),
+            "transactions_created": len(transactions),
+            "purchase_orders": [
+                {"id": str(o.id), "po_number": o.po_number, "status": o.status}
+                for o in orders
+            ]
+        }
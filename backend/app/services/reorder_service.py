@@ -0,0 +1,162 @@
+"""
+Reorder Service Layer
+전체 활성 제품의 발주 필요 수량 계산 및 공급업체별 발주서 초안 생성
+
+예상 재고 = 현재 재고 + 미입고 발주 수량 - 리드타임 동안의 예상 출고량
+예상 재고가 안전 재고보다 적으면 부족분을 MOQ 배수로 올림하여 발주 제안
+"""
+from typing import List, Optional
+from collections import OrderedDict
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import Numeric, and_, cast, func, literal, select
+
+from app.models.product import Product
+from app.models.transaction import Transaction
+from app.core.timezone_utils import get_current_utc_time
+
+# 일평균 출고량 계산 기간 (안전재고 자동 계산과 동일한 90일)
+DEFAULT_DEMAND_DAYS = 90
+
+# 공급업체가 없는 제품의 발주서 초안 공급업체명
+UNKNOWN_SUPPLIER = '미지정'
+
+
+def round_up_to_moq(shortfall, moq):
+    """부족 수량을 MOQ 배수로 올림하는 식 (부족 130, MOQ 100 → 200)"""
+    return func.ceil(cast(shortfall, Numeric) / moq) * moq
+
+
+class ReorderService:
+    """Reorder suggestion business logic service"""
+
+    @staticmethod
+    def build_suggestion_query(
+        demand_days: int = DEFAULT_DEMAND_DAYS,
+        supplier: Optional[str] = None,
+        category: Optional[str] = None
+    ):
+        """
+        발주 제안 쿼리 생성 (전체 제품을 한 번의 쿼리로 계산)
+
+        출고 집계만 GROUP BY 한 뒤 제품과 조인 (미입고 발주 수량은 products.on_order_qty 사용)
+        """
+        since = get_current_utc_time() - timedelta(days=demand_days)
+
+        demand = select(
+            Transaction.product_code.label('product_code'),
+            (func.sum(Transaction.quantity) / float(demand_days)).label('daily_demand')
+        ).where(
+            and_(
+                Transaction.transaction_type == 'OUT',
+                Transaction.transaction_date >= since
+            )
+        ).group_by(Transaction.product_code).subquery('demand')
+
+        current_stock = func.coalesce(Product.current_stock, 0)
+        safety_stock = func.coalesce(Product.safety_stock, 0)
+        lead_time = func.coalesce(Product.lead_time_days, 7)
+        moq = func.greatest(func.coalesce(Product.moq, 1), 1)
+        daily_demand = func.coalesce(demand.c.daily_demand, 0)
+        open_qty = func.coalesce(Product.on_order_qty, 0)
+
+        lead_time_demand = func.ceil(daily_demand * lead_time)
+        projected = current_stock + open_qty - lead_time_demand
+        suggested = round_up_to_moq(safety_stock - projected, moq)
+
+        query = select(
+            Product.product_code,
+            Product.product_name,
+            func.coalesce(Product.supplier, literal('')).label('supplier'),
+            Product.supplier_email,
+            Product.purchase_price,
+            Product.purchase_currency,
+            current_stock.label('current_stock'),
+            safety_stock.label('safety_stock'),
+            open_qty.label('open_po_quantity'),
+            func.round(daily_demand, 2).label('daily_demand'),
+            lead_time.label('lead_time_days'),
+            lead_time_demand.label('lead_time_demand'),
+            projected.label('projected_stock'),
+            moq.label('moq'),
+            suggested.label('suggested_quantity')
+        ).select_from(Product).outerjoin(
+            demand, demand.c.product_code == Product.product_code
+        ).where(
+            and_(
+                Product.is_active == True,
+                projected < safety_stock
+            )
+        )
+
+        if supplier:
+            query = query.where(Product.supplier == supplier)
+        if category:
+            query = query.where(Product.category == category)
+
+        return query.order_by(Product.supplier, Product.product_code)
+
+    @staticmethod
+    def get_suggestions(
+        db: Session,
+        demand_days: int = DEFAULT_DEMAND_DAYS,
+        supplier: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> List[dict]:
+        """발주가 필요한 제품 목록"""
+        rows = db.execute(
+            ReorderService.build_suggestion_query(demand_days, supplier, category)
+        ).all()
+
+        return [
+            {
+                "product_code": row.product_code,
+                "product_name": row.product_name,
+                "supplier": row.supplier,
+                "supplier_email": row.supplier_email,
+                "unit_price": float(row.purchase_price or 0),
+                "currency": row.purchase_currency or "KRW",
+                "current_stock": int(row.current_stock),
+                "safety_stock": int(row.safety_stock),
+                "open_po_quantity": int(row.open_po_quantity),
+                "daily_demand": float(row.daily_demand),
+                "lead_time_days": int(row.lead_time_days),
+                "lead_time_demand": int(row.lead_time_demand),
+                "projected_stock": int(row.projected_stock),
+                "moq": int(row.moq),
+                "suggested_quantity": int(row.suggested_quantity)
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def group_by_supplier(suggestions: List[dict], today: Optional[date] = None) -> List[dict]:
+        """
+        공급업체별 발주서 초안 생성
+
+        반환 형식은 발주서 생성 API(PurchaseOrderCreate)와 동일
+        입고 예정일은 그룹 내 가장 긴 리드타임 기준
+        """
+        today = today or date.today()
+        groups: "OrderedDict[str, List[dict]]" = OrderedDict()
+        for suggestion in suggestions:
+            groups.setdefault(suggestion["supplier"] or UNKNOWN_SUPPLIER, []).append(suggestion)
+
+        drafts = []
+        for supplier, items in groups.items():
+            max_lead_time = max(item["lead_time_days"] for item in items)
+            drafts.append({
+                "supplier": supplier,
+                "expected_date": (today + timedelta(days=max_lead_time)).isoformat(),
+                "notes": "발주 제안으로 생성된 초안",
+                "items": [
+                    {
+                        "product_code": item["product_code"],
+                        "ordered_quantity": item["suggested_quantity"],
+                        "unit_price": item["unit_price"]
+                    }
+                    for item in items
+                ],
+                "total_amount": sum(item["suggested_quantity"] * item["unit_price"] for item in items)
+            })
+        return drafts
@@ -0,0 +1,253 @@
+"""
+Sales Fact Service Layer
+일별 판매/폐기 집계 테이블(sales_daily_fact) 적재 및 조회
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, case, select, insert, delete, text
+
+from app.models.product import Product
+from app.models.transaction import Transaction
+from app.models.sales_daily_fact import SalesDailyFact
+from app.core.timezone_utils import day_range_bounds
+
+# 집계 대상 거래 유형
+FACT_TRANSACTION_TYPES = ('OUT', 'DISPOSAL')
+
+# 원화 환산 환율 (대시보드와 동일 기준)
+USD_TO_KRW = 1300
+
+# 재적재 시 한 번에 처리할 최대 일수 (긴 기간은 나누어 커밋)
+REBUILD_CHUNK_DAYS = 31
+
+# 야간 증분 적재가 어제와 함께 다시 집계하는 직전 일수
+REFRESH_LOOKBACK_DAYS = 3
+
+
+class SalesFactService:
+    """Sales daily fact business logic service"""
+
+    @staticmethod
+    def build_fact_select(
+        start_date: date,
+        end_date: date,
+        transaction_types: Tuple[str, ...] = FACT_TRANSACTION_TYPES
+    ):
+        """
+        기간 내 거래를 (날짜, 제품, 거래유형) 단위로 집계하는 SELECT 생성
+
+        매출 집계의 유일한 정의 (집계 테이블 적재와 원본 거래 기준 매출 분석이 함께 사용)
+        - 날짜: transaction_date의 KST 날짜 (DB 세션 시간대 Asia/Seoul)
+        - 금액: 원화 환산
+        transaction_date에 대해 범위 조건을 사용하므로 인덱스를 탈 수 있음
+        """
+        range_start, range_end = day_range_bounds(start_date, end_date)
+        fact_date = func.date(Transaction.transaction_date)
+
+        sale_rate = case((Product.sale_currency == 'USD', USD_TO_KRW), else_=1)
+        purchase_rate = case((Product.purchase_currency == 'USD', USD_TO_KRW), else_=1)
+
+        return select(
+            fact_date.label('fact_date'),
+            Product.product_code.label('product_code'),
+            Transaction.transaction_type.label('transaction_type'),
+            Product.category.label('category'),
+            func.coalesce(func.sum(Transaction.quantity), 0).label('quantity'),
+            func.count(Transaction.id).label('transaction_count'),
+            func.coalesce(
+                func.sum(Transaction.quantity * func.coalesce(Product.sale_price, 0) * sale_rate), 0
+            ).label('revenue_krw'),
+            func.coalesce(
+                func.sum(Transaction.quantity * func.coalesce(Product.purchase_price, 0) * purchase_rate), 0
+            ).label('cost_krw'),
+        ).select_from(Transaction).join(
+            Product, Transaction.product_code == Product.product_code
+        ).where(
+            and_(
+                Transaction.transaction_type.in_(transaction_types),
+                Transaction.transaction_date >= range_start,
+                Transaction.transaction_date < range_end
+            )
+        ).group_by(
+            fact_date,
+            Product.product_code,
+            Product.category,
+            Transaction.transaction_type
+        )
+
+    @staticmethod
+    def lock_facts(db: Session):
+        """
+        집계 테이블 재적재 직렬화 (트랜잭션 종료 시 해제되는 advisory lock)
+
+        동시에 같은 날짜를 삭제 후 적재하면 기본키 충돌이 나므로 재적재마다 먼저 잠금
+        (잠금 이후 문장은 새 스냅샷을 보므로 먼저 커밋된 적재 결과도 삭제 후 다시 적재)
+        """
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext('sales_daily_fact'))"))
+
+    @staticmethod
+    def rebuild_range(db: Session, start_date: date, end_date: date, commit: bool = True) -> dict:
+        """
+        기간 내 집계 데이터를 삭제 후 원본 거래에서 다시 적재
+
+        긴 기간은 REBUILD_CHUNK_DAYS 단위로 나누어 커밋하므로
+        전체 이력 재적재도 하나의 거대한 트랜잭션이 되지 않음
+        commit=False이면 커밋하지 않음 (거래 등록과 같은 트랜잭션으로 반영)
+        """
+        if start_date > end_date:
+            raise ValueError("시작 날짜가 종료 날짜보다 늦을 수 없습니다")
+
+        columns = [
+            'fact_date', 'product_code', 'transaction_type', 'category',
+            'quantity', 'transaction_count', 'revenue_krw', 'cost_krw'
+        ]
+
+        rows_written = 0
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            chunk_end = min(chunk_start + timedelta(days=REBUILD_CHUNK_DAYS - 1), end_date)
+
+            SalesFactService.lock_facts(db)
+            db.execute(
+                delete(SalesDailyFact).where(
+                    and_(
+                        SalesDailyFact.fact_date >= chunk_start,
+                        SalesDailyFact.fact_date <= chunk_end
+                    )
+                )
+            )
+            result = db.execute(
+                insert(SalesDailyFact).from_select(
+                    columns,
+                    SalesFactService.build_fact_select(chunk_start, chunk_end)
+                )
+            )
+            if commit:
+                db.commit()
+
+            rows_written += result.rowcount or 0
+            chunk_start = chunk_end + timedelta(days=1)
+
+        return {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "rows_written": rows_written
+        }
+
+    @staticmethod
+    def refresh_backdated(db: Session, fact_dates: Iterable[date], today: Optional[date] = None) -> Optional[dict]:
+        """
+        야간 증분 적재 범위보다 오래된 날짜의 거래가 등록되었을 때 해당 기간 재적재 (commit은 호출자가 수행)
+
+        오늘 - REFRESH_LOOKBACK_DAYS 이후 날짜는 이후 야간 적재가 다시 집계하므로 건너뜀
+        """
+        today = today or date.today()
+        backdated = [d for d in fact_dates if d < today - timedelta(days=REFRESH_LOOKBACK_DAYS)]
+        if not backdated:
+            return None
+        return SalesFactService.rebuild_range(db, min(backdated), max(backdated), commit=False)
+
+    @staticmethod
+    def refresh_recent(db: Session, target_date: date, lookback_days: int = REFRESH_LOOKBACK_DAYS) -> dict:
+        """
+        target_date 및 직전 lookback_days일 재적재 (야간 스케줄러용 증분 적재)
+
+        뒤늦게 입력된 과거 거래도 반영되도록 최근 며칠을 함께 다시 집계
+        """
+        return SalesFactService.rebuild_range(
+            db, target_date - timedelta(days=lookback_days), target_date
+        )
+
+    @staticmethod
+    def get_daily_rows(
+        db: Session,
+        start_date: date,
+        end_date: date,
+        transaction_type: str = 'OUT',
+        product_code: Optional[str] = None
+    ) -> List[SalesDailyFact]:
+        """기간 내 집계 행 조회"""
+        query = db.query(SalesDailyFact).filter(
+            and_(
+                SalesDailyFact.transaction_type == transaction_type,
+                SalesDailyFact.fact_date >= start_date,
+                SalesDailyFact.fact_date <= end_date
+            )
+        )
+
+        if product_code:
+            query = query.filter(SalesDailyFact.product_code == product_code)
+
+        return query.all()
+
+    @staticmethod
+    def get_period_totals(
+        db: Session,
+        start_date: date,
+        end_date: date,
+        transaction_type: str = 'OUT'
+    ) -> Dict[str, float]:
+        """기간 합계 (수량, 건수, 금액) 조회"""
+        row = db.query(
+            func.coalesce(func.sum(SalesDailyFact.quantity), 0).label('quantity'),
+            func.coalesce(func.sum(SalesDailyFact.transaction_count), 0).label('transaction_count'),
+            func.coalesce(func.sum(SalesDailyFact.revenue_krw), 0).label('revenue_krw'),
+            func.coalesce(func.sum(SalesDailyFact.cost_krw), 0).label('cost_krw')
+        ).filter(
+            and_(
+                SalesDailyFact.transaction_type == transaction_type,
+                SalesDailyFact.fact_date >= start_date,
+                SalesDailyFact.fact_date <= end_date
+            )
+        ).first()
+
+        return {
+            "quantity": int(row.quantity or 0),
+            "transaction_count": int(row.transaction_count or 0),
+            "revenue_krw": float(row.revenue_krw or 0),
+            "cost_krw": float(row.cost_krw or 0)
+        }
+
+    @staticmethod
+    def get_year_over_year(db: Session, start_date: date, end_date: date) -> dict:
+        """
+        기간 매출과 전년 동기간 매출 비교
+
+        두 번의 합계 쿼리만 사용하므로 대시보드에서 매 요청마다 호출 가능
+        """
+        previous_start = SalesFactService._shift_year(start_date, -1)
+        previous_end = SalesFactService._shift_year(end_date, -1)
+
+        current = SalesFactService.get_period_totals(db, start_date, end_date)
+        previous = SalesFactService.get_period_totals(db, previous_start, previous_end)
+
+        def growth(curr: float, prev: float) -> Optional[float]:
+            if not prev:
+                return None
+            return round((curr - prev) / prev * 100, 1)
+
+        return {
+            "current": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                **current
+            },
+            "previous": {
+                "start_date": previous_start.isoformat(),
+                "end_date": previous_end.isoformat(),
+                **previous
+            },
+            "revenue_growth_rate": growth(current["revenue_krw"], previous["revenue_krw"]),
+            "quantity_growth_rate": growth(current["quantity"], previous["quantity"])
+        }
+
+    @staticmethod
+    def _shift_year(value: date, years: int) -> date:
+        """연도 이동 (2월 29일은 2월 28일로 보정)"""
+        try:
+            return value.replace(year=value.year + years)
+        except ValueError:
+            return value.replace(year=value.year + years, day=28)
@@ -0,0 +1,386 @@
+"""
+Stock Query Service Layer
+특정 시점(날짜 종료 시각) 기준 재고 조회
+
+현재 재고에서 거꾸로 모든 거래를 되돌리는 대신,
+대상 날짜 이전의 가장 가까운 기준점(일일 수불부 기말재고 또는 체크포인트 확정재고)에서
+기준점 ~ 대상 날짜 사이의 거래 증감만 더하여 계산
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator, List, Optional
+from uuid import UUID
+from datetime import date, datetime, time, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, case, desc, text
+
+from app.models.product import Product
+from app.models.transaction import Transaction
+from app.models.daily_ledger import DailyLedger
+from app.models.stock_checkpoint import StockCheckpoint
+from app.core.config import settings
+from app.core.timezone_utils import ensure_kst
+
+# 기준점 유형
+ANCHOR_DAILY_LEDGER = "DAILY_LEDGER"
+ANCHOR_CHECKPOINT = "CHECKPOINT"
+ANCHOR_CURRENT_STOCK = "CURRENT_STOCK"
+
+# 스냅샷 출력 컬럼 순서
+SNAPSHOT_COLUMNS = [
+    "target_date", "product_code", "product_name", "quantity", "anchor_type", "anchor_date"
+]
+
+
+def signed_quantity():
+    """
+    거래 유형별 재고 증감 수량 식
+
+    - IN / return: +quantity
+    - OUT: -quantity
+    - ADJUST / adjustment: quantity (조정량이 부호를 가짐)
+    - DISPOSAL 등 기타: 0 (재고에 영향 없음)
+    """
+    return case(
+        (Transaction.transaction_type.in_(('IN', 'return')), Transaction.quantity),
+        (Transaction.transaction_type == 'OUT', -Transaction.quantity),
+        (Transaction.transaction_type.in_(('ADJUST', 'adjustment')), Transaction.quantity),
+        else_=0
+    )
+
+
+# signed_quantity()와 동일한 규칙의 SQL 식 (별칭 tr 기준)
+SIGNED_QUANTITY_SQL = """
+    CASE
+        WHEN tr.transaction_type IN ('IN', 'return') THEN tr.quantity
+        WHEN tr.transaction_type = 'OUT' THEN -tr.quantity
+        WHEN tr.transaction_type IN ('ADJUST', 'adjustment') THEN tr.quantity
+        ELSE 0
+    END
+"""
+
+# 여러 날짜 × 여러 제품의 시점 재고를 한 번에 계산하는 쿼리
+# 1. anchors: 날짜·제품별 가장 최근 수불부/체크포인트를 각각 LATERAL ... LIMIT 1로 구해
+#    더 늦은 쪽 선택 (같은 시각이면 체크포인트 우선, 020 마이그레이션 인덱스 사용)
+# 2. deltas: 기준점 이후 ~ 대상 날짜 종료까지 거래 증감 (GROUP BY)
+# 3. reversals: 기준점이 없는 제품은 현재 재고에서 이후 거래를 되돌림
+STOCK_SNAPSHOT_SQL = """
+WITH targets AS (
+    SELECT DISTINCT unnest(CAST(:target_dates AS date[])) AS target_date
+),
+prods AS (
+    SELECT p.product_code, p.product_name, p.current_stock
+    FROM {schema}.products p
+    WHERE {product_filter}
+),
+anchor_candidates AS (
+    SELECT t.target_date, p.product_code,
+           l.anchor_time AS ledger_time, l.stock AS ledger_stock,
+           c.anchor_time AS checkpoint_time, c.stock AS checkpoint_stock
+    FROM targets t
+    CROSS JOIN prods p
+    LEFT JOIN LATERAL (
+        SELECT CAST(dl.ledger_date + TIME '23:59:59.999999' AS timestamptz) AS anchor_time,
+               dl.ending_stock AS stock
+        FROM {schema}.daily_ledgers dl
+        WHERE dl.product_code = p.product_code
+          AND dl.ledger_date <= t.target_date
+        ORDER BY dl.ledger_date DESC
+        LIMIT 1
+    ) l ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT CAST(sc.checkpoint_date AS timestamptz) AS anchor_time,
+               sc.confirmed_stock AS stock
+        FROM {schema}.stock_checkpoints sc
+        WHERE sc.product_code = p.product_code
+          AND sc.is_active = TRUE
+          AND sc.checkpoint_date < t.target_date + 1
+        ORDER BY sc.checkpoint_date DESC
+        LIMIT 1
+    ) c ON TRUE
+    WHERE l.anchor_time IS NOT NULL OR c.anchor_time IS NOT NULL
+),
+anchors AS (
+    SELECT target_date, product_code,
+           CASE WHEN use_checkpoint THEN checkpoint_time ELSE ledger_time END AS anchor_time,
+           CASE WHEN use_checkpoint THEN checkpoint_stock ELSE ledger_stock END AS stock,
+           CASE WHEN use_checkpoint THEN 'CHECKPOINT' ELSE 'DAILY_LEDGER' END AS anchor_type
+    FROM (
+        SELECT *,
+               COALESCE(checkpoint_time >= ledger_time, ledger_time IS NULL) AS use_checkpoint
+        FROM anchor_candidates
+    ) candidates
+),
+deltas AS (
+    SELECT a.target_date, a.product_code, SUM({signed}) AS delta
+    FROM anchors a
+    JOIN {schema}.transactions tr
+      ON tr.product_code = a.product_code
+     AND tr.transaction_date > a.anchor_time
+     AND tr.transaction_date < a.target_date + 1
+    GROUP BY a.target_date, a.product_code
+),
+reversals AS (
+    SELECT t.target_date, tr.product_code, SUM({signed}) AS delta
+    FROM targets t
+    JOIN {schema}.transactions tr
+      ON tr.transaction_date >= t.target_date + 1
+     AND tr.affects_current_stock = TRUE
+    JOIN prods p ON p.product_code = tr.product_code
+    WHERE NOT EXISTS (
+        SELECT 1 FROM anchors a
+        WHERE a.target_date = t.target_date AND a.product_code = tr.product_code
+    )
+    GROUP BY t.target_date, tr.product_code
+)
+SELECT t.target_date,
+       p.product_code,
+       p.product_name,
+       CASE
+           WHEN a.product_code IS NOT NULL THEN a.stock + COALESCE(d.delta, 0)
+           ELSE COALESCE(p.current_stock, 0) - COALESCE(r.delta, 0)
+       END AS quantity,
+       COALESCE(a.anchor_type, 'CURRENT_STOCK') AS anchor_type,
+       a.anchor_time AS anchor_date
+FROM targets t
+CROSS JOIN prods p
+LEFT JOIN anchors a ON a.target_date = t.target_date AND a.product_code = p.product_code
+LEFT JOIN deltas d ON d.target_date = t.target_date AND d.product_code = p.product_code
+LEFT JOIN reversals r ON r.target_date = t.target_date AND r.product_code = p.product_code
+ORDER BY t.target_date, p.product_code
+"""
+
+
+def end_of_day(target_date: date) -> datetime:
+    """대상 날짜의 종료 시각 (KST)"""
+    return ensure_kst(datetime.combine(target_date, time.max))
+
+
+def _snapshot_value(value):
+    """CSV/JSON 직렬화용 값 변환"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def format_snapshot_stream(rows: Iterable[dict], output_format: str = "csv") -> Iterator[str]:
+    """
+    스냅샷 행을 CSV 또는 JSON 배열 문자열 조각으로 변환
+
+    행을 하나씩 직렬화하므로 API 응답과 CLI 파일 출력 모두에서 스트리밍 가능
+    """
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(SNAPSHOT_COLUMNS)
+        for row in rows:
+            writer.writerow([_snapshot_value(row[col]) for col in SNAPSHOT_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        yield buffer.getvalue()
+        return
+
+    yield "["
+    first = True
+    for row in rows:
+        item = {col: _snapshot_value(row[col]) for col in SNAPSHOT_COLUMNS}
+        yield ("" if first else ",") + json.dumps(item, ensure_ascii=False)
+        first = False
+    yield "]"
+
+
+class StockQueryService:
+    """Point-in-time stock query service"""
+
+    @staticmethod
+    def get_stock_delta(
+        db: Session,
+        product_code: str,
+        after: datetime,
+        until: datetime
+    ) -> int:
+        """(after, until] 구간 거래의 재고 증감 합계"""
+        delta = db.query(
+            func.coalesce(func.sum(signed_quantity()), 0)
+        ).filter(
+            and_(
+                Transaction.product_code == product_code,
+                Transaction.transaction_date > after,
+                Transaction.transaction_date <= until
+            )
+        ).scalar()
+
+        return int(delta or 0)
+
+    @staticmethod
+    def find_anchor(db: Session, product_code: str, target_date: date) -> Optional[dict]:
+        """
+        대상 날짜 종료 시각 이전의 가장 최근 기준점 조회
+
+        일일 수불부(해당 날짜 종료 시점의 기말재고)와 활성 체크포인트 중
+        더 늦은 시점의 것을 기준점으로 사용
+        """
+        until = end_of_day(target_date)
+
+        ledger = db.query(DailyLedger).filter(
+            and_(
+                DailyLedger.product_code == product_code,
+                DailyLedger.ledger_date <= target_date
+            )
+        ).order_by(desc(DailyLedger.ledger_date)).first()
+
+        checkpoint = db.query(StockCheckpoint).filter(
+            and_(
+                StockCheckpoint.product_code == product_code,
+                StockCheckpoint.is_active == True,
+                StockCheckpoint.checkpoint_date <= until
+            )
+        ).order_by(desc(StockCheckpoint.checkpoint_date)).first()
+
+        candidates = []
+        if ledger:
+            candidates.append({
+                "anchor_type": ANCHOR_DAILY_LEDGER,
+                "anchor_time": end_of_day(ledger.ledger_date),
+                "stock": ledger.ending_stock
+            })
+        if checkpoint:
+            candidates.append({
+                "anchor_type": ANCHOR_CHECKPOINT,
+                "anchor_time": ensure_kst(checkpoint.checkpoint_date),
+                "stock": checkpoint.confirmed_stock
+            })
+
+        if not candidates:
+            return None
+
+        # 같은 시각이면 체크포인트(확정 재고)를 우선
+        return max(
+            candidates,
+            key=lambda c: (c["anchor_time"], c["anchor_type"] == ANCHOR_CHECKPOINT)
+        )
+
+    @staticmethod
+    def get_stock_as_of(db: Session, product: Product, target_date: date) -> dict:
+        """
+        대상 날짜 종료 시점의 재고 계산
+
+        기준점이 있으면 기준점 이후 ~ 대상 날짜까지의 거래만 집계하므로
+        조회 비용이 조회 날짜의 과거 정도와 무관함
+        기준점이 전혀 없는 경우에만 현재 재고에서 역산
+        """
+        until = end_of_day(target_date)
+        anchor = StockQueryService.find_anchor(db, product.product_code, target_date)
+
+        if anchor:
+            delta = StockQueryService.get_stock_delta(
+                db, product.product_code, anchor["anchor_time"], until
+            )
+            return {
+                "quantity": anchor["stock"] + delta,
+                "anchor_type": anchor["anchor_type"],
+                "anchor_date": anchor["anchor_time"],
+                "delta": delta
+            }
+
+        # 기준점이 없으면 현재 재고에 반영된 이후 거래를 되돌림
+        reverse_delta = db.query(
+            func.coalesce(func.sum(signed_quantity()), 0)
+        ).filter(
+            and_(
+                Transaction.product_code == product.product_code,
+                Transaction.transaction_date > until,
+                Transaction.affects_current_stock == True
+            )
+        ).scalar()
+        reverse_delta = int(reverse_delta or 0)
+
+        return {
+            "quantity": (product.current_stock or 0) - reverse_delta,
+            "anchor_type": ANCHOR_CURRENT_STOCK,
+            "anchor_date": None,
+            "delta": -reverse_delta
+        }
+
+    @staticmethod
+    def get_day_transactions(db: Session, product_code: str, target_date: date):
+        """대상 날짜(KST)의 거래 목록"""
+        day_start = ensure_kst(datetime.combine(target_date, time.min))
+        day_end = day_start + timedelta(days=1)
+
+        return db.query(Transaction).filter(
+            and_(
+                Transaction.product_code == product_code,
+                Transaction.transaction_date >= day_start,
+                Transaction.transaction_date < day_end
+            )
+        ).order_by(Transaction.transaction_date).all()
+
+    @staticmethod
+    def build_snapshot_query(
+        target_dates: List[date],
+        product_codes: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        warehouse_id: Optional[UUID] = None,
+        is_active: Optional[bool] = True
+    ):
+        """전체(또는 필터된) 제품의 날짜별 시점 재고 쿼리와 파라미터 생성"""
+        conditions = ["1 = 1"]
+        params = {"target_dates": list(target_dates)}
+
+        if is_active is not None:
+            conditions.append("p.is_active = :is_active")
+            params["is_active"] = is_active
+        if category:
+            conditions.append("p.category = :category")
+            params["category"] = category
+        if warehouse_id:
+            conditions.append("p.warehouse_id = :warehouse_id")
+            params["warehouse_id"] = warehouse_id
+        if product_codes:
+            conditions.append("p.product_code = ANY(:product_codes)")
+            params["product_codes"] = list(product_codes)
+
+        sql = STOCK_SNAPSHOT_SQL.format(
+            schema=settings.DB_SCHEMA,
+            product_filter=" AND ".join(conditions),
+            signed=SIGNED_QUANTITY_SQL
+        )
+        return text(sql), params
+
+    @staticmethod
+    def iter_stock_snapshot(
+        db: Session,
+        target_dates: List[date],
+        product_codes: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        warehouse_id: Optional[UUID] = None,
+        is_active: Optional[bool] = True,
+        batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """
+        여러 날짜의 시점 재고를 한 번의 쿼리로 계산하여 행 단위로 반환
+
+        서버 측 커서로 batch_size 행씩 가져오므로 제품 수가 많아도 메모리 사용량이 일정함
+        """
+        query, params = StockQueryService.build_snapshot_query(
+            target_dates, product_codes, category, warehouse_id, is_active
+        )
+
+        result = db.execute(
+            query.execution_options(stream_results=True, yield_per=batch_size),
+            params
+        )
+
+        for partition in result.partitions(batch_size):
+            for row in partition:
+                yield {
+                    "target_date": row.target_date,
+                    "product_code": row.product_code,
+                    "product_name": row.product_name,
+                    "quantity": int(row.quantity or 0),
+                    "anchor_type": row.anchor_type,
+                    "anchor_date": row.anchor_date
+                }
@@ -1,17 +1,21 @@
 """
 Transaction Service Layer
 """
+import uuid
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, desc
+from sqlalchemy import func, and_, case, insert, update
 from fastapi import HTTPException, status
 
 from app.models.transaction import Transaction
 from app.models.product import Product
+from app.models.discrepancy import Discrepancy
 from app.models.stock_checkpoint import StockCheckpoint, CheckpointType
-from app.schemas.transaction import TransactionCreate
+from app.schemas.transaction import TransactionCreate, ScanSessionRequest, StockCountRequest
+from app.services.product_catalog_cache import product_catalog_cache
+from app.services.checkpoint_head_service import CheckpointHeadService
 from app.core.timezone_utils import get_current_utc_time, ensure_timezone_aware
 
 
@@ -41,19 +45,15 @@ class TransactionService:
         affects_current_stock = True
         checkpoint_id = None
 
-        # 해당 제품의 가장 최근 활성 체크포인트 조회
-        latest_checkpoint = db.query(StockCheckpoint).filter(
-            and_(
-                StockCheckpoint.product_code == transaction_create.product_code,
-                StockCheckpoint.is_active == True,
-                StockCheckpoint.checkpoint_date > transaction_date
-            )
-        ).order_by(desc(StockCheckpoint.checkpoint_date)).first()
+        # 거래 날짜 이후의 가장 최근 활성 체크포인트 (제품별 최신 체크포인트로 판단)
+        later_checkpoint_id = CheckpointHeadService.get_later_checkpoints(
+            db, [transaction_create.product_code], transaction_date
+        ).get(transaction_create.product_code)
 
-        if latest_checkpoint:
+        if later_checkpoint_id:
             # 체크포인트가 존재하고 거래 날짜가 체크포인트 이전인 경우
             affects_current_stock = False
-            checkpoint_id = latest_checkpoint.id
+            checkpoint_id = later_checkpoint_id
 
         # 현재 재고 확인
         previous_stock = product.current_stock
@@ -106,6 +106,7 @@ class TransactionService:
                     },
                     synchronize_session=False
                 )
+                CheckpointHeadService.refresh(db, [transaction_create.product_code])
         else:
             # 체크포인트 이전 거래는 재고에 영향을 주지 않음
             new_stock = previous_stock
@@ -191,6 +192,275 @@ class TransactionService:
                 detail=str(e)
             )
     
+    @staticmethod
+    def get_later_checkpoints(
+        db: Session,
+        product_codes: List[str],
+        transaction_date: datetime
+    ) -> dict:
+        """
+        거래 시각 이후의 활성 체크포인트를 제품별로 한 번에 조회
+
+        반환: {product_code: 가장 최근 체크포인트 id}
+        여기에 포함된 제품의 거래는 현재 재고에 반영하지 않음 (create_transaction과 동일 규칙)
+        """
+        return CheckpointHeadService.get_later_checkpoints(db, product_codes, transaction_date)
+
+    @staticmethod
+    def process_scan_session(
+        db: Session,
+        request: ScanSessionRequest,
+        created_by: str = "system"
+    ) -> dict:
+        """
+        바코드 스캔 묶음을 제품별로 합산하여 한 번의 커밋으로 반영
+
+        - 바코드는 메모리 바코드 인덱스로 해석 (스캔마다 DB 검색하지 않음)
+        - 제품당 거래 1건 생성
+        - 제품 행은 제품 코드 순서로 잠가 동시 세션 간 교착을 피함
+        - 하나라도 실패하면 전체 롤백
+        """
+        # 1. 스캔 → 제품 코드 해석 및 제품별 합산
+        totals = {}
+        unknown = []
+        for line in request.scans:
+            if line.product_code:
+                product_code = line.product_code
+            else:
+                cached = product_catalog_cache.get_by_barcode(db, line.barcode)
+                if not cached:
+                    unknown.append(line.barcode or "")
+                    continue
+                product_code = cached.product_code
+
+            entry = totals.setdefault(product_code, {"quantity": 0, "scan_count": 0})
+            entry["quantity"] += line.quantity
+            entry["scan_count"] += 1
+
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"등록되지 않은 바코드: {', '.join(sorted(set(unknown)))}"
+            )
+
+        # 2. 제품 행 잠금 (코드 순서)
+        product_codes = sorted(totals.keys())
+        products = db.query(Product).filter(
+            Product.product_code.in_(product_codes)
+        ).order_by(Product.product_code).with_for_update().all()
+        product_map = {p.product_code: p for p in products}
+
+        missing = [code for code in product_codes if code not in product_map]
+        if missing:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with code {', '.join(missing)} not found"
+            )
+
+        # 3. 거래 시각 이후의 활성 체크포인트 (있으면 현재 재고에 반영하지 않음)
+        transaction_date = get_current_utc_time()
+        future_checkpoints = TransactionService.get_later_checkpoints(db, product_codes, transaction_date)
+
+        # 4. 재고 계산 및 거래 생성
+        is_out = request.transaction_type == "OUT"
+        shortages = []
+        results = []
+        for product_code in product_codes:
+            product = product_map[product_code]
+            quantity = totals[product_code]["quantity"]
+            checkpoint_id = future_checkpoints.get(product_code)
+            affects_current_stock = checkpoint_id is None
+            previous_stock = product.current_stock or 0
+
+            if affects_current_stock:
+                if is_out and previous_stock < quantity:
+                    shortages.append(f"{product_code} (재고 {previous_stock}, 요청 {quantity})")
+                    continue
+                new_stock = previous_stock - quantity if is_out else previous_stock + quantity
+            else:
+                new_stock = previous_stock
+
+            db.add(Transaction(
+                transaction_type=request.transaction_type,
+                product_code=product_code,
+                quantity=quantity,
+                previous_stock=previous_stock,
+                new_stock=new_stock,
+                reason=request.reason,
+                memo=request.memo,
+                location=request.location,
+                created_by=request.created_by or created_by,
+                transaction_date=transaction_date,
+                affects_current_stock=affects_current_stock,
+                checkpoint_id=checkpoint_id
+            ))
+
+            if affects_current_stock:
+                product.current_stock = new_stock
+
+            results.append({
+                "product_code": product_code,
+                "product_name": product.product_name,
+                "scan_count": totals[product_code]["scan_count"],
+                "quantity": quantity,
+                "previous_stock": previous_stock,
+                "new_stock": new_stock
+            })
+
+        if shortages:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock: {', '.join(shortages)}"
+            )
+
+        # 자동 안전재고 계산 (출고시에만)
+        if is_out:
+            db.flush()
+            for product in products:
+                if product.is_auto_calculated:
+                    product.safety_stock = TransactionService.calculate_safety_stock(db, product.product_code)
+
+        db.commit()
+
+        return {
+            "success": True,
+            "transaction_type": request.transaction_type,
+            "total_scans": len(request.scans),
+            "results": results
+        }
+
+    @staticmethod
+    def process_stock_count(
+        db: Session,
+        request: StockCountRequest,
+        created_by: str = "system"
+    ) -> dict:
+        """
+        재고 실사 결과를 한 번의 커밋으로 반영
+
+        - 실사 제품을 코드 순서로 한 번에 잠그고 불일치를 메모리에서 계산
+        - 불일치는 모두 Discrepancy로 기록 (설명이 있으면 resolved)
+        - 설명이 있는 불일치만 ADJUST 거래 + ADJUST 체크포인트 생성 (create_transaction과 같은 규칙)
+        - 불일치/체크포인트/거래는 각각 다중 행 INSERT, 재고는 CASE UPDATE 한 번으로 반영
+        - 등록되지 않은 제품은 건너뜀
+        """
+        created_by = request.created_by or created_by
+
+        # 1. 제품별 실사 결과 (같은 제품이 여러 번 있으면 마지막 값) 및 제품 잠금
+        counts = {item.product_code: item for item in request.counts}
+        product_codes = sorted(counts.keys())
+        products = db.query(Product).filter(
+            Product.product_code.in_(product_codes)
+        ).order_by(Product.product_code).with_for_update().all()
+
+        # 2. 실사 시각 이후의 활성 체크포인트 (있으면 조정을 현재 재고에 반영하지 않음)
+        count_date = get_current_utc_time()
+        future_checkpoints = TransactionService.get_later_checkpoints(
+            db, [p.product_code for p in products], count_date
+        )
+
+        # 3. 불일치 계산
+        discrepancy_rows = []
+        checkpoint_rows = []
+        transaction_rows = []
+        new_stocks = {}
+        for product in products:
+            item = counts[product.product_code]
+            system_stock = product.current_stock or 0
+            difference = item.physical_stock - system_stock
+            if difference == 0:
+                continue
+
+            discrepancy_rows.append({
+                "product_code": product.product_code,
+                "system_stock": system_stock,
+                "physical_stock": item.physical_stock,
+                "discrepancy": difference,
+                "explanation": item.explanation,
+                "status": "resolved" if item.explanation else "pending",
+                "resolved_at": count_date if item.explanation else None,
+                "resolved_by": created_by if item.explanation else None
+            })
+
+            # 설명이 있는 불일치만 재고 조정
+            if not item.explanation:
+                continue
+
+            later_checkpoint_id = future_checkpoints.get(product.product_code)
+            affects_current_stock = later_checkpoint_id is None
+            if affects_current_stock:
+                checkpoint_rows.append({
+                    "id": uuid.uuid4(),
+                    "product_code": product.product_code,
+                    "checkpoint_date": count_date,
+                    "checkpoint_type": CheckpointType.ADJUST,
+                    "confirmed_stock": item.physical_stock,
+                    "reason": "Stock Count",
+                    "created_by": created_by,
+                    "is_active": True
+                })
+                new_stocks[product.product_code] = item.physical_stock
+
+            transaction_rows.append({
+                "transaction_type": "ADJUST",
+                "product_code": product.product_code,
+                "quantity": difference,
+                "previous_stock": system_stock,
+                "new_stock": item.physical_stock if affects_current_stock else system_stock,
+                "reason": "Stock Count",
+                "memo": item.explanation,
+                "location": product.zone_id,
+                "created_by": created_by,
+                "transaction_date": count_date,
+                "affects_current_stock": affects_current_stock,
+                "checkpoint_id": later_checkpoint_id
+            })
+
+        # 4. 일괄 반영
+        if discrepancy_rows:
+            db.execute(insert(Discrepancy), discrepancy_rows)
+
+        if checkpoint_rows:
+            db.execute(insert(StockCheckpoint), checkpoint_rows)
+
+            # 새 체크포인트 이전의 거래를 체크포인트로 묶음 (새 조정 거래보다 먼저 실행)
+            checkpoint_ids = {row["product_code"]: row["id"] for row in checkpoint_rows}
+            db.execute(
+                update(Transaction).where(
+                    and_(
+                        Transaction.product_code.in_(list(checkpoint_ids.keys())),
+                        Transaction.transaction_date <= count_date,
+                        Transaction.affects_current_stock == True
+                    )
+                ).values(
+                    affects_current_stock=False,
+                    checkpoint_id=case(checkpoint_ids, value=Transaction.product_code)
+                ).execution_options(synchronize_session=False)
+            )
+
+        if transaction_rows:
+            db.execute(insert(Transaction), transaction_rows)
+
+        if new_stocks:
+            db.execute(
+                update(Product).where(
+                    Product.product_code.in_(list(new_stocks.keys()))
+                ).values(
+                    current_stock=case(new_stocks, value=Product.product_code)
+                ).execution_options(synchronize_session=False)
+            )
+
+        CheckpointHeadService.refresh(db, [row["product_code"] for row in checkpoint_rows])
+        db.commit()
+
+        return {
+            "processed": len(transaction_rows),
+            "discrepancies": len(discrepancy_rows),
+            "skipped": len(product_codes) - len(products)
+        }
+
     @staticmethod
     def calculate_safety_stock(db: Session, product_code: str) -> int:
         """
@@ -0,0 +1,235 @@
+"""
+Transaction Stream Service Layer
+NDJSON 스트림 거래 등록 (채널 주문 동기화)
+
+요청 본문 전체를 한 번에 파싱/검증하지 않고
+- 본문을 줄 단위로 읽어 한 줄씩 검증 (메모리 사용량이 본문 크기와 무관)
+- batch_size 줄마다 BatchTransactionService.apply로 반영하고 커밋
+- external_id는 묶음마다 IN 쿼리 한 번으로 기존 거래와 비교 (동시 요청은 고유 인덱스로 한 번만 반영)
+- 묶음을 반영할 때마다 줄별 결과를 NDJSON으로 바로 내려보냄
+"""
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.models.transaction import Transaction
+from app.schemas.transaction import StreamTransactionLine, StreamLineResult
+from app.services.batch_transaction_service import BatchTransactionService
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 반영(커밋)할 기본 줄 수
+DEFAULT_STREAM_BATCH_SIZE = 500
+
+# 한 줄의 최대 크기 (넘는 줄은 버리고 실패로 보고)
+MAX_LINE_BYTES = 64 * 1024
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    바이트 청크를 줄 단위로 (줄 번호, 줄) 반환
+
+    줄 번호는 1부터 (빈 줄도 번호는 셈), 빈 줄은 건너뜀
+    max_line_bytes를 넘는 줄은 내용을 버리고 None으로 반환
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+
+    async for chunk in chunks:
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+
+        for line in lines:
+            line_number += 1
+            if oversized:
+                oversized = False
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+
+        # 줄바꿈 없이 너무 길어지면 다음 줄바꿈까지 버림
+        if len(buffer) > max_line_bytes:
+            buffer = b""
+            oversized = True
+
+    if oversized:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, buffer
+
+
+def parse_line(
+    line_number: int,
+    raw: Optional[bytes]
+) -> Tuple[Optional[StreamTransactionLine], Optional[dict]]:
+    """
+    한 줄을 거래로 검증
+
+    Returns:
+        (거래, None) 또는 (None, 실패 결과)
+    """
+    if raw is None:
+        return None, {
+            "line": line_number,
+            "status": "failed",
+            "error": f"줄이 너무 깁니다 (최대 {MAX_LINE_BYTES}바이트)"
+        }
+
+    try:
+        return StreamTransactionLine.model_validate_json(raw), None
+    except ValidationError as e:
+        # 채널에서 결과를 대조할 수 있도록 external_id는 가능하면 함께 반환
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = None
+        external_id = data.get("external_id") if isinstance(data, dict) else None
+
+        return None, {
+            "line": line_number,
+            "external_id": external_id if isinstance(external_id, str) else None,
+            "status": "failed",
+            "error": "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc']) or '줄'}: {err['msg']}" for err in e.errors()
+            )
+        }
+
+
+class TransactionStreamService:
+    """Transaction stream business logic service"""
+
+    @staticmethod
+    def find_existing_external_ids(db: Session, external_ids: set) -> set:
+        """이미 등록된 external_id"""
+        if not external_ids:
+            return set()
+        return {
+            external_id for (external_id,) in db.query(Transaction.external_id).filter(
+                Transaction.external_id.in_(external_ids)
+            ).all()
+        }
+
+    @staticmethod
+    def apply_batch(
+        db: Session,
+        lines: List[Tuple[int, StreamTransactionLine]],
+        created_by: str
+    ) -> List[dict]:
+        """
+        (줄 번호, 거래) 묶음을 반영하고 커밋
+
+        이미 등록된 external_id와 묶음 안에서 반복된 external_id는 duplicate로 건너뜀
+        다른 요청이 같은 external_id를 먼저 커밋해 고유 인덱스 위반이 나면 한 번 다시 확인 후 반영
+
+        Returns:
+            줄 번호 순서의 줄별 결과
+        """
+        for attempt in range(2):
+            results: Dict[int, dict] = {}
+            seen = TransactionStreamService.find_existing_external_ids(
+                db, {line.external_id for _, line in lines if line.external_id}
+            )
+
+            to_apply = []
+            for line_number, line in lines:
+                if line.external_id and line.external_id in seen:
+                    results[line_number] = {
+                        "line": line_number,
+                        "external_id": line.external_id,
+                        "status": "duplicate"
+                    }
+                    continue
+                if line.external_id:
+                    seen.add(line.external_id)
+                to_apply.append((line_number, line))
+
+            try:
+                _, _, errors = BatchTransactionService.apply(db, to_apply, created_by=created_by)
+            except IntegrityError as e:
+                db.rollback()
+                if attempt == 0:
+                    continue
+                logger.error(f"스트림 거래 반영 실패: {e}")
+                errors = [{"row": line_number, "error": "중복 확인 중 충돌이 반복되었습니다"} for line_number, _ in to_apply]
+
+            error_map = {error["row"]: error["error"] for error in errors}
+            for line_number, line in to_apply:
+                if line_number in error_map:
+                    results[line_number] = {
+                        "line": line_number,
+                        "external_id": line.external_id,
+                        "status": "failed",
+                        "error": error_map[line_number]
+                    }
+                else:
+                    results[line_number] = {
+                        "line": line_number,
+                        "external_id": line.external_id,
+                        "status": "created"
+                    }
+            break
+
+        return [results[line_number] for line_number, _ in lines]
+
+    @staticmethod
+    async def stream_results(
+        chunks: AsyncIterator[bytes],
+        batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+        created_by: str = "channel_stream"
+    ) -> AsyncIterator[str]:
+        """
+        NDJSON 본문을 읽으며 batch_size 줄마다 반영하고 줄별 결과를 NDJSON으로 반환
+
+        마지막 줄은 {"done": true, "created": .., "duplicate": .., "failed": ..} 요약
+        응답을 내려보내는 동안 사용할 세션을 직접 열고 닫음 (요청 의존성 세션은 응답 전에 닫힘)
+        """
+        counts = {"created": 0, "duplicate": 0, "failed": 0}
+        pending: List[Tuple[int, StreamTransactionLine]] = []
+        ready: List[dict] = []
+
+        db = SessionLocal()
+
+        async def flush() -> List[str]:
+            """모은 줄을 반영하고 줄 번호 순서의 결과 줄 반환"""
+            nonlocal pending, ready
+            results = ready
+            if pending:
+                results = results + await run_in_threadpool(
+                    TransactionStreamService.apply_batch, db, pending, created_by
+                )
+            pending, ready = [], []
+
+            output = []
+            for result in sorted(results, key=lambda r: r["line"]):
+                counts[result["status"]] += 1
+                output.append(StreamLineResult(**result).model_dump_json(exclude_none=True) + "\n")
+            return output
+
+        try:
+            async for line_number, raw in iter_ndjson_lines(chunks):
+                line, failure = parse_line(line_number, raw)
+                if failure:
+                    ready.append(failure)
+                else:
+                    pending.append((line_number, line))
+
+                if len(pending) + len(ready) >= batch_size:
+                    for output in await flush():
+                        yield output
+
+            for output in await flush():
+                yield output
+
+            yield json.dumps({"done": True, **counts}) + "\n"
+        finally:
+            db.close()
@@ -0,0 +1,59 @@
+-- 019_add_sales_daily_fact.sql
+-- 일별 판매/폐기 사전 집계 테이블
+-- 매출·폐기 리포트가 매번 transactions 전체를 products와 조인하지 않도록 함
+
+-- 1. sales_daily_fact 테이블 생성
+CREATE TABLE IF NOT EXISTS playauto_platform.sales_daily_fact (
+    fact_date DATE NOT NULL,
+    product_code VARCHAR(50) NOT NULL,
+    transaction_type VARCHAR(20) NOT NULL,
+    category VARCHAR(100),
+    quantity INTEGER NOT NULL DEFAULT 0,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    revenue_krw NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    cost_krw NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (fact_date, product_code, transaction_type)
+);
+
+-- 2. 인덱스 생성
+CREATE INDEX IF NOT EXISTS idx_sales_daily_fact_category_date
+    ON playauto_platform.sales_daily_fact(category, fact_date);
+
+CREATE INDEX IF NOT EXISTS idx_sales_daily_fact_product_date
+    ON playauto_platform.sales_daily_fact(product_code, fact_date);
+
+-- 원본 적재 쿼리(유형 + 기간 범위)용 인덱스
+CREATE INDEX IF NOT EXISTS idx_transactions_type_transaction_date
+    ON playauto_platform.transactions(transaction_type, transaction_date);
+
+-- 3. 기존 이력 초기 적재 (날짜는 Asia/Seoul 기준)
+SET TIME ZONE 'Asia/Seoul';
+
+INSERT INTO playauto_platform.sales_daily_fact (
+    fact_date, product_code, transaction_type, category,
+    quantity, transaction_count, revenue_krw, cost_krw
+)
+SELECT
+    DATE(t.transaction_date),
+    p.product_code,
+    t.transaction_type,
+    p.category,
+    COALESCE(SUM(t.quantity), 0),
+    COUNT(t.id),
+    COALESCE(SUM(t.quantity * COALESCE(p.sale_price, 0)
+        * CASE WHEN p.sale_currency = 'USD' THEN 1300 ELSE 1 END), 0),
+    COALESCE(SUM(t.quantity * COALESCE(p.purchase_price, 0)
+        * CASE WHEN p.purchase_currency = 'USD' THEN 1300 ELSE 1 END), 0)
+FROM playauto_platform.transactions t
+JOIN playauto_platform.products p ON p.product_code = t.product_code
+WHERE t.transaction_type IN ('OUT', 'DISPOSAL')
+GROUP BY DATE(t.transaction_date), p.product_code, p.category, t.transaction_type
+ON CONFLICT (fact_date, product_code, transaction_type) DO NOTHING;
+
+-- 4. 코멘트 추가
+COMMENT ON TABLE playauto_platform.sales_daily_fact IS '일별 판매/폐기 사전 집계 테이블 (야간 스케줄러가 증분 적재)';
+COMMENT ON COLUMN playauto_platform.sales_daily_fact.transaction_type IS '거래 유형: OUT(판매 출고), DISPOSAL(폐기)';
+COMMENT ON COLUMN playauto_platform.sales_daily_fact.revenue_krw IS '판매가 기준 금액 (USD는 1300원 환산)';
+COMMENT ON COLUMN playauto_platform.sales_daily_fact.cost_krw IS '구매가 기준 금액 (USD는 1300원 환산)';
@@ -0,0 +1,17 @@
+-- 020_add_point_in_time_stock_indexes.sql
+-- 시점 재고 조회용 인덱스
+-- 제품별 "대상 날짜 이전 가장 최근 수불부/체크포인트" 조회와
+-- 기준점 이후 거래 증감 집계를 인덱스 범위 조회로 처리
+
+-- 1. 제품별 최근 수불부 조회
+CREATE INDEX IF NOT EXISTS idx_daily_ledgers_product_date
+    ON playauto_platform.daily_ledgers(product_code, ledger_date DESC);
+
+-- 2. 제품별 최근 활성 체크포인트 조회
+CREATE INDEX IF NOT EXISTS idx_checkpoint_product_date_active
+    ON playauto_platform.stock_checkpoints(product_code, checkpoint_date DESC)
+    WHERE is_active = TRUE;
+
+-- 3. 제품별 기간 거래 집계
+CREATE INDEX IF NOT EXISTS idx_transactions_product_transaction_date
+    ON playauto_platform.transactions(product_code, transaction_date);
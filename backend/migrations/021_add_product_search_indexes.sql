@@ -0,0 +1,21 @@
+-- 021_add_product_search_indexes.sql
+-- 제품 검색용 트라이그램/접두어 인덱스
+-- ILIKE '%검색어%' 전체 스캔 대신 pg_trgm GIN 인덱스로 부분 일치/유사도 검색
+-- (app/services/product_search.py의 search_document()와 식이 정확히 같아야 함)
+
+-- 1. pg_trgm 확장
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 2. 검색 문서(제품코드 + 제품명 + 제조사) 트라이그램 인덱스
+CREATE INDEX IF NOT EXISTS idx_products_search_trgm
+    ON playauto_platform.products
+    USING gin ((lower(coalesce(product_code, '') || ' ' || coalesce(product_name, '') || ' ' || coalesce(manufacturer, ''))) gin_trgm_ops);
+
+-- 3. 제품코드/바코드 접두어 검색
+CREATE INDEX IF NOT EXISTS idx_products_code_prefix
+    ON playauto_platform.products (lower(product_code) text_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS idx_products_barcode_prefix
+    ON playauto_platform.products (lower(barcode) text_pattern_ops);
+
+COMMENT ON INDEX playauto_platform.idx_products_search_trgm IS '제품 검색 트라이그램 인덱스 (한글 부분 일치/유사도 정렬)';
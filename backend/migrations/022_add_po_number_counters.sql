@@ -0,0 +1,23 @@
+-- 022_add_po_number_counters.sql
+-- 발주서 번호 월별 채번 테이블
+-- LIKE 'POyyyymm%' 조회 후 +1 하던 방식은 동시 생성 시 번호가 겹쳐
+-- po_number 유니크 제약 위반이 발생하므로, 채번 행 하나를 원자적으로 증가시키는 방식으로 변경
+
+-- 1. 채번 테이블
+CREATE TABLE IF NOT EXISTS playauto_platform.po_number_counters (
+    period VARCHAR(6) PRIMARY KEY,
+    last_value INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 2. 기존 발주서 번호로 월별 마지막 순번 초기화
+INSERT INTO playauto_platform.po_number_counters (period, last_value)
+SELECT SUBSTRING(po_number FROM 3 FOR 6) AS period,
+       MAX(CAST(SUBSTRING(po_number FROM 9) AS INTEGER)) AS last_value
+FROM playauto_platform.purchase_orders
+WHERE po_number ~ '^PO[0-9]{6}[0-9]+$'
+GROUP BY SUBSTRING(po_number FROM 3 FOR 6)
+ON CONFLICT (period) DO UPDATE
+    SET last_value = GREATEST(playauto_platform.po_number_counters.last_value, EXCLUDED.last_value);
+
+COMMENT ON TABLE playauto_platform.po_number_counters IS '발주서 번호 월별 채번 (period=YYYYMM, last_value=마지막 발급 순번)';
@@ -0,0 +1,23 @@
+-- 023_add_product_on_order_qty.sql
+-- 제품별 미입고 발주 수량 컬럼
+-- 완료/취소되지 않은 발주서의 (주문 수량 - 입고 수량) 합계를 제품 행에 저장하여
+-- 제품 목록/발주 제안에서 발주 항목 조인 없이 사용
+-- 발주서 생성/수정/상태변경/입고/삭제 시 애플리케이션에서 같은 트랜잭션으로 갱신
+-- 재구축: python scripts/db/rebuild_on_order_qty.py
+
+-- 1. 컬럼 추가
+ALTER TABLE playauto_platform.products
+    ADD COLUMN IF NOT EXISTS on_order_qty INTEGER NOT NULL DEFAULT 0;
+
+-- 2. 기존 발주서로 초기화
+UPDATE playauto_platform.products p
+SET on_order_qty = COALESCE((
+    SELECT SUM(GREATEST(poi.ordered_quantity - COALESCE(poi.received_quantity, 0), 0))
+    FROM playauto_platform.purchase_order_items poi
+    JOIN playauto_platform.purchase_orders po ON po.id = poi.po_id
+    WHERE poi.product_code = p.product_code
+      AND po.status NOT IN ('completed', 'cancelled')
+      AND poi.status <> 'received'
+), 0);
+
+COMMENT ON COLUMN playauto_platform.products.on_order_qty IS '미입고 발주 수량 (완료/취소되지 않은 발주서의 주문 - 입고 수량 합계)';
@@ -0,0 +1,30 @@
+-- 024_add_product_checkpoint_head.sql
+-- 제품별 최신 활성 체크포인트 테이블
+-- 거래 등록/검증 때마다 stock_checkpoints를 ORDER BY checkpoint_date DESC LIMIT 1로 찾던 것을
+-- 제품 코드 기본키 조회(및 애플리케이션 캐시)로 대체
+-- 체크포인트 생성/수정/비활성화 시 애플리케이션(CheckpointHeadService.refresh)에서 같은 트랜잭션으로 갱신
+
+-- 1. 테이블
+CREATE TABLE IF NOT EXISTS playauto_platform.product_checkpoint_head (
+    product_code VARCHAR(50) PRIMARY KEY
+        REFERENCES playauto_platform.products(product_code) ON DELETE CASCADE,
+    checkpoint_id UUID NOT NULL
+        REFERENCES playauto_platform.stock_checkpoints(id) ON DELETE CASCADE,
+    checkpoint_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    confirmed_stock INTEGER NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 2. 기존 체크포인트로 초기화
+INSERT INTO playauto_platform.product_checkpoint_head (product_code, checkpoint_id, checkpoint_date, confirmed_stock)
+SELECT DISTINCT ON (product_code) product_code, id, checkpoint_date, confirmed_stock
+FROM playauto_platform.stock_checkpoints
+WHERE is_active = TRUE
+ORDER BY product_code, checkpoint_date DESC
+ON CONFLICT (product_code) DO UPDATE
+    SET checkpoint_id = EXCLUDED.checkpoint_id,
+        checkpoint_date = EXCLUDED.checkpoint_date,
+        confirmed_stock = EXCLUDED.confirmed_stock,
+        updated_at = NOW();
+
+COMMENT ON TABLE playauto_platform.product_checkpoint_head IS '제품별 최신 활성 체크포인트 (제품당 1행)';
@@ -0,0 +1,31 @@
+-- 025_add_stock_checkpoints_archive.sql
+-- 일일 마감 체크포인트 압축/보관
+-- 보관 기간이 지난 DAILY_CLOSE 체크포인트는 월별로 마지막 체크포인트 하나만 MONTHLY로 남기고
+-- 나머지는 이 테이블로 옮김 (CheckpointCompactionService.compact)
+
+-- 1. 보관 테이블
+CREATE TABLE IF NOT EXISTS playauto_platform.stock_checkpoints_archive (
+    id UUID PRIMARY KEY,
+    product_code VARCHAR(50) NOT NULL,
+    checkpoint_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    checkpoint_type VARCHAR(20) NOT NULL,
+    confirmed_stock INTEGER NOT NULL,
+    reason TEXT,
+    created_by VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE,
+    is_active BOOLEAN NOT NULL,
+    folded_into_id UUID,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 2. 인덱스
+CREATE INDEX IF NOT EXISTS idx_checkpoint_archive_product_date
+    ON playauto_platform.stock_checkpoints_archive(product_code, checkpoint_date);
+
+-- 압축 대상(유형 + 날짜 범위) 조회용
+CREATE INDEX IF NOT EXISTS idx_checkpoint_type_date
+    ON playauto_platform.stock_checkpoints(checkpoint_type, checkpoint_date);
+
+-- 3. 코멘트
+COMMENT ON TABLE playauto_platform.stock_checkpoints_archive IS '압축된 일일 마감 체크포인트 보관 테이블';
+COMMENT ON COLUMN playauto_platform.stock_checkpoints_archive.folded_into_id IS '이 체크포인트를 대체한 월별(MONTHLY) 체크포인트 ID';
@@ -0,0 +1,48 @@
+-- 026_add_import_jobs.sql
+-- 대용량 가져오기 작업 (업로드 후 백그라운드 청크 처리, 진행 상황 조회, 실패 행 CSV)
+-- 청크 반영과 같은 트랜잭션에서 last_row를 갱신하므로 중단된 작업은 이어서 처리 가능
+
+-- 1. 가져오기 작업
+CREATE TABLE IF NOT EXISTS playauto_platform.import_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_type VARCHAR(30) NOT NULL CHECK (job_type IN ('transactions', 'products')),
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'completed', 'failed')),
+    file_name VARCHAR(255),
+    file_path TEXT NOT NULL,
+    chunk_size INTEGER NOT NULL DEFAULT 1000,
+    created_by VARCHAR(100),
+    total_rows INTEGER,
+    rows_done INTEGER NOT NULL DEFAULT 0,
+    rows_succeeded INTEGER NOT NULL DEFAULT 0,
+    rows_failed INTEGER NOT NULL DEFAULT 0,
+    last_row INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    run_started_at TIMESTAMP WITH TIME ZONE,
+    run_start_rows INTEGER NOT NULL DEFAULT 0,
+    started_at TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_import_jobs_status
+    ON playauto_platform.import_jobs(status);
+
+-- 2. 실패 행
+CREATE TABLE IF NOT EXISTS playauto_platform.import_job_errors (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_id UUID NOT NULL REFERENCES playauto_platform.import_jobs(id) ON DELETE CASCADE,
+    row_number INTEGER NOT NULL,
+    error TEXT NOT NULL,
+    row_data JSONB
+);
+
+CREATE INDEX IF NOT EXISTS idx_import_job_errors_job_row
+    ON playauto_platform.import_job_errors(job_id, row_number);
+
+-- 3. 코멘트
+COMMENT ON TABLE playauto_platform.import_jobs IS '대용량 가져오기 작업';
+COMMENT ON COLUMN playauto_platform.import_jobs.last_row IS '반영이 끝난 마지막 데이터 행 번호 (재시작 시 다음 행부터 처리)';
+COMMENT ON TABLE playauto_platform.import_job_errors IS '가져오기 작업 실패 행 (원본 값 포함)';
@@ -0,0 +1,37 @@
+-- 027_add_transaction_import_staging.sql
+-- 대용량 과거 거래 적재용 스테이징 테이블 (COPY로 적재 후 집합 기반 SQL로 transactions에 병합)
+-- UNLOGGED: WAL을 쓰지 않아 적재가 빠름 (서버 비정상 종료 시 비워지지만 병합 후에는 남는 데이터가 없음)
+
+-- 1. 스테이징 테이블 (CSV 템플릿 열 순서 그대로, 모든 값은 원문 텍스트로 보관)
+CREATE UNLOGGED TABLE IF NOT EXISTS playauto_platform.transaction_import_staging (
+    id BIGSERIAL PRIMARY KEY,
+    -- 적재 단위 식별자: COPY 전에 set_config('playauto.import_load_id', ...)로 지정
+    load_id UUID NOT NULL DEFAULT (current_setting('playauto.import_load_id'))::uuid,
+    product_code TEXT,
+    product_name TEXT,
+    transaction_type TEXT,
+    quantity TEXT,
+    transaction_date TEXT,
+    reason TEXT,
+    memo TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_transaction_import_staging_load
+    ON playauto_platform.transaction_import_staging(load_id, id);
+
+-- 2. 날짜 문자열 변환 (변환할 수 없으면 NULL → 검증 단계에서 행 번호와 함께 보고)
+CREATE OR REPLACE FUNCTION playauto_platform.try_timestamptz(value TEXT)
+RETURNS TIMESTAMP WITH TIME ZONE AS $$
+BEGIN
+    IF value IS NULL OR value !~ '^\d{4}-\d{2}-\d{2}' THEN
+        RETURN NULL;
+    END IF;
+    RETURN value::timestamptz;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- 3. 코멘트
+COMMENT ON TABLE playauto_platform.transaction_import_staging IS '대용량 거래 적재용 스테이징 (COPY 적재 → 병합 후 삭제)';
+COMMENT ON COLUMN playauto_platform.transaction_import_staging.load_id IS '적재 단위 식별자 (같은 파일의 행을 묶음)';
@@ -0,0 +1,14 @@
+-- 028_add_transaction_external_id.sql
+-- 채널 주문/라인 id (NDJSON 스트림 등록 시 중복 방지)
+-- 같은 라인을 다시 보내도 한 번만 반영되도록 고유 인덱스로 보장 (id가 없는 거래는 제외)
+
+-- 1. 컬럼 추가
+ALTER TABLE playauto_platform.transactions
+    ADD COLUMN IF NOT EXISTS external_id VARCHAR(200);
+
+-- 2. 고유 인덱스
+CREATE UNIQUE INDEX IF NOT EXISTS uq_transactions_external_id
+    ON playauto_platform.transactions(external_id)
+    WHERE external_id IS NOT NULL;
+
+COMMENT ON COLUMN playauto_platform.transactions.external_id IS '채널 주문/라인 id (중복 등록 방지)';
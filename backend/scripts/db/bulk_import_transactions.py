@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+대용량 거래 적재 스크립트
+CSV 파일을 COPY로 스테이징 테이블에 적재한 뒤 SQL 한 번으로 transactions에 병합 (수년치 이력 마이그레이션용)
+
+CSV 열 순서: 제품코드, 제품명, 구분, 수량, 날짜, 사유, 메모 (첫 줄은 헤더)
+
+사용 예:
+    python scripts/db/bulk_import_transactions.py legacy_history.csv
+    python scripts/db/bulk_import_transactions.py legacy_history.csv --allow-negative --regenerate-ledger
+"""
+
+import argparse
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.database import SessionLocal
+from app.services.bulk_ingest_service import BulkIngestService
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="대용량 거래 CSV 적재")
+    parser.add_argument("path", help="적재할 CSV 파일 경로")
+    parser.add_argument("--created-by", default="bulk_import", help="거래 등록자 (기본 bulk_import)")
+    parser.add_argument("--allow-negative", action="store_true",
+                        help="재고가 음수가 되는 제품이 있어도 적재")
+    parser.add_argument("--regenerate-ledger", action="store_true",
+                        help="적재 기간의 기존 일일 수불부 재생성")
+    return parser.parse_args()
+
+
+def bulk_import(args):
+    """파일 전체를 한 트랜잭션으로 적재"""
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            result = BulkIngestService.ingest(
+                db,
+                stream,
+                created_by=args.created_by,
+                allow_negative=args.allow_negative,
+                regenerate_ledger=args.regenerate_ledger
+            )
+
+        print(f"✅ 적재 완료: {result['inserted']}건 병합 (과거 이력 {result['historical']}건), "
+              f"제외 {result['failed']}건, 재고 변경 제품 {result['products_updated']}개")
+        if result["first_date"]:
+            print(f"   기간: {result['first_date']} ~ {result['last_date']}")
+        if result["ledger_dates"]:
+            print(f"   수불부 재생성: {len(result['ledger_dates'])}일")
+        for error in result["errors"][:20]:
+            print(f"   ⚠️  {error['row']}행: {error['error']}")
+        if result["failed"] > 20:
+            print(f"   ... 외 {result['failed'] - 20}건")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    try:
+        bulk_import(parse_args())
+    except Exception as e:
+        print(f"\n❌ 대용량 적재 실패: {e}", file=sys.stderr)
+        sys.exit(1)
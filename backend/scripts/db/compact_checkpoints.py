@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+일일 마감 체크포인트 압축 스크립트
+보관 기간이 지난 DAILY_CLOSE 체크포인트를 월별 MONTHLY 체크포인트로 합치고 나머지는 보관 테이블로 이동
+
+사용 예:
+    python scripts/db/compact_checkpoints.py
+    python scripts/db/compact_checkpoints.py --retention-days 180 --batch-size 2000
+"""
+
+import argparse
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.database import SessionLocal
+from app.services.checkpoint_compaction_service import (
+    CheckpointCompactionService,
+    DEFAULT_RETENTION_DAYS,
+    DEFAULT_BATCH_SIZE
+)
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="일일 마감 체크포인트 압축")
+    parser.add_argument("--retention-days", type=int, default=DEFAULT_RETENTION_DAYS,
+                        help=f"DAILY_CLOSE 보관 기간 (기본 {DEFAULT_RETENTION_DAYS}일)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"한 번에 처리할 체크포인트 수 (기본 {DEFAULT_BATCH_SIZE})")
+    return parser.parse_args()
+
+
+def compact(args):
+    """한 달씩 압축하고 달마다 커밋"""
+    db = SessionLocal()
+    try:
+        result = CheckpointCompactionService.compact(
+            db,
+            retention_days=args.retention_days,
+            batch_size=args.batch_size
+        )
+        print(f"✅ 체크포인트 압축 완료 (기준일: {result['cutoff']}, 처리 월: {len(result['months'])}개)")
+        print(f"   MONTHLY 전환 {result['promoted']}개, 보관 이동 {result['archived']}개, "
+              f"거래 재연결 {result['transactions_repointed']}건")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    try:
+        compact(parse_args())
+    except Exception as e:
+        print(f"\n❌ 체크포인트 압축 실패: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+시점 재고 스냅샷 내보내기 스크립트
+전체(또는 필터된) 제품의 지정 날짜 종료 시점 재고를 CSV/JSON 파일로 저장
+
+사용 예:
+    python scripts/db/export_stock_snapshot.py --date 2025-06-30 --date 2025-12-31
+    python scripts/db/export_stock_snapshot.py --date 2025-12-31 --category 영양제 --format json -o snapshot.json
+"""
+
+import argparse
+import sys
+import os
+from datetime import date
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.database import SessionLocal
+from app.services.stock_query_service import StockQueryService, format_snapshot_stream
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="시점 재고 스냅샷 내보내기")
+    parser.add_argument("--date", dest="dates", action="append", required=True,
+                        type=date.fromisoformat, help="조회할 날짜 (YYYY-MM-DD, 여러 번 지정 가능)")
+    parser.add_argument("--product-code", dest="product_codes", action="append",
+                        help="제품 코드 필터 (여러 번 지정 가능)")
+    parser.add_argument("--category", help="카테고리 필터")
+    parser.add_argument("--include-inactive", action="store_true", help="비활성 제품 포함")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv", help="출력 형식")
+    parser.add_argument("-o", "--output", help="출력 파일 경로 (생략 시 표준 출력)")
+    return parser.parse_args()
+
+
+def export_snapshot(args):
+    """스냅샷을 스트리밍으로 파일(또는 표준 출력)에 기록"""
+    db = SessionLocal()
+    out = open(args.output, "w", encoding="utf-8-sig", newline="") if args.output else sys.stdout
+    try:
+        rows = StockQueryService.iter_stock_snapshot(
+            db,
+            args.dates,
+            product_codes=args.product_codes,
+            category=args.category,
+            is_active=None if args.include_inactive else True
+        )
+        for chunk in format_snapshot_stream(rows, args.format):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    try:
+        export_snapshot(parse_args())
+    except Exception as e:
+        print(f"\n❌ 스냅샷 내보내기 실패: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+미입고 발주 수량(products.on_order_qty) 재구축 스크립트
+발주서/발주 항목을 직접 수정했거나 값이 어긋났을 때 전체 제품을 다시 계산
+
+사용 예:
+    python scripts/db/rebuild_on_order_qty.py
+    python scripts/db/rebuild_on_order_qty.py --product-code P001 --product-code P002
+"""
+
+import argparse
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.database import SessionLocal
+from app.services.purchase_order_service import PurchaseOrderService
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="미입고 발주 수량 재구축")
+    parser.add_argument("--product-code", dest="product_codes", action="append",
+                        help="재계산할 제품 코드 (여러 번 지정 가능, 생략 시 전체)")
+    return parser.parse_args()
+
+
+def rebuild(args):
+    """미입고 발주 수량을 한 번의 UPDATE로 재계산"""
+    db = SessionLocal()
+    try:
+        updated = PurchaseOrderService.refresh_on_order_qty(db, args.product_codes)
+        db.commit()
+        print(f"✅ 미입고 발주 수량 재계산 완료: {updated}개 제품")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    try:
+        rebuild(parse_args())
+    except Exception as e:
+        print(f"\n❌ 미입고 발주 수량 재구축 실패: {e}", file=sys.stderr)
+        sys.exit(1)
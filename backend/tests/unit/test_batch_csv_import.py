@@ -0,0 +1,64 @@
+"""
+CSV 일괄 업로드 단위 테스트
+스트리밍 파싱, 청크 분할 및 행별 오류 보고 테스트
+"""
+import io
+import pytest
+
+from app.services.batch_transaction_service import iter_csv_chunks
+
+
+@pytest.fixture
+def csv_stream():
+    """한글 헤더(BOM 포함) CSV 5행 (2행은 수량 오류, 4행은 타입 오류)"""
+    lines = [
+        "제품코드,제품명,구분,수량,날짜,사유,메모",
+        "P001,제품1,in,10,2025-01-06,입고,",
+        "P002,제품2,OUT,abc,2025-01-06,출고,",
+        'P003,"제품3, 대형",ADJUST,-5,2025-01-06,조정,메모',
+        "P004,제품4,MOVE,1,2025-01-06,,",
+        "P005,제품5,OUT,3,2025-01-07,,",
+    ]
+    return io.BytesIO(("\ufeff" + "\n".join(lines) + "\n").encode("utf-8"))
+
+
+class TestBatchCsvImport:
+    """CSV 업로드 파싱 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_split_rows_into_chunks_and_report_row_errors(self, csv_stream):
+        """CSV를 chunk_size 행 단위로 나누고 잘못된 행은 행 번호와 함께 보고해야 한다"""
+        # Act
+        chunks = list(iter_csv_chunks(csv_stream, chunk_size=2))
+
+        # Assert
+        assert len(chunks) == 3
+        valid = [(row, trans.product_code) for chunk_valid, _ in chunks for row, trans in chunk_valid]
+        errors = [error for _, chunk_invalid in chunks for error in chunk_invalid]
+        assert valid == [(1, "P001"), (3, "P003"), (5, "P005")]
+        assert [error["row"] for error in errors] == [2, 4]
+        assert errors[0]["data"]["제품코드"] == "P002"
+
+    @pytest.mark.unit
+    def test_should_normalize_type_and_keep_quoted_commas(self, csv_stream):
+        """소문자 구분은 대문자로 바꾸고 따옴표 안의 쉼표는 값으로 유지해야 한다"""
+        # Act
+        valid = [trans for chunk_valid, _ in iter_csv_chunks(csv_stream, chunk_size=10) for _, trans in chunk_valid]
+
+        # Assert
+        assert valid[0].transaction_type == "IN"
+        assert valid[1].product_name == "제품3, 대형"
+        assert valid[1].quantity == -5
+
+    @pytest.mark.unit
+    def test_should_skip_rows_up_to_start_after(self, csv_stream):
+        """작업 재개 시 start_after 이하 행은 건너뛰어야 한다"""
+        # Act
+        chunks = list(iter_csv_chunks(csv_stream, chunk_size=10, start_after=3))
+
+        # Assert
+        rows = [row for chunk_valid, _ in chunks for row, _ in chunk_valid]
+        errors = [error["row"] for _, chunk_invalid in chunks for error in chunk_invalid]
+        assert rows == [5]
+        assert errors == [4]
+        assert not csv_stream.closed
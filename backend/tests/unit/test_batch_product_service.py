@@ -0,0 +1,114 @@
+"""
+Batch Product Service 단위 테스트
+제품 일괄 등록 (기존 SKU/창고 일괄 조회, 다중 행 INSERT) 테스트
+"""
+import pytest
+import uuid
+from unittest.mock import MagicMock, patch
+from sqlalchemy.orm import Session
+
+from app.schemas.batch import BatchProduct
+from app.services.batch_product_service import BatchProductService
+
+
+@pytest.fixture
+def warehouse_id():
+    """'제1 창고 Main' 창고 id"""
+    return uuid.uuid4()
+
+
+@pytest.fixture
+def mock_db(warehouse_id):
+    """기존 SKU A와 '제1 창고 Main' 창고가 있는 Mock 세션"""
+    db = MagicMock(spec=Session)
+    db.query.return_value.filter.return_value.all.return_value = [("A",)]
+    db.query.return_value.all.return_value = [(warehouse_id, "제1 창고 Main")]
+    return db
+
+
+class TestBatchProductService:
+    """BatchProductService 테스트 클래스"""
+
+    @pytest.mark.unit
+    @patch("app.services.batch_product_service.product_catalog_cache.notify_change")
+    def test_should_insert_new_products_in_one_statement(self, mock_notify, mock_db, warehouse_id):
+        """기존 SKU와 없는 창고 행은 오류로 보고하고 나머지 행은 INSERT 한 번으로 등록해야 한다"""
+        # Arrange
+        rows = [
+            (1, BatchProduct(productCode="A", productName="기존")),
+            (2, BatchProduct(productCode="B", productName="신규", warehouse=" 제 1창고main")),
+            (3, BatchProduct(productCode="C", productName="창고 없음", warehouse="제2창고")),
+            (4, BatchProduct(productCode="D", productName="신규2", initialStock=5)),
+        ]
+
+        # Act
+        success, failed, errors = BatchProductService.apply(mock_db, rows)
+
+        # Assert
+        assert (success, failed) == (2, 2)
+        assert errors == [
+            {"row": 1, "error": "SKU 'A'가 이미 존재합니다."},
+            {"row": 3, "error": "창고 '제2창고'를 찾을 수 없습니다."},
+        ]
+        assert mock_db.query.call_count == 2
+        mock_db.execute.assert_called_once()
+        inserted = mock_db.execute.call_args[0][1]
+        assert [r["product_code"] for r in inserted] == ["B", "D"]
+        assert inserted[0]["warehouse_id"] == warehouse_id
+        assert inserted[1]["warehouse_id"] is None
+        assert [r["current_stock"] for r in inserted] == [0, 5]
+        assert inserted[0]["unit"] == "개"
+        mock_notify.assert_called_once_with(mock_db, "B", "D")
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.unit
+    @patch("app.services.batch_product_service.product_catalog_cache.notify_change")
+    def test_should_reject_duplicate_sku_within_file(self, mock_notify, mock_db):
+        """파일 안에서 같은 SKU가 두 번 나오면 두 번째 행만 오류로 보고해야 한다"""
+        # Arrange
+        rows = [
+            (1, BatchProduct(productCode="B", productName="신규")),
+            (2, BatchProduct(productCode="B", productName="중복")),
+        ]
+
+        # Act
+        success, failed, errors = BatchProductService.apply(mock_db, rows)
+
+        # Assert
+        assert (success, failed) == (1, 1)
+        assert errors == [{"row": 2, "error": "SKU 'B'가 이미 존재합니다."}]
+        assert [r["product_name"] for r in mock_db.execute.call_args[0][1]] == ["신규"]
+        # 창고를 지정한 행이 없으면 창고 조회 생략
+        assert mock_db.query.call_count == 1
+
+    @pytest.mark.unit
+    @patch("app.services.batch_product_service.product_catalog_cache.notify_change")
+    def test_should_update_only_given_fields_on_upsert(self, mock_notify, mock_db):
+        """upsert이면 기존 SKU는 INSERT 없이 보낸 필드만 UPDATE하고 재고는 바꾸지 않아야 한다"""
+        # Arrange
+        rows = [(1, BatchProduct(productCode="A", productName="새 이름", safetyStock=10, initialStock=99))]
+
+        # Act
+        success, failed, errors = BatchProductService.apply(mock_db, rows, upsert=True)
+
+        # Assert
+        assert (success, failed, errors) == (1, 0, [])
+        mock_db.execute.assert_called_once()
+        assert mock_db.execute.call_args[0][1] == [
+            {"product_name": "새 이름", "safety_stock": 10, "product_code": "A"}
+        ]
+        mock_notify.assert_called_once_with(mock_db, "A")
+
+    @pytest.mark.unit
+    @patch("app.services.batch_product_service.product_catalog_cache.notify_change")
+    def test_should_not_commit_when_commit_is_false(self, mock_notify, mock_db):
+        """commit=False이면 쓰기만 하고 커밋은 호출자에게 맡겨야 한다"""
+        # Act
+        success, _, _ = BatchProductService.apply(
+            mock_db, [(1, BatchProduct(productCode="B", productName="신규"))], commit=False
+        )
+
+        # Assert
+        assert success == 1
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_not_called()
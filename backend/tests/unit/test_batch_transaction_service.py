@@ -0,0 +1,128 @@
+"""
+Batch Transaction Service 단위 테스트
+일괄 거래 등록의 사전 조회, 메모리 내 재고 누적 및 일괄 반영 테스트
+"""
+import pytest
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.orm import Session
+
+from app.core.timezone_utils import KST
+from app.models.product import Product
+from app.services.checkpoint_head_service import CheckpointHead
+from app.services.batch_transaction_service import BatchTransactionService
+
+
+def _row(product_code, transaction_type, quantity, date="2025-03-15T10:00:00+09:00"):
+    return SimpleNamespace(
+        product_code=product_code, transaction_type=transaction_type, quantity=quantity,
+        date=date, reason=None, memo=None
+    )
+
+
+@pytest.fixture
+def products():
+    """재고 10인 활성 제품 A, 재고 5인 활성 제품 B, 비활성화 제품 C"""
+    return [
+        Product(product_code="A", current_stock=10, is_active=True, zone_id="Z1"),
+        Product(product_code="B", current_stock=5, is_active=True),
+        Product(product_code="C", current_stock=0, is_active=False)
+    ]
+
+
+@pytest.fixture
+def mock_db(products):
+    """제품 잠금 조회 결과를 지정한 Mock 세션"""
+    db = MagicMock(spec=Session)
+    locked = db.query.return_value.filter.return_value.order_by.return_value
+    locked.with_for_update.return_value.all.return_value = products
+    return db
+
+
+@pytest.fixture
+def checkpoint_head():
+    """제품 B의 최신 체크포인트 (2025-03-31 23:59 KST)"""
+    return CheckpointHead(
+        checkpoint_id=uuid.uuid4(),
+        checkpoint_date=datetime(2025, 3, 31, 23, 59, tzinfo=KST),
+        confirmed_stock=5
+    )
+
+
+class TestBatchTransactionService:
+    """BatchTransactionService 테스트 클래스"""
+
+    @pytest.mark.unit
+    @patch("app.services.batch_transaction_service.SalesFactService.refresh_backdated")
+    @patch("app.services.batch_transaction_service.CheckpointHeadService.read_heads")
+    def test_should_accumulate_stock_in_file_order_and_write_in_bulk(
+        self, mock_read_heads, mock_refresh, mock_db, checkpoint_head
+    ):
+        """행 순서대로 재고를 누적해 부족 행만 거부하고 거래 INSERT와 재고 UPDATE를 한 번씩 실행해야 한다"""
+        # Arrange
+        mock_read_heads.return_value = {"A": None, "B": checkpoint_head, "C": None}
+        rows = [
+            (1, _row("A", "IN", 5)),
+            (2, _row("A", "OUT", 12)),
+            (3, _row("A", "OUT", 20)),
+            (4, _row("X", "IN", 1)),
+        ]
+
+        # Act
+        success, failed, errors = BatchTransactionService.apply(mock_db, rows)
+
+        # Assert
+        assert (success, failed) == (2, 2)
+        assert errors[0] == {"row": 3, "error": "재고 부족: 현재 3, 요청 20"}
+        assert errors[1]["row"] == 4
+        inserted = mock_db.execute.call_args_list[0].args[1]
+        assert [(r["previous_stock"], r["new_stock"]) for r in inserted] == [(10, 15), (15, 3)]
+        assert inserted[0]["location"] == "Z1"
+        assert mock_db.execute.call_count == 2
+        mock_refresh.assert_called_once_with(mock_db, {date(2025, 3, 15)})
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.unit
+    @patch("app.services.batch_transaction_service.SalesFactService.refresh_backdated")
+    @patch("app.services.batch_transaction_service.CheckpointHeadService.read_heads")
+    def test_should_record_checkpoint_and_inactive_rows_as_history(
+        self, mock_read_heads, mock_refresh, mock_db, checkpoint_head
+    ):
+        """체크포인트 이전(같은 시각 포함) 거래와 비활성화 제품 거래는 재고 검증 없이 이력으로만 기록해야 한다"""
+        # Arrange
+        mock_read_heads.return_value = {"A": None, "B": checkpoint_head, "C": None}
+        rows = [
+            (1, _row("B", "OUT", 100)),
+            (2, _row("B", "IN", 1, date="2025-03-31T23:59:00+09:00")),
+            (3, _row("B", "IN", 1, date="2025-04-01T09:00:00+09:00")),
+            (4, _row("C", "OUT", 7)),
+        ]
+
+        # Act
+        success, failed, errors = BatchTransactionService.apply(mock_db, rows)
+
+        # Assert
+        assert (success, failed, errors) == (4, 0, [])
+        inserted = mock_db.execute.call_args_list[0].args[1]
+        assert [r["affects_current_stock"] for r in inserted] == [False, False, True, False]
+        assert [r["checkpoint_id"] for r in inserted] == [
+            checkpoint_head.checkpoint_id, checkpoint_head.checkpoint_id, None, None
+        ]
+        stock_update = mock_db.execute.call_args_list[1].args[0]
+        params = stock_update.compile().params
+        assert (params["product_code_1"], params["param_1"], params["param_2"]) == (["B"], "B", 1)
+
+    @pytest.mark.unit
+    @patch("app.services.batch_transaction_service.CheckpointHeadService.read_heads", return_value={})
+    def test_should_release_locks_when_every_row_fails(self, mock_read_heads, mock_db):
+        """모든 행이 실패하면 아무것도 쓰지 않고 롤백으로 잠금을 해제해야 한다"""
+        # Act
+        success, failed, errors = BatchTransactionService.apply(mock_db, [(1, _row("X", "IN", 1))])
+
+        # Assert
+        assert (success, failed) == (0, 1)
+        mock_db.execute.assert_not_called()
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
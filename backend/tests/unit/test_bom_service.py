@@ -0,0 +1,170 @@
+"""
+BOM Service 단위 테스트
+다단계 BOM 전개 캐시 및 순환 참조 검사 테스트
+"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.services.bom_service import BOMService, FlatBOMCache, build_explosion_query
+
+
+@pytest.fixture
+def mock_db():
+    """Mock 데이터베이스 세션"""
+    return MagicMock(spec=Session)
+
+
+@pytest.fixture
+def cache():
+    """빈 평탄화 BOM 캐시"""
+    return FlatBOMCache()
+
+
+@pytest.fixture
+def assembly_db(mock_db):
+    """부품 P1 재고 10, 세트 SET-A/SET-B 재고 0을 잠금 조회하는 Mock 세션"""
+    mock_db.query.return_value.filter.return_value.order_by.return_value \
+        .with_for_update.return_value.all.return_value = [
+            Product(product_code="P1", product_name="부품", current_stock=10),
+            Product(product_code="SET-A", product_name="세트A", current_stock=0),
+            Product(product_code="SET-B", product_name="세트B", current_stock=0)
+        ]
+    return mock_db
+
+
+@pytest.fixture
+def flat_boms():
+    """SET-A는 P1 2개, SET-B는 P1 3개로 조립 (평탄화 BOM 캐시 대체)"""
+    flat = {"SET-A": {"P1": 2}, "SET-B": {"P1": 3}}
+    with patch("app.services.bom_service.flat_bom_cache.get_many", return_value=flat), \
+            patch("app.services.bom_service.TransactionService.get_later_checkpoints", return_value={}):
+        yield flat
+
+
+class TestBOMService:
+    """BOMService 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_load_cache_misses_in_one_query(self, cache, mock_db):
+        """누락된 세트만 전개 쿼리 한 번으로 읽고 무효화 전까지는 캐시를 사용해야 한다"""
+        # Arrange
+        mock_db.execute.return_value = [
+            SimpleNamespace(root="SET-A", component="P1", quantity=6),
+            SimpleNamespace(root="SET-A", component="P2", quantity=1)
+        ]
+
+        # Act
+        first = cache.get_many(mock_db, ["SET-A", "P9"])
+        second = cache.get_many(mock_db, ["SET-A", "P9"])
+        cache.invalidate("SUB-B")
+        cache.get(mock_db, "SET-A")
+
+        # Assert
+        assert first == {"SET-A": {"P1": 6, "P2": 1}, "P9": {}}
+        assert second == first
+        assert mock_db.execute.call_count == 2
+
+    @pytest.mark.unit
+    def test_should_clear_flat_bom_cache_only_after_commit(self, cache):
+        """BOM 변경 알림의 로컬 무효화는 커밋 전에는 실행되지 않고 커밋 직후 실행되어야 한다"""
+        # Arrange
+        cache._items["SET-A"] = {"P1": 1}
+        session = Session(create_engine("sqlite://"))
+        session.execute(text("SELECT 1"))
+
+        # Act
+        cache.notify_change(session)
+        cached_before_commit = "SET-A" in cache._items
+        session.commit()
+
+        # Assert
+        assert cached_before_commit
+        assert cache._items == {}
+
+    @pytest.mark.unit
+    def test_should_build_recursive_explosion_query(self):
+        """전개 쿼리는 재귀 CTE로 수량을 곱하고 최하위 구성품만 합산해야 한다"""
+        # Act
+        sql = str(build_explosion_query(["SET-A"]).compile(dialect=postgresql.dialect()))
+
+        # Assert
+        assert "WITH RECURSIVE bom_explosion" in sql
+        assert "bom_explosion.quantity * child_bom.quantity" in sql
+        assert "NOT (EXISTS" in sql
+        assert "GROUP BY" in sql
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("parent,child,descendants", [
+        ("SET-A", "SET-A", []),
+        ("P1", "SET-A", ["SUB-B", "P1"]),
+    ])
+    def test_should_reject_circular_reference(self, mock_db, parent, child, descendants):
+        """자기 자신이나 이미 하위에 부모를 포함한 자식을 추가하면 400 에러를 발생시켜야 한다"""
+        # Arrange
+        mock_db.execute.return_value.scalars.return_value.all.return_value = descendants
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            BOMService.check_cycle(mock_db, parent, child)
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.unit
+    def test_should_compute_buildable_map_in_single_query(self, mock_db):
+        """전개, 재고 조인, 세트별 최소값 선택을 한 번의 쿼리로 처리해야 한다"""
+        # Arrange
+        mock_db.execute.return_value.all.return_value = [
+            SimpleNamespace(product_code="SET-A", buildable_quantity=3,
+                            limiting_component="P1", limiting_stock=7, limiting_required=2)
+        ]
+
+        # Act
+        result = BOMService.get_buildable_map(mock_db)
+
+        # Assert
+        assert result == {"SET-A": {
+            "buildable_quantity": 3, "limiting_component": "P1",
+            "limiting_stock": 7, "limiting_required": 2
+        }}
+        assert mock_db.execute.call_count == 1
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "DISTINCT ON (flat_bom.root)" in sql
+        assert "floor" in sql
+
+    @pytest.mark.unit
+    def test_should_reject_assembly_batch_short_in_aggregate(self, assembly_db, flat_boms):
+        """세트별로는 가능해도 같은 구성품의 합산 소요량이 재고를 넘으면 거래 없이 전체 롤백해야 한다"""
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            BOMService.process_assembly_batch(assembly_db, [
+                {"product_code": "SET-A", "quantity": 3},
+                {"product_code": "SET-B", "quantity": 2}
+            ])
+        assert exc_info.value.status_code == 400
+        assert "P1" in exc_info.value.detail
+        assembly_db.rollback.assert_called_once()
+        assembly_db.execute.assert_not_called()
+        assembly_db.commit.assert_not_called()
+
+    @pytest.mark.unit
+    def test_should_write_assembly_batch_in_bulk_and_commit_once(self, assembly_db, flat_boms):
+        """합산 소요량이 재고 이내이면 세트 입고/구성품 출고를 순서대로 누적해 한 번에 기록해야 한다"""
+        # Act
+        result = BOMService.process_assembly_batch(assembly_db, [
+            {"product_code": "SET-A", "quantity": 2},
+            {"product_code": "SET-B", "quantity": 2}
+        ])
+
+        # Assert
+        rows = assembly_db.execute.call_args_list[0][0][1]
+        assert [(r["product_code"], r["transaction_type"], r["previous_stock"], r["new_stock"]) for r in rows] == [
+            ("SET-A", "IN", 0, 2), ("P1", "OUT", 10, 6), ("SET-B", "IN", 0, 2), ("P1", "OUT", 6, 0)
+        ]
+        assert assembly_db.execute.call_count == 2  # 거래 bulk INSERT, 재고 UPDATE
+        assembly_db.commit.assert_called_once()
+        assert result["transactions_created"] == 4
@@ -0,0 +1,110 @@
+"""
+Bulk Ingest Service 단위 테스트
+COPY 스테이징 적재 후 병합 흐름 테스트
+"""
+import io
+import pytest
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.orm import Session
+
+from app.services.bulk_ingest_service import (
+    BulkIngestService, CLEANUP_SQL, COPY_SQL, MERGE_SQL, SHORTAGE_SQL, VALIDATE_SQL
+)
+
+
+@pytest.fixture
+def statement_results():
+    """SQL 문별 결과 (형식 오류 1행, 재고 부족 없음, 2행 병합)"""
+    return {
+        VALIDATE_SQL: [SimpleNamespace(row_number=2, error="제품 코드 X를 찾을 수 없습니다", total_errors=1)],
+        SHORTAGE_SQL: [],
+        MERGE_SQL: SimpleNamespace(
+            inserted=2, historical=1, products_updated=1,
+            first_date=datetime(2024, 12, 31, 16, 0, tzinfo=timezone.utc),
+            last_date=datetime(2025, 1, 6, 0, 0, tzinfo=timezone.utc),
+            first_stock_date=datetime(2025, 1, 6, 0, 0, tzinfo=timezone.utc),
+            last_stock_date=datetime(2025, 1, 6, 0, 0, tzinfo=timezone.utc)
+        ),
+    }
+
+
+@pytest.fixture
+def mock_db(statement_results):
+    """실행한 SQL 문을 기록하고 statement_results의 결과를 돌려주는 Mock 세션"""
+    db = MagicMock(spec=Session)
+    db.executed = []
+    db.connection.return_value.connection.cursor.return_value = MagicMock(rowcount=3)
+
+    def execute(statement, params=None):
+        sql = str(statement)
+        db.executed.append(sql)
+        result = MagicMock()
+        result.all.return_value = statement_results.get(sql, [])
+        result.one.return_value = statement_results.get(sql)
+        return result
+
+    db.execute.side_effect = execute
+    return db
+
+
+@pytest.fixture
+def csv_stream():
+    """헤더만 있는 거래 CSV (내용은 COPY Mock이 대신함)"""
+    return io.BytesIO("제품코드,제품명,구분,수량,날짜,사유,메모\n".encode("utf-8"))
+
+
+class TestBulkIngestService:
+    """BulkIngestService 테스트 클래스"""
+
+    @pytest.mark.unit
+    @patch("app.services.bulk_ingest_service.SalesFactService.rebuild_range")
+    def test_should_merge_valid_rows_and_report_invalid_rows(self, mock_rebuild, mock_db, csv_stream):
+        """COPY 후 병합과 스테이징 삭제를 한 번에 커밋하고 오류 행과 적재 기간(KST)을 반환해야 한다"""
+        # Act
+        result = BulkIngestService.ingest(mock_db, csv_stream)
+
+        # Assert
+        cursor = mock_db.connection.return_value.connection.cursor.return_value
+        cursor.copy_expert.assert_called_once()
+        assert cursor.copy_expert.call_args[0][0] == COPY_SQL
+        assert mock_db.executed.index(MERGE_SQL) < mock_db.executed.index(CLEANUP_SQL)
+        mock_db.commit.assert_called_once()
+        mock_db.rollback.assert_not_called()
+        assert (result["staged"], result["inserted"], result["historical"]) == (3, 2, 1)
+        assert result["failed"] == 1
+        assert result["errors"] == [{"row": 2, "error": "제품 코드 X를 찾을 수 없습니다"}]
+        assert (result["first_date"], result["last_date"]) == (date(2025, 1, 1), date(2025, 1, 6))
+        mock_rebuild.assert_called_once_with(mock_db, date(2025, 1, 1), date(2025, 1, 6))
+
+    @pytest.mark.unit
+    def test_should_roll_back_when_stock_goes_negative(self, mock_db, statement_results, csv_stream):
+        """적재 후 재고가 음수가 되는 제품이 있으면 병합하지 않고 롤백 후 ValueError를 발생시켜야 한다"""
+        # Arrange
+        statement_results[SHORTAGE_SQL] = [SimpleNamespace(product_code="A", lowest_stock=-5)]
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="A\\(-5\\)"):
+            BulkIngestService.ingest(mock_db, csv_stream)
+
+        assert MERGE_SQL not in mock_db.executed
+        assert CLEANUP_SQL not in mock_db.executed
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.unit
+    def test_should_skip_shortage_check_when_negative_stock_allowed(self, mock_db, statement_results, csv_stream):
+        """allow_negative이면 재고 부족 검사 없이 병합해야 한다"""
+        # Arrange
+        statement_results[SHORTAGE_SQL] = [SimpleNamespace(product_code="A", lowest_stock=-5)]
+        statement_results[MERGE_SQL].inserted = 0
+
+        # Act
+        result = BulkIngestService.ingest(mock_db, csv_stream, allow_negative=True)
+
+        # Assert
+        assert SHORTAGE_SQL not in mock_db.executed
+        assert MERGE_SQL in mock_db.executed
+        assert result["inserted"] == 0
+        mock_db.commit.assert_called_once()
@@ -0,0 +1,97 @@
+"""
+Checkpoint Compaction Service 단위 테스트
+일일 마감 체크포인트 압축 범위 계산 및 월별 압축 쿼리 테스트
+"""
+import pytest
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.stock_checkpoint import CheckpointType
+from app.services.checkpoint_compaction_service import CheckpointCompactionService
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def keeper_id():
+    """제품 A의 달 마지막 DAILY_CLOSE 체크포인트 id (남길 체크포인트)"""
+    return uuid.uuid4()
+
+
+@pytest.fixture
+def old_ids():
+    """제품 A의 같은 달 이전 DAILY_CLOSE 체크포인트 id 2개"""
+    return [uuid.uuid4(), uuid.uuid4()]
+
+
+@pytest.fixture
+def mock_db(keeper_id, old_ids):
+    """실행한 문을 기록하고 SELECT는 체크포인트, 거래 UPDATE는 7행을 돌려주는 Mock 세션"""
+    db = MagicMock(spec=Session)
+    db.statements = []
+
+    def execute(statement, params=None):
+        db.statements.append(statement)
+        result = MagicMock(rowcount=0)
+        if statement.is_select and len(statement.selected_columns) == 3:
+            result.all.return_value = [SimpleNamespace(
+                product_code="A", id=keeper_id, checkpoint_type=CheckpointType.DAILY_CLOSE
+            )]
+        elif statement.is_select:
+            result.all.return_value = [SimpleNamespace(id=i, product_code="A") for i in old_ids + [keeper_id]]
+        elif statement.is_update and statement.table.name == "transactions":
+            result.rowcount = 7
+        return result
+
+    db.execute.side_effect = execute
+    return db
+
+
+class TestCheckpointCompactionService:
+    """CheckpointCompactionService 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_compact_only_complete_months_before_retention(self):
+        """보관 시작일(2025-03-17)이 속한 3월은 제외하고 그 이전의 완전한 달만 처리해야 한다"""
+        # Act
+        cutoff = CheckpointCompactionService.get_cutoff(date(2025, 6, 15), 90)
+        months = list(CheckpointCompactionService.iter_months(date(2025, 1, 20), cutoff))
+
+        # Assert
+        assert cutoff == date(2025, 3, 1)
+        assert months == [
+            (date(2025, 1, 1), date(2025, 1, 31)),
+            (date(2025, 2, 1), date(2025, 2, 28))
+        ]
+
+    @pytest.mark.unit
+    @patch("app.services.checkpoint_compaction_service.CheckpointHeadService.refresh")
+    def test_should_promote_last_close_and_fold_the_rest_into_it(self, mock_refresh, mock_db, keeper_id, old_ids):
+        """마지막 DAILY_CLOSE는 MONTHLY로 승격하고 나머지는 거래를 재연결한 뒤 보관/삭제해야 한다"""
+        # Act
+        result = CheckpointCompactionService.compact_month(mock_db, date(2025, 1, 1), date(2025, 1, 31))
+
+        # Assert
+        assert result == {"month": "2025-01", "promoted": 1, "archived": 2, "transactions_repointed": 7}
+        keeper_select, _, promote, repoint, archive, remove = mock_db.statements
+
+        order_by = _sql(keeper_select).split("ORDER BY")[1]
+        assert order_by.index("checkpoint_date DESC") < order_by.index("CASE")
+
+        promote_params = promote.compile().params
+        assert promote_params["checkpoint_type"] == CheckpointType.MONTHLY
+        assert promote_params["id_1"] == [keeper_id]
+        assert promote_params["reason"] == "2025-01 월말 결산 (일일 마감 압축)"
+
+        repoint_sql = _sql(repoint)
+        assert "UPDATE playauto_platform.transactions" in repoint_sql
+        assert "FROM (VALUES" in repoint_sql
+        assert "INSERT INTO playauto_platform.stock_checkpoints_archive" in _sql(archive)
+        assert sorted(remove.compile().params["id_1"]) == sorted(old_ids)
+        mock_refresh.assert_called_once_with(mock_db, {"A"})
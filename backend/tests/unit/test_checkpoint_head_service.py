@@ -0,0 +1,124 @@
+"""
+Checkpoint Head Service 단위 테스트
+제품별 최신 체크포인트 캐시 및 갱신 쿼리 테스트
+"""
+import pytest
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core.timezone_utils import KST
+from app.models.stock_checkpoint import ProductCheckpointHead
+from app.services.checkpoint_head_service import CheckpointHeadCache, CheckpointHeadService
+from app.services.product_catalog_cache import _run_pending_invalidations
+
+
+@pytest.fixture
+def cache():
+    """서비스가 사용하는 빈 최신 체크포인트 캐시"""
+    cache = CheckpointHeadCache()
+    with patch("app.services.checkpoint_head_service.checkpoint_head_cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def head_a():
+    """제품 A의 최신 체크포인트 (2025-03-31 23:59 KST)"""
+    return ProductCheckpointHead(
+        product_code="A", checkpoint_id=uuid.uuid4(),
+        checkpoint_date=datetime(2025, 3, 31, 23, 59, tzinfo=KST), confirmed_stock=10
+    )
+
+
+@pytest.fixture
+def head_b():
+    """제품 B의 최신 체크포인트 (2025-02-28 23:59 KST)"""
+    return ProductCheckpointHead(
+        product_code="B", checkpoint_id=uuid.uuid4(),
+        checkpoint_date=datetime(2025, 2, 28, 23, 59, tzinfo=KST), confirmed_stock=10
+    )
+
+
+@pytest.fixture
+def head_rows(head_a):
+    """최신 체크포인트 테이블의 행 (제품 A만)"""
+    return [head_a]
+
+
+@pytest.fixture
+def mock_db(head_rows):
+    """활성 제품 A, 비활성 제품 B와 head_rows의 최신 체크포인트가 있는 Mock 세션"""
+    db = MagicMock(spec=Session)
+    db.info = {}
+    db.get_bind.return_value.dialect.name = "sqlite"
+    products_query, heads_query = MagicMock(), MagicMock()
+    products_query.filter.return_value.all.return_value = [("A", True), ("B", False)]
+    heads_query.filter.return_value.all.return_value = head_rows
+    db.query.side_effect = lambda *entities: (
+        heads_query if entities[0] is ProductCheckpointHead else products_query
+    )
+    return db
+
+
+class TestCheckpointHeadService:
+    """CheckpointHeadService 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_read_heads_in_transaction_instead_of_cache(self, cache, mock_db, head_rows, head_a, head_b):
+        """캐시에 체크포인트가 없다고 남아 있어도 기본키 조회 결과로 거래 시각 이후 체크포인트를 찾아야 한다"""
+        # Arrange
+        cache._items.update({"A": None, "B": None, "C": None})
+        head_rows.append(head_b)
+
+        # Act
+        result = CheckpointHeadService.get_later_checkpoints(
+            mock_db, ["A", "B", "C"], datetime(2025, 3, 15, 12, 0, tzinfo=KST)
+        )
+
+        # Assert
+        assert result == {"A": head_a.checkpoint_id}
+        assert mock_db.query.call_count == 1
+
+    @pytest.mark.unit
+    def test_should_upsert_latest_heads_and_invalidate_cache_after_commit(self, cache, mock_db):
+        """DISTINCT ON 최신 체크포인트 UPSERT와 오래된 행 삭제를 실행하고 캐시는 커밋 후에만 무효화해야 한다"""
+        # Arrange
+        cache._items["A"] = None
+
+        # Act
+        CheckpointHeadService.refresh(mock_db, ["A", "A"])
+        cached_before_commit = "A" in cache._items
+        _run_pending_invalidations(mock_db)
+
+        # Assert
+        upsert, stale = (str(c[0][0].compile(dialect=postgresql.dialect())) for c in mock_db.execute.call_args_list)
+        assert "DISTINCT ON (playauto_platform.stock_checkpoints.product_code)" in upsert
+        assert "ON CONFLICT (product_code) DO UPDATE" in upsert
+        assert stale.startswith("DELETE FROM playauto_platform.product_checkpoint_head")
+        assert cached_before_commit
+        assert "A" not in cache._items
+
+    @pytest.mark.unit
+    def test_should_classify_rows_with_two_queries_like_import(self, cache, mock_db, head_a):
+        """제품과 체크포인트를 한 번씩만 조회하고 가져오기와 같은 규칙으로 행마다 재고 반영 여부를 반환해야 한다"""
+        # Arrange
+        rows = [
+            ("A", datetime(2025, 3, 1, tzinfo=KST)),
+            ("A", head_a.checkpoint_date),
+            ("A", datetime(2025, 4, 1, tzinfo=KST)),
+            ("B", datetime(2025, 4, 1, tzinfo=KST)),
+            ("X", datetime(2025, 3, 1, tzinfo=KST))
+        ]
+
+        # Act
+        results = CheckpointHeadService.validate_many(mock_db, rows)
+
+        # Assert
+        assert [r["affects_current_stock"] for r in results] == [False, False, True, False, True]
+        assert [r["checkpoint_id"] for r in results] == [
+            head_a.checkpoint_id, head_a.checkpoint_id, None, None, None
+        ]
+        assert results[4]["product_exists"] is False
+        assert mock_db.query.call_count == 2
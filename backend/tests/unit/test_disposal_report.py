@@ -0,0 +1,78 @@
+"""
+Disposal Report 단위 테스트
+폐기 리포트 화면 전체 데이터 단일 쿼리 집계 테스트
+"""
+import pytest
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.disposal_report import get_disposal_overview
+
+
+def _group_row(**values) -> SimpleNamespace:
+    """GROUPING SETS 결과 행 (해당 그룹에 없는 컬럼은 NULL)"""
+    defaults = dict(
+        id=None, product_code=None, product_name=None, reason=None, transaction_date=None,
+        created_by=None, purchase_price=None, is_transaction_total=1, is_product_total=1,
+        is_reason_total=1, count=0, total_quantity=0, total_loss=0, detail_rank=1
+    )
+    defaults.update(values)
+    return SimpleNamespace(**defaults)
+
+
+@pytest.fixture
+def transaction_ids():
+    """상세 행의 (이전, 최근) 폐기 거래 id"""
+    return uuid.uuid4(), uuid.uuid4()
+
+
+@pytest.fixture
+def mock_db(transaction_ids):
+    """전체/제품별/사유별 그룹 행과 거래 단위 상세 2행(순번 역순)을 돌려주는 Mock 세션"""
+    older, newer = transaction_ids
+    db = MagicMock(spec=Session)
+    db.query.return_value.filter.return_value.all.return_value = [
+        _group_row(count=2, total_quantity=5, total_loss=5000),
+        _group_row(product_code="A", product_name="제품A", is_product_total=0, count=2, total_quantity=5, total_loss=5000),
+        _group_row(reason="expiry", is_reason_total=0, count=2, total_quantity=5, total_loss=5000),
+        _group_row(
+            id=older, product_code="A", product_name="제품A", reason="expiry",
+            transaction_date=datetime(2025, 3, 1), purchase_price=1000, is_transaction_total=0,
+            is_product_total=0, is_reason_total=0, count=1, total_quantity=2, total_loss=2000, detail_rank=2
+        ),
+        _group_row(
+            id=newer, product_code="A", product_name="제품A", reason="expiry",
+            transaction_date=datetime(2025, 3, 2), purchase_price=1000, is_transaction_total=0,
+            is_product_total=0, is_reason_total=0, count=1, total_quantity=3, total_loss=3000, detail_rank=1
+        ),
+    ]
+    return db
+
+
+class TestDisposalOverview:
+    """get_disposal_overview 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_read_summary_groups_and_details_in_one_query(self, mock_db, transaction_ids):
+        """요약/제품별/사유별 집계와 상세를 GROUPING SETS 쿼리 한 번으로 읽고 상세는 거래일 역순이어야 한다"""
+        # Act
+        overview = get_disposal_overview(
+            start_date=date(2025, 3, 1), end_date=date(2025, 3, 31), top_n=10, details_limit=50, db=mock_db
+        )
+
+        # Assert
+        older, newer = transaction_ids
+        mock_db.query.assert_called_once()
+        sql = str(mock_db.query.call_args[0][0].element.compile(dialect=postgresql.dialect()))
+        assert sql.count("GROUPING SETS") == 1
+        assert "row_number() OVER (PARTITION BY grouping(playauto_platform.transactions.id)" in sql
+        assert overview.summary.total_disposal_count == 2
+        assert overview.summary.total_loss_amount == 5000.0
+        assert [p.product_code for p in overview.by_product] == ["A"]
+        assert [r.reason for r in overview.by_reason] == ["유효기간 만료"]
+        assert [d.id for d in overview.details] == [str(newer), str(older)]
+        assert (overview.details[0].quantity, overview.details[0].loss_amount) == (3, 3000.0)
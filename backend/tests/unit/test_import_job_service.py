@@ -0,0 +1,88 @@
+"""
+Import Job Service 단위 테스트
+가져오기 작업의 청크 반영(진행 상황 동시 커밋)과 진행률/ETA 계산 테스트
+"""
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from sqlalchemy.orm import Session
+
+from app.models.import_job import ImportJob
+from app.schemas.batch import BatchTransaction
+from app.services.import_job_service import ImportJobService
+
+
+@pytest.fixture
+def mock_db():
+    """Mock 데이터베이스 세션"""
+    return MagicMock(spec=Session)
+
+
+@pytest.fixture
+def job():
+    """처음 실행 중인 거래 가져오기 작업"""
+    return ImportJob(
+        id=uuid.uuid4(), job_type="transactions", status="running", file_path="/tmp/x.csv",
+        chunk_size=1000, rows_done=0, rows_succeeded=0, rows_failed=0, last_row=0, run_start_rows=0
+    )
+
+
+class TestImportJobService:
+    """ImportJobService 테스트 클래스"""
+
+    @pytest.mark.unit
+    @patch("app.services.import_job_service.BatchTransactionService.apply")
+    def test_should_commit_rows_errors_and_progress_together(self, mock_apply, mock_db, job):
+        """거래는 커밋 없이 반영하고 실패 행(원본 값 포함)과 진행 상황을 한 번에 커밋해야 한다"""
+        # Arrange
+        job.rows_done, job.rows_succeeded, job.rows_failed, job.last_row = 1000, 990, 10, 1000
+        mock_apply.return_value = (1, 1, [{"row": 1002, "error": "재고 부족: 현재 5, 요청 99"}])
+        valid = [
+            (1001, BatchTransaction(product_code="A", transaction_type="IN", quantity=5, date="2025-01-06")),
+            (1002, BatchTransaction(product_code="A", transaction_type="OUT", quantity=99, date="2025-01-06")),
+        ]
+        invalid = [{"row": 1003, "error": "수량이 숫자가 아닙니다: abc", "data": {"제품코드": "B", "수량": "abc"}}]
+
+        # Act
+        ImportJobService.apply_chunk(mock_db, job, valid, invalid)
+
+        # Assert
+        assert mock_apply.call_args.kwargs["commit"] is False
+        error_rows = mock_db.execute.call_args.args[1]
+        assert [row["row_number"] for row in error_rows] == [1003, 1002]
+        assert error_rows[0]["error"] == "수량이 숫자가 아닙니다: abc"
+        assert error_rows[1]["row_data"]["제품코드"] == "A"
+        assert error_rows[1]["row_data"]["수량"] == "99"
+        assert (job.rows_done, job.rows_succeeded, job.rows_failed, job.last_row) == (1003, 991, 12, 1003)
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.unit
+    def test_should_report_throughput_and_eta_of_current_run(self, job):
+        """재개 후 처리한 행만으로 초당 처리량과 남은 행의 ETA를 계산해야 한다"""
+        # Arrange
+        now = datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc)
+        job.total_rows, job.rows_done, job.rows_succeeded, job.rows_failed = 10000, 5000, 4990, 10
+        job.run_started_at, job.run_start_rows = now - timedelta(seconds=100), 2000
+
+        # Act
+        progress = ImportJobService.build_progress(job, now=now)
+
+        # Assert
+        assert progress["progress_percent"] == 50.0
+        assert progress["rows_per_second"] == 30.0
+        assert progress["eta_seconds"] == 166
+
+    @pytest.mark.unit
+    def test_should_count_rows_without_blank_lines(self, job, tmp_path):
+        """작업자가 읽는 것과 같이 빈 줄을 제외한 데이터 행 수를 반환해야 한다"""
+        # Arrange
+        path = tmp_path / "transactions.csv"
+        path.write_text("product_code,type\r\nA,IN\r\n\r\nB,OUT\r\n\r\n", encoding="utf-8")
+        job.file_path = str(path)
+
+        # Act
+        total = ImportJobService.count_rows(job)
+
+        # Assert
+        assert total == 2
@@ -0,0 +1,124 @@
+"""
+Product Catalog Cache 단위 테스트
+LRU 제거, 일괄 조회, 무효화 테스트
+"""
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services.product_catalog_cache import ProductCacheListener, ProductCatalogCache
+from app.models.product import Product
+
+
+def _product(code: str) -> Product:
+    return Product(
+        product_code=code, product_name=f"제품 {code}", unit="개",
+        purchase_currency="KRW", sale_currency="KRW",
+        purchase_price=Decimal("1000"), sale_price=Decimal("2000"), is_active=True
+    )
+
+
+@pytest.fixture
+def mock_db():
+    """요청된 코드의 제품을 반환하는 Mock 데이터베이스 세션"""
+    db = MagicMock(spec=Session)
+    db.query.return_value.filter.return_value.all.side_effect = lambda: list(db.next_rows)
+    return db
+
+
+class TestProductCatalogCache:
+    """ProductCatalogCache 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_query_only_missing_codes(self, mock_db):
+        """캐시에 있는 제품은 다시 조회하지 않아야 한다"""
+        # Arrange
+        cache = ProductCatalogCache(max_size=10)
+        mock_db.next_rows = [_product("A"), _product("B")]
+        cache.get_many(mock_db, ["A", "B"])
+
+        # Act
+        mock_db.next_rows = []
+        result = cache.get_many(mock_db, ["A", "B"])
+
+        # Assert
+        assert mock_db.query.call_count == 1
+        assert result["A"].product_name == "제품 A"
+        assert cache.stats()["hits"] == 2
+
+    @pytest.mark.unit
+    def test_should_evict_least_recently_used(self, mock_db):
+        """최대 크기를 넘으면 가장 오래 사용하지 않은 제품을 제거해야 한다"""
+        # Arrange
+        cache = ProductCatalogCache(max_size=2)
+        for code in ["A", "B"]:
+            mock_db.next_rows = [_product(code)]
+            cache.get(mock_db, code)
+        cache.get(mock_db, "A")  # A 최근 사용
+
+        # Act
+        mock_db.next_rows = [_product("C")]
+        cache.get(mock_db, "C")
+
+        # Assert
+        assert set(cache._items.keys()) == {"A", "C"}
+
+    @pytest.mark.unit
+    def test_should_reload_after_invalidate(self, mock_db):
+        """무효화된 제품은 다음 조회 시 DB에서 다시 읽어야 한다"""
+        # Arrange
+        cache = ProductCatalogCache(max_size=10)
+        mock_db.next_rows = [_product("A")]
+        cache.get(mock_db, "A")
+
+        # Act
+        cache.invalidate("A")
+        renamed = _product("A")
+        renamed.product_name = "변경된 제품"
+        mock_db.next_rows = [renamed]
+        result = cache.get(mock_db, "A")
+
+        # Assert
+        assert result.product_name == "변경된 제품"
+        assert mock_db.query.call_count == 2
+
+    @pytest.mark.unit
+    def test_should_invalidate_local_cache_only_after_commit(self, mock_db):
+        """제품 변경 알림의 로컬 무효화는 커밋 전에는 실행되지 않고 커밋 직후 실행되어야 한다"""
+        # Arrange
+        cache = ProductCatalogCache(max_size=10)
+        mock_db.next_rows = [_product("A")]
+        cache.get(mock_db, "A")
+        session = Session(create_engine("sqlite://"))
+        session.execute(text("SELECT 1"))
+
+        # Act
+        cache.notify_change(session, "A")
+        cached_before_commit = "A" in cache._items
+        session.commit()
+
+        # Assert
+        assert cached_before_commit
+        assert "A" not in cache._items
+
+    @pytest.mark.unit
+    def test_should_detach_listener_connection_from_pool(self):
+        """리스너 연결은 풀에서 분리한 뒤 사용하여 autocommit/LISTEN 상태로 풀에 돌아가지 않아야 한다"""
+        # Arrange
+        listener = ProductCacheListener(ProductCatalogCache(max_size=10), poll_timeout=0)
+        connection = MagicMock()
+        connection.close.side_effect = lambda: listener._stop.set()
+        engine = MagicMock()
+        engine.raw_connection.return_value = connection
+
+        # Act
+        with patch("app.core.database.engine", engine):
+            listener._run()
+
+        # Assert
+        names = [name for name, _, _ in connection.mock_calls]
+        assert names.index("detach") < names.index("dbapi_connection.cursor")
+        assert names[-1] == "close"
+        assert connection.dbapi_connection.autocommit is True
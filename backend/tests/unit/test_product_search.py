@@ -0,0 +1,57 @@
+"""
+Product Search 단위 테스트
+검색어 정규화 및 검색 조건/정렬 식 구성 테스트
+"""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.product_search import (
+    normalize_search_term, escape_like, is_code_like, build_search_filter, build_search_rank
+)
+
+
+def _compile(expr) -> str:
+    return str(expr.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestProductSearch:
+    """product_search 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_normalize_whitespace_and_case(self):
+        """검색어의 공백을 정리하고 소문자로 변환해야 한다"""
+        assert normalize_search_term("  Vitamin   C ") == "vitamin c"
+
+    @pytest.mark.unit
+    def test_should_escape_like_wildcards(self):
+        """LIKE 와일드카드 문자는 이스케이프해야 한다"""
+        assert escape_like("50%_off") == "50\\%\\_off"
+
+    @pytest.mark.unit
+    def test_should_detect_code_like_terms(self):
+        """영문/숫자 코드와 바코드는 코드 형태로, 한글 제품명은 아니라고 판단해야 한다"""
+        assert is_code_like("SKU-001")
+        assert is_code_like("8801234567890")
+        assert not is_code_like("비타민")
+        assert not is_code_like("vitamin c")
+
+    @pytest.mark.unit
+    def test_should_use_trigram_document_for_hangul_search(self):
+        """한글 검색어는 검색 문서 부분 일치/유사도 조건만 사용해야 한다"""
+        # Act
+        sql = _compile(build_search_filter("비타민"))
+
+        # Assert
+        assert "LIKE '%%비타민%%'" in sql
+        assert "<%%" in sql
+        assert "lower(playauto_platform.products.product_code) LIKE" not in sql
+
+    @pytest.mark.unit
+    def test_should_rank_exact_code_match_first(self):
+        """코드 형태 검색어는 코드 정확 일치를 가장 높은 순위로 정렬해야 한다"""
+        # Act
+        sql = _compile(build_search_rank("SKU-001"))
+
+        # Assert
+        assert "lower(playauto_platform.products.product_code) = 'sku-001') THEN 3.0" in sql
+        assert "word_similarity" in sql
@@ -0,0 +1,221 @@
+"""
+Purchase Order Service 단위 테스트
+발주서 목록 직렬화 시 쿼리 수 테스트
+"""
+import pytest
+import uuid
+from datetime import datetime
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.purchase_orders import get_purchase_orders
+from app.services.purchase_order_service import PurchaseOrderService
+from app.services.product_catalog_cache import ProductCatalogCache
+from app.models.purchase_order import PurchaseOrder, PurchaseOrderItem
+from app.models.product import Product
+
+
+def _make_orders(order_count: int, items_per_order: int):
+    """테스트용 발주서 목록 (항목은 selectinload로 이미 로드된 상태)"""
+    orders = []
+    for o in range(order_count):
+        order = PurchaseOrder(
+            id=uuid.uuid4(), po_number=f"PO202501{o:04d}", supplier="공급사",
+            status="draft", total_amount=Decimal("0"),
+            created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1)
+        )
+        order.items = [
+            PurchaseOrderItem(
+                id=uuid.uuid4(), product_code=f"P{(o + i) % 20:03d}",
+                ordered_quantity=10, received_quantity=0,
+                unit_price=Decimal("100"), status="pending"
+            )
+            for i in range(items_per_order)
+        ]
+        orders.append(order)
+    return orders
+
+
+@pytest.fixture
+def sqlite_engine():
+    """발주서/항목/제품 테이블만 만든 메모리 SQLite 엔진 (스키마는 ATTACH로 대응)"""
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_conn, connection_record):
+        dbapi_conn.execute("ATTACH DATABASE ':memory:' AS playauto_platform")
+
+    with engine.begin() as connection:
+        for table in (Product.__table__, PurchaseOrder.__table__, PurchaseOrderItem.__table__):
+            table.create(connection)
+    return engine
+
+
+@pytest.fixture
+def mock_db():
+    """제품 IN 조회에 응답하는 Mock 세션"""
+    db = MagicMock(spec=Session)
+    db.query.return_value.filter.return_value.all.return_value = [
+        Product(product_code=f"P{i:03d}", product_name=f"제품 {i}", purchase_currency="USD",
+                sale_currency="KRW", is_active=True)
+        for i in range(20)
+    ]
+    return db
+
+
+class TestPurchaseOrderService:
+    """PurchaseOrderService 테스트 클래스"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("order_count,items_per_order", [(1, 1), (100, 5)])
+    def test_should_load_products_once_when_serializing_page(self, mock_db, order_count, items_per_order):
+        """발주서/항목 수와 관계없이 직렬화 시 제품 조회는 한 번만 실행해야 한다"""
+        # Arrange
+        orders = _make_orders(order_count, items_per_order)
+
+        # Act
+        with patch("app.services.purchase_order_service.product_catalog_cache", ProductCatalogCache()):
+            result = PurchaseOrderService.serialize_many(mock_db, orders)
+
+        # Assert
+        assert mock_db.query.call_count == 1
+        assert len(result) == order_count
+        assert len(result[0]["items"]) == items_per_order
+        assert result[0]["product_name"] == result[0]["items"][0]["product_name"]
+        assert result[0]["currency"] == "USD"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("order_count,items_per_order", [(1, 1), (30, 5)])
+    def test_should_use_constant_queries_per_page(self, sqlite_engine, order_count, items_per_order):
+        """발주서 목록 API는 페이지 조회 + 항목 selectinload + 제품 조회 3개 쿼리로 응답해야 한다"""
+        # Arrange
+        with Session(sqlite_engine) as setup:
+            setup.add_all(Product(product_code=f"P{i:03d}", product_name=f"제품 {i}") for i in range(20))
+            setup.add_all(_make_orders(order_count, items_per_order))
+            setup.commit()
+
+        statements = []
+        event.listen(sqlite_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        # Act
+        with Session(sqlite_engine) as db, \
+                patch("app.services.purchase_order_service.product_catalog_cache", ProductCatalogCache()):
+            result = get_purchase_orders(status=None, supplier=None, skip=0, limit=100, db=db)
+
+        # Assert
+        assert len(statements) == 3
+        assert len(result) == order_count
+        assert sum(len(order["items"]) for order in result) == order_count * items_per_order
+        assert result[0]["items"][0]["product_name"].startswith("제품")
+
+    @pytest.mark.unit
+    def test_should_allocate_consecutive_po_numbers_in_one_statement(self):
+        """여러 번호를 요청하면 채번 행을 한 번만 증가시키고 연속 번호를 반환해야 한다"""
+        # Arrange
+        db = MagicMock(spec=Session)
+        db.execute.return_value.scalar_one.return_value = 12  # 증가 후 마지막 순번
+
+        # Act
+        numbers = PurchaseOrderService.allocate_po_numbers(db, 3, now=datetime(2025, 3, 15))
+
+        # Assert
+        assert numbers == ["PO2025030010", "PO2025030011", "PO2025030012"]
+        assert db.execute.call_count == 1
+        sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (period) DO UPDATE" in sql
+        assert "RETURNING" in sql
+
+    @pytest.mark.unit
+    def test_should_receive_items_across_orders_in_single_commit(self):
+        """여러 발주서 항목 입고 시 항목별 IN 거래와 상태 재계산을 한 번에 커밋해야 한다"""
+        # Arrange
+        po_a, po_b = uuid.uuid4(), uuid.uuid4()
+        item_a = PurchaseOrderItem(id=uuid.uuid4(), po_id=po_a, product_code="P001", ordered_quantity=10, received_quantity=0)
+        item_b = PurchaseOrderItem(id=uuid.uuid4(), po_id=po_b, product_code="P001", ordered_quantity=5, received_quantity=0)
+        product = Product(product_code="P001", product_name="제품", current_stock=100)
+
+        db = MagicMock(spec=Session)
+        items_query, products_query, checkpoints_query, lock_query, orders_query = (MagicMock() for _ in range(5))
+        items_query.join.return_value.filter.return_value.order_by.return_value \
+            .with_for_update.return_value.all.return_value = [
+            (item_a, "PO2025010001", "ordered"), (item_b, "PO2025010002", "partial")
+        ]
+        products_query.filter.return_value.order_by.return_value \
+            .with_for_update.return_value.all.return_value = [product]
+        checkpoints_query.filter.return_value.all.return_value = []
+        orders_query.filter.return_value.order_by.return_value.all.return_value = []
+        db.query.side_effect = [items_query, products_query, checkpoints_query, lock_query, orders_query]
+
+        # Act
+        result = PurchaseOrderService.receive_items(db, [
+            {"item_id": str(item_a.id), "quantity": 4},
+            {"item_id": str(item_b.id), "quantity": 5}
+        ])
+
+        # Assert
+        transactions = db.add_all.call_args[0][0]
+        assert [(t.previous_stock, t.new_stock) for t in transactions] == [(100, 104), (104, 109)]
+        assert all(t.transaction_type == "IN" for t in transactions)
+        assert db.execute.call_count == 4  # 재고, 항목, 발주서 상태, 미입고 수량 UPDATE
+        po_update = str(db.execute.call_args_list[2][0][0].compile(dialect=postgresql.dialect()))
+        assert "EXISTS" in po_update
+        db.commit.assert_called_once()
+        assert result["transactions_created"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("po_status, received, product_found, status_code", [
+        ("cancelled", 0, True, 400),   # 취소된 발주서
+        ("completed", 0, True, 400),   # 완료된 발주서
+        ("partial", 8, True, 400),     # 미입고 2개에 4개 입고
+        ("ordered", 0, False, 404),    # 제품 없음
+    ])
+    def test_should_reject_invalid_receipts_before_writing(self, po_status, received, product_found, status_code):
+        """완료/취소된 발주서, 미입고 수량 초과, 없는 제품은 아무것도 쓰지 않고 거부해야 한다"""
+        # Arrange
+        item = PurchaseOrderItem(
+            id=uuid.uuid4(), po_id=uuid.uuid4(), product_code="P001", ordered_quantity=10, received_quantity=received
+        )
+        db = MagicMock(spec=Session)
+        items_query, products_query = MagicMock(), MagicMock()
+        items_query.join.return_value.filter.return_value.order_by.return_value \
+            .with_for_update.return_value.all.return_value = [(item, "PO2025010001", po_status)]
+        products_query.filter.return_value.order_by.return_value \
+            .with_for_update.return_value.all.return_value = (
+                [Product(product_code="P001", current_stock=0)] if product_found else []
+            )
+        db.query.side_effect = [items_query, products_query]
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            PurchaseOrderService.receive_items(db, [{"item_id": str(item.id), "quantity": 4}])
+
+        # Assert
+        assert exc_info.value.status_code == status_code
+        db.add_all.assert_not_called()
+        db.execute.assert_not_called()
+        db.rollback.assert_called_once()
+
+    @pytest.mark.unit
+    def test_should_refresh_on_order_qty_for_given_products_in_one_statement(self):
+        """지정한 제품 행을 먼저 잠근 뒤 미입고 발주 수량을 상관 서브쿼리 UPDATE 한 문장으로 재계산해야 한다"""
+        # Arrange
+        db = MagicMock(spec=Session)
+        db.execute.return_value.rowcount = 2
+
+        # Act
+        updated = PurchaseOrderService.refresh_on_order_qty(db, ["P002", "P001", "P001"])
+        skipped = PurchaseOrderService.refresh_on_order_qty(db, [])
+
+        # Assert
+        assert updated == 2
+        assert skipped == 0
+        assert db.execute.call_count == 1
+        locked = db.query.return_value.filter.return_value.order_by.return_value
+        locked.with_for_update.return_value.all.assert_called_once()
+        sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE playauto_platform.products SET on_order_qty=(SELECT")
+        assert "NOT IN" in sql
@@ -0,0 +1,89 @@
+"""
+Reorder Service 단위 테스트
+발주 제안 쿼리 및 공급업체별 초안 생성 테스트
+"""
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, literal, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.services.reorder_service import ReorderService, UNKNOWN_SUPPLIER, round_up_to_moq
+
+
+@pytest.fixture
+def mock_db():
+    """Mock 데이터베이스 세션"""
+    return MagicMock(spec=Session)
+
+
+@pytest.fixture
+def suggestion_row():
+    """발주 제안 쿼리 결과 행 (단가/통화 미입력 제품)"""
+    return SimpleNamespace(
+        product_code="P001", product_name="제품1", supplier="A사", supplier_email=None,
+        purchase_price=None, purchase_currency=None, current_stock=3, safety_stock=10,
+        open_po_quantity=5, daily_demand=1.5, lead_time_days=7, lead_time_demand=11,
+        projected_stock=-3, moq=12, suggested_quantity=24
+    )
+
+
+@pytest.fixture
+def suggestions():
+    """A사 제품 2개와 공급업체 미지정 제품 1개의 발주 제안"""
+    return [
+        {"product_code": "P001", "supplier": "A사", "suggested_quantity": 10, "unit_price": 1000.0, "lead_time_days": 5},
+        {"product_code": "P002", "supplier": "A사", "suggested_quantity": 20, "unit_price": 500.0, "lead_time_days": 10},
+        {"product_code": "P003", "supplier": "", "suggested_quantity": 3, "unit_price": 1000.0, "lead_time_days": 7},
+    ]
+
+
+class TestReorderService:
+    """ReorderService 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_compute_suggestions_in_single_query(self, mock_db, suggestion_row):
+        """출고 집계와 미입고 발주 수량을 쓰는 쿼리 한 번으로 제안을 만들고 빈 단가/통화는 기본값으로 채워야 한다"""
+        # Arrange
+        mock_db.execute.return_value.all.return_value = [suggestion_row]
+
+        # Act
+        result = ReorderService.get_suggestions(mock_db, demand_days=30, supplier="A사")
+
+        # Assert
+        assert mock_db.execute.call_count == 1
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "GROUP BY" in sql
+        assert "on_order_qty" in sql
+        assert "ceil(CAST(" in sql
+        assert len(result) == 1
+        assert (result[0]["unit_price"], result[0]["currency"]) == (0.0, "KRW")
+        assert (result[0]["open_po_quantity"], result[0]["suggested_quantity"]) == (5, 24)
+
+    @pytest.mark.unit
+    def test_should_group_suggestions_into_drafts_by_supplier(self, suggestions):
+        """공급업체별로 발주서 초안을 만들고 입고 예정일은 가장 긴 리드타임을 기준으로 해야 한다"""
+        # Act
+        drafts = ReorderService.group_by_supplier(suggestions, today=date(2025, 1, 1))
+
+        # Assert
+        assert [d["supplier"] for d in drafts] == ["A사", UNKNOWN_SUPPLIER]
+        assert drafts[0]["expected_date"] == "2025-01-11"
+        assert drafts[0]["total_amount"] == 10 * 1000.0 + 20 * 500.0
+        assert [i["ordered_quantity"] for i in drafts[0]["items"]] == [10, 20]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("shortfall,moq,expected", [(130, 100, 200), (100, 100, 100), (1, 1, 1), (3, 12, 12)])
+    def test_should_round_shortfall_up_to_moq_multiple(self, shortfall, moq, expected):
+        """발주 제안 수량은 부족분을 MOQ 배수로 올림한 값이어야 한다"""
+        # Arrange
+        engine = create_engine("sqlite://")
+
+        # Act
+        with engine.connect() as connection:
+            quantity = connection.execute(select(round_up_to_moq(literal(shortfall), literal(moq)))).scalar()
+
+        # Assert
+        assert quantity == expected
@@ -0,0 +1,117 @@
+"""
+Sales Fact Service 단위 테스트
+집계 쿼리 구성 및 기간 분할 재적재 로직 테스트
+"""
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.endpoints.sales import _aggregate_from_transactions
+from app.services.sales_fact_service import SalesFactService, REBUILD_CHUNK_DAYS
+from app.core.timezone_utils import day_range_bounds
+
+
+@pytest.fixture
+def mock_db():
+    """Mock 데이터베이스 세션"""
+    db = MagicMock(spec=Session)
+    db.execute.return_value.rowcount = 10
+    return db
+
+
+class TestSalesFactService:
+    """SalesFactService 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_build_day_range_bounds_as_half_open_interval(self):
+        """날짜 구간을 [시작일 00:00, 종료일 다음날 00:00) 범위로 변환해야 한다"""
+        # Act
+        range_start, range_end = day_range_bounds(date(2025, 1, 1), date(2025, 1, 31))
+
+        # Assert
+        assert range_start == datetime(2025, 1, 1, 0, 0)
+        assert range_end == datetime(2025, 2, 1, 0, 0)
+
+    @pytest.mark.unit
+    def test_should_aggregate_with_sargable_date_range(self):
+        """집계 쿼리는 transaction_date 범위 조건과 그룹화를 사용해야 한다"""
+        # Act
+        stmt = SalesFactService.build_fact_select(date(2025, 1, 1), date(2025, 1, 31))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        # Assert
+        assert "transactions.transaction_date >=" in sql
+        assert "transactions.transaction_date <" in sql
+        assert "GROUP BY" in sql
+        assert "WHERE date(" not in sql
+
+    @pytest.mark.unit
+    def test_should_use_fact_definition_for_raw_sales_analysis(self, mock_db):
+        """원본 거래 기준 매출 분석도 집계 테이블과 같은 SELECT(KST 거래일, 원화 환산)를 사용해야 한다"""
+        # Arrange
+        row = SimpleNamespace(
+            fact_date=date(2025, 1, 2), product_code="A", category=None,
+            quantity=3, transaction_count=2, revenue_krw=3900, product_name="제품A"
+        )
+        mock_db.query.return_value.outerjoin.return_value.all.return_value = [row]
+
+        # Act
+        daily, products, categories = _aggregate_from_transactions(mock_db, date(2025, 1, 1), date(2025, 1, 31))
+
+        # Assert
+        facts = mock_db.query.call_args[0][0].table
+        sql = str(facts.element.compile(dialect=postgresql.dialect()))
+        assert "transactions.transaction_date >=" in sql
+        assert "sale_currency" in sql
+        assert "WHERE date(" not in sql
+        assert daily["2025-01-02"]["sales_amount"] == 3900.0
+        assert products["A"]["transaction_count"] == 2
+        assert categories["Unknown"]["quantity_sold"] == 3
+
+    @pytest.mark.unit
+    def test_should_rebuild_long_range_in_chunks(self, mock_db):
+        """긴 기간은 여러 구간으로 나누어 구간마다 커밋해야 한다"""
+        # Arrange
+        start = date(2025, 1, 1)
+        end = date(2025, 3, 31)  # 90일
+        expected_chunks = -(-90 // REBUILD_CHUNK_DAYS)
+
+        # Act
+        result = SalesFactService.rebuild_range(mock_db, start, end)
+
+        # Assert
+        assert mock_db.commit.call_count == expected_chunks
+        assert mock_db.execute.call_count == expected_chunks * 2  # 삭제 + 적재
+        assert result["rows_written"] == expected_chunks * 10
+
+    @pytest.mark.unit
+    def test_should_rebuild_only_dates_older_than_nightly_refresh_without_commit(self, mock_db):
+        """야간 적재 범위보다 오래된 날짜만 모아 한 구간으로 재적재하고 커밋은 호출자에게 맡겨야 한다"""
+        # Arrange
+        today = date(2025, 3, 20)
+        dates = {date(2025, 3, 1), date(2025, 3, 10), date(2025, 3, 17), date(2025, 3, 19)}
+
+        # Act
+        result = SalesFactService.refresh_backdated(mock_db, dates, today=today)
+        skipped = SalesFactService.refresh_backdated(mock_db, {date(2025, 3, 17)}, today=today)
+
+        # Assert
+        assert (result["start_date"], result["end_date"]) == ("2025-03-01", "2025-03-10")
+        assert skipped is None
+        assert mock_db.execute.call_count == 2  # 삭제 + 적재
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.unit
+    def test_should_reject_inverted_range(self, mock_db):
+        """시작 날짜가 종료 날짜보다 늦으면 거부해야 한다"""
+        with pytest.raises(ValueError):
+            SalesFactService.rebuild_range(mock_db, date(2025, 2, 1), date(2025, 1, 1))
+
+    @pytest.mark.unit
+    def test_should_shift_leap_day_to_feb_28(self):
+        """전년 동기 계산 시 2월 29일은 2월 28일로 보정해야 한다"""
+        assert SalesFactService._shift_year(date(2024, 2, 29), -1) == date(2023, 2, 28)
+        assert SalesFactService._shift_year(date(2025, 10, 1), -1) == date(2024, 10, 1)
@@ -0,0 +1,86 @@
+"""
+Scan Session 단위 테스트
+바코드 스캔 합산 및 일괄 반영 테스트
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.services.transaction_service import TransactionService
+from app.services.product_catalog_cache import CachedProduct
+from app.schemas.transaction import ScanSessionRequest
+from app.models.product import Product
+
+
+def _cached(code: str) -> CachedProduct:
+    return CachedProduct(
+        product_code=code, product_name=f"제품 {code}", barcode=f"880{code}", category=None,
+        manufacturer=None, supplier=None, unit="개", purchase_currency="KRW",
+        sale_currency="KRW", purchase_price=0, sale_price=0, is_active=True
+    )
+
+
+@pytest.fixture
+def mock_db():
+    """제품 잠금 조회와 체크포인트 조회 결과를 지정한 Mock 세션"""
+    db = MagicMock(spec=Session)
+    ordered = db.query.return_value.filter.return_value.order_by.return_value
+    ordered.with_for_update.return_value.all.return_value = [
+        Product(product_code="A", product_name="제품 A", current_stock=10, is_auto_calculated=False),
+        Product(product_code="B", product_name="제품 B", current_stock=3, is_auto_calculated=False)
+    ]
+    db.query.return_value.filter.return_value.all.return_value = []  # 체크포인트 없음
+    return db
+
+
+class TestScanSession:
+    """TransactionService.process_scan_session 테스트 클래스"""
+
+    @pytest.mark.unit
+    @patch("app.services.transaction_service.product_catalog_cache")
+    def test_should_coalesce_scans_per_product_in_single_commit(self, mock_cache, mock_db):
+        """같은 제품의 스캔은 합산하여 제품당 거래 1건으로 한 번에 커밋해야 한다"""
+        # Arrange
+        mock_cache.get_by_barcode.side_effect = lambda db, barcode: _cached(barcode[3:])
+        request = ScanSessionRequest(
+            transaction_type="IN",
+            scans=[{"barcode": "880A"}, {"barcode": "880B", "quantity": 2}, {"barcode": "880A"}]
+        )
+
+        # Act
+        result = TransactionService.process_scan_session(mock_db, request)
+
+        # Assert
+        assert mock_db.add.call_count == 2
+        mock_db.commit.assert_called_once()
+        by_code = {r["product_code"]: r for r in result["results"]}
+        assert by_code["A"]["quantity"] == 2 and by_code["A"]["scan_count"] == 2
+        assert by_code["A"]["new_stock"] == 12
+        assert by_code["B"]["new_stock"] == 5
+
+    @pytest.mark.unit
+    @patch("app.services.transaction_service.product_catalog_cache")
+    def test_should_reject_whole_session_on_insufficient_stock(self, mock_cache, mock_db):
+        """출고 수량이 재고보다 많은 제품이 있으면 전체를 롤백해야 한다"""
+        # Arrange
+        request = ScanSessionRequest(
+            transaction_type="OUT",
+            scans=[{"product_code": "A", "quantity": 5}, {"product_code": "B", "quantity": 4}]
+        )
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            TransactionService.process_scan_session(mock_db, request)
+
+        assert exc_info.value.status_code == 400
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("scan", [{}, {"barcode": ""}, {"barcode": "880A", "product_code": "A"}])
+    def test_should_require_exactly_one_of_barcode_or_product_code(self, scan):
+        """스캔 한 건에는 바코드와 제품 코드 중 정확히 하나만 있어야 한다"""
+        with pytest.raises(ValidationError):
+            ScanSessionRequest(transaction_type="IN", scans=[scan])
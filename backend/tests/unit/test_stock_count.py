@@ -0,0 +1,60 @@
+"""
+Stock Count 단위 테스트
+재고 실사 일괄 반영 테스트
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.orm import Session
+
+from app.services.transaction_service import TransactionService
+from app.schemas.transaction import StockCountRequest
+from app.models.product import Product
+
+
+@pytest.fixture
+def mock_db():
+    """실사 제품 잠금 조회 결과를 지정한 Mock 세션"""
+    db = MagicMock(spec=Session)
+    ordered = db.query.return_value.filter.return_value.order_by.return_value
+    ordered.with_for_update.return_value.all.return_value = [
+        Product(product_code="A", current_stock=10, zone_id="Z1"),
+        Product(product_code="B", current_stock=5),
+        Product(product_code="C", current_stock=7)
+    ]
+    return db
+
+
+class TestStockCount:
+    """TransactionService.process_stock_count 테스트 클래스"""
+
+    @pytest.mark.unit
+    @patch("app.services.transaction_service.CheckpointHeadService")
+    def test_should_write_discrepancies_adjustments_and_stock_in_one_commit(self, mock_heads, mock_db):
+        """설명 있는 불일치만 조정하고 불일치/체크포인트/거래를 각각 일괄 INSERT한 뒤 한 번만 커밋해야 한다"""
+        # Arrange
+        mock_heads.get_later_checkpoints.return_value = {}
+        request = StockCountRequest(counts=[
+            {"product_code": "A", "physical_stock": 8, "explanation": "파손 2개 폐기 누락"},
+            {"product_code": "B", "physical_stock": 6},
+            {"product_code": "C", "physical_stock": 7},
+            {"product_code": "X", "physical_stock": 1}
+        ])
+
+        # Act
+        result = TransactionService.process_stock_count(mock_db, request)
+
+        # Assert
+        assert result == {"processed": 1, "discrepancies": 2, "skipped": 1}
+        inserts = {
+            call.args[0].table.name: call.args[1]
+            for call in mock_db.execute.call_args_list if len(call.args) > 1
+        }
+        assert [(r["product_code"], r["status"]) for r in inserts["discrepancies"]] == [
+            ("A", "resolved"), ("B", "pending")
+        ]
+        assert [(r["product_code"], r["confirmed_stock"]) for r in inserts["stock_checkpoints"]] == [("A", 8)]
+        adjust = inserts["transactions"][0]
+        assert (adjust["quantity"], adjust["previous_stock"], adjust["new_stock"]) == (-2, 10, 8)
+        assert adjust["affects_current_stock"] is True
+        mock_heads.refresh.assert_called_once_with(mock_db, ["A"])
+        mock_db.commit.assert_called_once()
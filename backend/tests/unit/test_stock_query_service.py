@@ -0,0 +1,141 @@
+"""
+Stock Query Service 단위 테스트
+기준점(수불부/체크포인트) 선택 및 시점 재고 계산 테스트
+"""
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from sqlalchemy.orm import Session
+
+from app.services.stock_query_service import (
+    StockQueryService, ANCHOR_DAILY_LEDGER, ANCHOR_CHECKPOINT, ANCHOR_CURRENT_STOCK,
+    format_snapshot_stream
+)
+from app.models.daily_ledger import DailyLedger
+from app.models.stock_checkpoint import StockCheckpoint
+from app.models.product import Product
+from app.core.timezone_utils import KST
+
+
+@pytest.fixture
+def mock_db():
+    """Mock 데이터베이스 세션"""
+    return MagicMock(spec=Session)
+
+
+@pytest.fixture
+def sample_product():
+    """테스트용 Product 모델"""
+    return Product(product_code="TEST001", product_name="테스트 제품", current_stock=500)
+
+
+def _set_anchor_rows(mock_db, ledger, checkpoint):
+    """수불부 조회, 체크포인트 조회 순서대로 결과 지정"""
+    mock_db.query.return_value.filter.return_value.order_by.return_value.first.side_effect = [
+        ledger, checkpoint
+    ]
+
+
+class TestStockQueryService:
+    """StockQueryService 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_prefer_later_checkpoint_over_ledger(self, mock_db):
+        """수불부보다 늦은 체크포인트가 있으면 체크포인트를 기준점으로 사용해야 한다"""
+        # Arrange
+        ledger = DailyLedger(ledger_date=date(2025, 3, 1), ending_stock=100)
+        checkpoint = StockCheckpoint(
+            checkpoint_date=datetime(2025, 3, 2, 14, 0, tzinfo=KST),
+            confirmed_stock=80
+        )
+        _set_anchor_rows(mock_db, ledger, checkpoint)
+
+        # Act
+        anchor = StockQueryService.find_anchor(mock_db, "TEST001", date(2025, 3, 5))
+
+        # Assert
+        assert anchor["anchor_type"] == ANCHOR_CHECKPOINT
+        assert anchor["stock"] == 80
+
+    @pytest.mark.unit
+    def test_should_prefer_checkpoint_on_same_instant(self, mock_db):
+        """같은 날 마감 체크포인트와 수불부가 겹치면 체크포인트를 우선해야 한다"""
+        # Arrange
+        ledger = DailyLedger(ledger_date=date(2025, 3, 1), ending_stock=100)
+        checkpoint = StockCheckpoint(
+            checkpoint_date=datetime(2025, 3, 1, 23, 59, 59, 999999),  # naive = KST
+            confirmed_stock=100
+        )
+        _set_anchor_rows(mock_db, ledger, checkpoint)
+
+        # Act
+        anchor = StockQueryService.find_anchor(mock_db, "TEST001", date(2025, 3, 1))
+
+        # Assert
+        assert anchor["anchor_type"] == ANCHOR_CHECKPOINT
+
+    @pytest.mark.unit
+    def test_should_apply_delta_after_ledger_anchor(self, mock_db, sample_product):
+        """기준점 재고에 기준점 이후 거래 증감만 더해야 한다"""
+        # Arrange
+        ledger = DailyLedger(ledger_date=date(2025, 3, 4), ending_stock=120)
+        _set_anchor_rows(mock_db, ledger, None)
+        mock_db.query.return_value.filter.return_value.scalar.return_value = -15
+
+        # Act
+        result = StockQueryService.get_stock_as_of(mock_db, sample_product, date(2025, 3, 5))
+
+        # Assert
+        assert result["anchor_type"] == ANCHOR_DAILY_LEDGER
+        assert result["quantity"] == 105
+        assert result["delta"] == -15
+
+    @pytest.mark.unit
+    def test_should_fall_back_to_current_stock_without_anchor(self, mock_db, sample_product):
+        """기준점이 없으면 현재 재고에서 이후 거래를 되돌려야 한다"""
+        # Arrange
+        _set_anchor_rows(mock_db, None, None)
+        mock_db.query.return_value.filter.return_value.scalar.return_value = 30
+
+        # Act
+        result = StockQueryService.get_stock_as_of(mock_db, sample_product, date(2025, 3, 5))
+
+        # Assert
+        assert result["anchor_type"] == ANCHOR_CURRENT_STOCK
+        assert result["quantity"] == 470
+
+    @pytest.mark.unit
+    def test_should_build_single_snapshot_query_for_all_products(self):
+        """스냅샷 쿼리는 제품별 LATERAL LIMIT 1 기준점과 그룹 집계를 사용하는 단일 쿼리여야 한다"""
+        # Act
+        query, params = StockQueryService.build_snapshot_query(
+            [date(2025, 3, 1), date(2025, 3, 31)], category="영양제"
+        )
+        sql = str(query)
+
+        # Assert
+        assert sql.count("LEFT JOIN LATERAL") == 2
+        assert "ORDER BY dl.ledger_date DESC\n        LIMIT 1" in sql
+        assert "ORDER BY sc.checkpoint_date DESC\n        LIMIT 1" in sql
+        assert "DISTINCT ON" not in sql
+        assert "GROUP BY a.target_date, a.product_code" in sql
+        assert "p.category = :category" in sql
+        assert params["target_dates"] == [date(2025, 3, 1), date(2025, 3, 31)]
+
+    @pytest.mark.unit
+    def test_should_stream_snapshot_rows_as_csv(self):
+        """스냅샷 행을 헤더가 포함된 CSV로 직렬화해야 한다"""
+        # Arrange
+        rows = [{
+            "target_date": date(2025, 3, 1), "product_code": "TEST001",
+            "product_name": "테스트 제품", "quantity": 42,
+            "anchor_type": ANCHOR_DAILY_LEDGER, "anchor_date": None
+        }]
+
+        # Act
+        output = "".join(format_snapshot_stream(iter(rows), "csv"))
+
+        # Assert
+        lines = output.strip().splitlines()
+        assert lines[0].startswith("target_date,product_code")
+        assert lines[1] == "2025-03-01,TEST001,테스트 제품,42,DAILY_LEDGER,"
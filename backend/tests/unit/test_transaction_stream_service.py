@@ -0,0 +1,101 @@
+"""
+Transaction Stream Service 단위 테스트
+NDJSON 줄 분리 및 묶음 반영(중복 제외) 테스트
+"""
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.schemas.transaction import StreamTransactionLine
+from app.services.transaction_stream_service import (
+    TransactionStreamService,
+    iter_ndjson_lines
+)
+
+
+@pytest.fixture
+def mock_db():
+    """Mock 데이터베이스 세션"""
+    return MagicMock(spec=Session)
+
+
+@pytest.fixture
+def read_lines():
+    """청크 목록을 iter_ndjson_lines로 끝까지 읽는 함수"""
+    def read(chunks, max_line_bytes):
+        async def source():
+            for chunk in chunks:
+                yield chunk
+
+        async def collect():
+            return [item async for item in iter_ndjson_lines(source(), max_line_bytes)]
+
+        return asyncio.run(collect())
+
+    return read
+
+
+@pytest.fixture
+def stream_lines():
+    """이미 등록된 id 1줄, 묶음 안에서 반복된 id 2줄, 재고 부족 1줄"""
+    def line(external_id, quantity=1):
+        return StreamTransactionLine(
+            external_id=external_id, transaction_type="OUT", product_code="A", quantity=quantity
+        )
+
+    return [(1, line("old")), (2, line("new")), (3, line("new")), (4, line("big", 99))]
+
+
+class TestTransactionStreamService:
+    """TransactionStreamService 테스트 클래스"""
+
+    @pytest.mark.unit
+    def test_should_join_lines_across_chunks_and_drop_oversized_lines(self, read_lines):
+        """청크 경계에 걸친 줄은 합치고 본문 기준 줄 번호로 반환하며 너무 긴 줄은 None이어야 한다"""
+        # Arrange
+        chunks = [b'{"a":1}\n{"b"', b':2}\n\n', b'x' * 20, b'x' * 20 + b'\n{"c":3}']
+
+        # Act
+        lines = read_lines(chunks, max_line_bytes=16)
+
+        # Assert
+        assert lines == [(1, b'{"a":1}'), (2, b'{"b":2}'), (4, None), (5, b'{"c":3}')]
+
+    @pytest.mark.unit
+    @patch("app.services.transaction_stream_service.BatchTransactionService.apply")
+    @patch.object(TransactionStreamService, "find_existing_external_ids", return_value={"old"})
+    def test_should_skip_existing_and_repeated_external_ids(self, mock_existing, mock_apply, mock_db, stream_lines):
+        """이미 등록됐거나 묶음 안에서 반복된 id는 duplicate로 빼고 나머지만 반영해야 한다"""
+        # Arrange
+        mock_apply.return_value = (1, 1, [{"row": 4, "error": "재고 부족: 현재 10, 요청 99"}])
+
+        # Act
+        results = TransactionStreamService.apply_batch(mock_db, stream_lines, "channel_stream")
+
+        # Assert
+        mock_existing.assert_called_once()
+        assert set(mock_existing.call_args[0][1]) == {"old", "new", "big"}
+        applied = mock_apply.call_args[0][1]
+        assert [row for row, _ in applied] == [2, 4]
+        assert [trans.product_code for _, trans in applied] == ["A", "A"]
+        assert [r["status"] for r in results] == ["duplicate", "created", "duplicate", "failed"]
+        assert results[3]["error"] == "재고 부족: 현재 10, 요청 99"
+
+    @pytest.mark.unit
+    @patch("app.services.transaction_stream_service.BatchTransactionService.apply")
+    @patch.object(TransactionStreamService, "find_existing_external_ids")
+    def test_should_recheck_duplicates_after_unique_violation(self, mock_existing, mock_apply, mock_db, stream_lines):
+        """다른 요청이 같은 id를 먼저 커밋해 고유 인덱스 위반이 나면 롤백 후 다시 확인해 반영해야 한다"""
+        # Arrange
+        mock_existing.side_effect = [{"old"}, {"old", "new"}]
+        mock_apply.side_effect = [IntegrityError("INSERT", {}, Exception("duplicate key")), (1, 0, [])]
+
+        # Act
+        results = TransactionStreamService.apply_batch(mock_db, stream_lines, "channel_stream")
+
+        # Assert
+        mock_db.rollback.assert_called_once()
+        assert [row for row, _ in mock_apply.call_args[0][1]] == [4]
+        assert [r["status"] for r in results] == ["duplicate", "duplicate", "duplicate", "created"]